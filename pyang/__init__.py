@@ -6,13 +6,17 @@ import sys
 import zlib
 import re
 import io
+import json
+import time
 
 from . import error
+from . import cache
 from . import yang_parser
 from . import yin_parser
 from . import grammar
 from . import util
 from . import statements
+from . import types
 from . import syntax
 
 __version__ = '2.1.1'
@@ -34,7 +38,9 @@ class Context(object):
 
         self.strict = False
         self.repository = repository
-        self.errors = []
+        self.errors = error.ErrorList()
+        """list of (<Position>, tag, args) errors; use error.err_add()
+        to add errors"""
         self.canonical = False
         self.max_line_len = None
         self.max_identifier_len = None
@@ -46,6 +52,50 @@ class Context(object):
         self.max_status = None
         self.keep_comments = False
         self.keep_arg_substrings = False
+        self.compact_statements = False
+        """if True, modules added to the context use less memory: equal
+        keywords and arguments are shared, and so are the positions of
+        statements on the same line and the empty i_typedefs,
+        i_groupings and i_uniques of statements that have none.  these
+        must not be modified in place.  the nodes expanded from a
+        grouping share the keywords and arguments of the grouping, but
+        have their own positions, since these refer to the uses
+        statement; they are only shared by the nodes of one expansion
+        that are on the same line."""
+        self.strings = {}
+        """table of the shared strings, if compact_statements is True"""
+        self.copy_on_write_uses = False
+        """if True, the nodes expanded from a grouping share the
+        grouping's description, reference, error-message and
+        error-app-tag statements instead of copying them.  a refine
+        replaces a shared statement in the expanded node.  the shared
+        statements keep the parent, position and module of the
+        grouping's statements."""
+        self.validation_profile = None
+        """a `profiling.ValidationProfile` instance, or None.  if set,
+        the validation of each module is recorded in it."""
+        self.parse_cache = None
+        """a `cache.ParseCache` instance, or None"""
+        self.snapshot = None
+        """a `snapshot.Snapshot` instance, or None"""
+        self.keep_module_sources = False
+        """if True, the text of each module is kept in `module_sources`,
+        and update_module() uses it instead of reading the files of the
+        dependent modules again."""
+        self.module_sources = {}
+        """dict of (modulename,revision):(ref, in_format, text)
+        the text each module in `modules` was read from, if
+        keep_module_sources is True"""
+        self.identity_index = None
+        """a `types.IdentityIndex` of the modules, or None; see
+        get_identity_index()"""
+        self.dependencies = {}
+        """dict of (modulename,revision):set of (modulename,revision)
+        the modules each validated module depends on, i.e., the modules
+        it imports and includes, the module that includes a submodule,
+        and the modules that augment or deviate it.  the revision is
+        None for a module that was not found.  updated by validate()
+        and update_module()"""
 
         for mod, rev, handle in self.repository.get_modules_and_revisions(self):
             if mod not in self.revs:
@@ -70,10 +120,40 @@ class Context(object):
 
         if in_format == 'yin':
             p = yin_parser.YinParser()
+            module = p.parse(self, ref, text)
         else:
-            p = yang_parser.YangParser()
+            module = self._parse_yang(ref, text)
+        m = self._check_and_add(ref, module, expect_modulename,
+                               expect_revision, expect_failure_error)
+        if m is not None and m is module and self.keep_module_sources:
+            self.module_sources[(module.arg,
+                                 util.get_latest_revision(module))] = \
+                (ref, in_format, text)
+        return m
+
+    def add_module_stream(self, ref, fd, encoding='utf-8',
+                          expect_modulename=None, expect_revision=None,
+                          expect_failure_error=True):
+        """Parse a YANG module read from a file and add it to the context
+
+        `fd` is a binary file object, or an iterable of byte strings.
+        It is decoded and parsed as it is read, so the whole text is
+        never kept in memory.  Other arguments as in add_module().
+
+        Returns the parsed module on success, and None on error.
+        """
+        lines = yang_parser.iter_lines(fd, encoding)
+        try:
+            module = yang_parser.YangParser().parse_lines(self, ref, lines)
+        except UnicodeDecodeError as ex:
+            error.err_add(self.errors, error.Position(ref), 'READ_ERROR',
+                          '%s: unicode error: %s' % (ref, ex.reason))
+            return None
+        return self._check_and_add(ref, module, expect_modulename,
+                                  expect_revision, expect_failure_error)
 
-        module = p.parse(self, ref, text)
+    def _check_and_add(self, ref, module, expect_modulename,
+                      expect_revision, expect_failure_error):
         if module is None:
             return None
 
@@ -112,6 +192,80 @@ class Context(object):
 
         return self.add_parsed_module(module)
 
+    def _parse_yang(self, ref, text, extra=None):
+        """Parse a YANG module text, using the parse cache if possible.
+
+        Returns the parsed module on success, and None on error.
+        """
+        parse_cache = self.parse_cache
+        if parse_cache is not None and parse_cache.is_enabled(self):
+            module = parse_cache.get(self, ref, text)
+            if module is not None:
+                return module
+        # collect the errors from this parse separately, so that we know
+        # if the result can be cached
+        errors = self.errors
+        self.errors = error.ErrorList()
+        try:
+            module = yang_parser.YangParser(extra).parse(self, ref, text)
+        finally:
+            parse_errors = self.errors
+            self.errors = errors
+        for epos, etag, eargs in parse_errors:
+            error.err_add(self.errors, epos, etag, eargs)
+        if (module is not None and not parse_errors and
+            parse_cache is not None and parse_cache.is_enabled(self)):
+            parse_cache.put(self, text, module)
+        return module
+
+    def prefetch_modules(self, items, jobs):
+        """Parse modules and the modules they depend on in parallel.
+
+        `items` is a list of (`ref`, `text`) for the modules that will be
+        added to the context.  The modules they import and include are
+        found in the repository.  All YANG modules are parsed using `jobs`
+        processes, and the results are stored in the parse cache.  The
+        modules are added to the context as usual by add_module() and
+        search_module(), so the result, including the order of errors,
+        is the same as without prefetching.
+        """
+        if self.parse_cache is None:
+            self.parse_cache = cache.ParseCache()
+        if not self.parse_cache.is_enabled(self):
+            return
+        queue = list(items)
+        todo = []
+        seen = set()
+        while queue:
+            (ref, text) = queue.pop(0)
+            if util.guess_format(text) != 'yang':
+                continue
+            todo.append((ref, text))
+            header = yang_parser.scan_header(ref, text)
+            if header is None:
+                continue
+            for (name, rev) in header.imports + header.includes:
+                if (name, rev) in seen:
+                    continue
+                seen.add((name, rev))
+                for (r, handle) in self.revs.get(name, []):
+                    if handle is None or handle[0] == 'parsed':
+                        continue
+                    if rev is not None and r != rev and r != 'unknown':
+                        continue
+                    if handle[0] == 'scanned':
+                        queue.append((handle[2], handle[3]))
+                        continue
+                    try:
+                        r = self.repository.get_module_from_handle(handle)
+                    except self.repository.ReadError:
+                        # reported when the module is searched for
+                        continue
+                    if r is not None:
+                        (ref, _in_format, text) = r
+                        queue.append((ref, text))
+        self.parse_cache.prefetch(self, todo, jobs)
+
     def add_parsed_module(self, module):
         if module is None:
             return None
@@ -131,7 +285,10 @@ class Context(object):
             other = self.modules[(module.arg, rev)]
             return other
 
+        if self.compact_statements:
+            statements.compact_statements(self, module)
         self.modules[(module.arg, rev)] = module
+        self.identity_index = None
 
         return module
 
@@ -139,6 +296,7 @@ class Context(object):
         """Remove a module from the context"""
         rev = util.get_latest_revision(module)
         del self.modules[(module.arg, rev)]
+        self.identity_index = None
 
     def get_module(self, modulename, revision=None):
         """Return the module if it exists in the context"""
@@ -182,11 +340,18 @@ class Context(object):
                     yintext = text
                     p = yin_parser.YinParser(
                         {'no_include': True, 'no_extensions': True})
+                    module = p.parse(self, ref, text)
                 else:
                     yintext = None
-                    p = yang_parser.YangParser()
-
-                module = p.parse(self, ref, text)
+                    # just scan the header of the module; it is parsed
+                    # when (and if) it is used, from the text read here
+                    header = yang_parser.scan_header(ref, text)
+                    if header is not None:
+                        revs[i] = (header.revision,
+                                   ('scanned', handle, ref, text))
+                        i += 1
+                        continue
+                    module = self._parse_yang(ref, text)
                 if module is not None:
                     rev = util.get_latest_revision(module)
                     revs[i] = (rev, ('parsed', module, ref, yintext))
@@ -231,6 +396,21 @@ class Context(object):
             if (modulename, revision) in self.modules:
                 return self.modules[(modulename, revision)]
 
+        if handle is not None and handle[0] == 'scanned':
+            # only the header has been scanned; parse the module now
+            (_scanned, _handle, ref, text) = handle
+            module = self._load_from_snapshot(ref, text, modulename, revision)
+            if module is not None:
+                return module
+            module = self._parse_yang(ref, text)
+            if module is None:
+                return None
+            if module.arg == modulename and self.keep_module_sources:
+                key = (module.arg, util.get_latest_revision(module))
+                if key not in self.modules:
+                    self.module_sources[key] = (ref, 'yang', text)
+            handle = ('parsed', module, ref, None)
+
         if handle is None:
             module = None
         elif handle[0] == 'parsed':
@@ -254,8 +434,13 @@ class Context(object):
             try:
                 ref, in_format, text = self.repository.get_module_from_handle(
                     handle)
-                module = self.add_module(
-                    ref, text, in_format, modulename, revision)
+                module = None
+                if in_format != 'yin':
+                    module = self._load_from_snapshot(ref, text,
+                                                      modulename, revision)
+                if module is None:
+                    module = self.add_module(
+                        ref, text, in_format, modulename, revision)
             except self.repository.ReadError as ex:
                 error.err_add(self.errors, pos, 'READ_ERROR', str(ex))
                 module = None
@@ -276,6 +461,51 @@ class Context(object):
         #     return None
         return module
 
+    def _load_from_snapshot(self, ref, text, modulename, revision):
+        """Return the validated module for `text` from the snapshot.
+
+        Returns None if the module is not in the snapshot, or if it cannot
+        be used in this context.  The modules it imports are searched for
+        first, and must resolve to the same modules as in the snapshot.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        x = snapshot.lookup(self, text)
+        if x is None:
+            return None
+        (key, entry) = x
+        if (entry['name'] != modulename or
+            (revision is not None and entry['revision'] != revision) or
+            modulename in self.features):
+            return None
+        for (name, revdate, ikey, line) in entry['imports']:
+            revs = self.revs.get(name)
+            if not revs or name in self.features:
+                return None
+            if revdate is None:
+                (rev, _handle) = self._get_latest_rev(revs)
+            else:
+                self._ensure_revs(revs)
+                if util.keysearch(revdate, 0, revs) is None:
+                    return None
+                rev = revdate
+            if rev != snapshot.entries[ikey]['revision']:
+                return None
+            pos = error.Position(ref)
+            pos.line = line
+            m = self.search_module(pos, name, revdate)
+            if m is None or getattr(m, 'i_snapshot_key', None) != ikey:
+                return None
+        module = snapshot.load(self, ref, key)
+        if self.compact_statements:
+            statements.compact_statements(self, module)
+        self.modules[(module.arg, entry['revision'])] = module
+        if self.keep_module_sources:
+            self.module_sources[(module.arg, entry['revision'])] = \
+                (ref, 'yang', text)
+        return module
+
     def read_module(self, modulename, revision=None, extra=None):
         """Searches for a module named `modulename` in the repository
 
@@ -314,18 +544,21 @@ class Context(object):
         else:
             # get it from the repos
             try:
-                ref, in_format, text = self.repository.get_module_from_handle(
-                    handle)
+                if handle[0] == 'scanned':
+                    (_scanned, _handle, ref, text) = handle
+                    in_format = 'yang'
+                else:
+                    ref, in_format, text = \
+                        self.repository.get_module_from_handle(handle)
 
                 if in_format is None:
                     in_format = util.guess_format(text)
 
                 if in_format == 'yin':
                     p = yin_parser.YinParser(extra)
+                    return p.parse(self, ref, text)
                 else:
-                    p = yang_parser.YangParser(extra)
-
-                return p.parse(self, ref, text)
+                    return self._parse_yang(ref, text, extra)
             except self.repository.ReadError as ex:
                 return None
 
@@ -338,16 +571,196 @@ class Context(object):
                 modules.append(m)
         for m in modules:
             statements.validate_module(self, m)
-            namespace = m.search_one('namespace')
-            if namespace is not None:
-                uri = namespace.arg
-                if uri in uris:
-                    if uris[uri] != m.arg:
-                        error.err_add(self.errors, namespace.pos,
-                                      'DUPLICATE_NAMESPACE',
-                                      (uri, uris[uri]))
+            self._check_namespace(uris, m)
+        self._update_dependencies()
+        self.identity_index = None
+
+    def get_identity_index(self):
+        """Return a `types.IdentityIndex` of the validated modules.
+
+        It is built when first needed after the modules have changed or
+        been validated."""
+        if self.identity_index is None:
+            self.identity_index = types.IdentityIndex(
+                [self.modules[key] for key in sorted(self.modules)])
+        return self.identity_index
+
+    def _check_namespace(self, uris, m):
+        namespace = m.search_one('namespace')
+        if namespace is not None:
+            uri = namespace.arg
+            if uri in uris:
+                if uris[uri] != m.arg:
+                    error.err_add(self.errors, namespace.pos,
+                                  'DUPLICATE_NAMESPACE',
+                                  (uri, uris[uri]))
+            else:
+                uris[uri] = m.arg
+
+    def _update_dependencies(self):
+        """Rebuild `dependencies` from the validated modules"""
+        deps = {}
+        for key in self.modules:
+            m = self.modules[key]
+            if m is not None and m.i_is_validated is True:
+                deps.setdefault(key, set())
+        def add(key, m):
+            if key in deps and m is not None:
+                deps[key].add(self._get_module_key(m))
+        for key in list(deps):
+            m = self.modules[key]
+            for i in m.search('import') + m.search('include'):
+                r = i.search_one('revision-date')
+                rev = r.arg if r is not None else None
+                dep = self.get_module(i.arg, rev)
+                if dep is not None:
+                    deps[key].add(self._get_module_key(dep))
                 else:
-                    uris[uri] = m.arg
+                    deps[key].add((i.arg, rev))
+            if m.keyword == 'submodule' and m.i_including_modulename:
+                add(key, self.get_module(m.i_including_modulename))
+            # the target modules of augments and deviations are changed
+            # by this module
+            for s in m.search('augment') + m.search('deviation'):
+                target = getattr(s, 'i_target_node', None)
+                if target is not None and target.i_module is not None:
+                    add(self._get_module_key(target.i_module), m)
+        self.dependencies = deps
+
+    def _get_module_key(self, module):
+        return (module.arg, util.get_latest_revision(module))
+
+    def get_dependents(self, keys):
+        """Return the set of modules that depend on the modules `keys`,
+        directly or indirectly, including the modules themselves.
+
+        `keys` is a list of (modulename, revision); revision None
+        matches the modules that did not find the module.
+        """
+        rdeps = {}
+        for (key, deps) in self.dependencies.items():
+            for dep in deps:
+                rdeps.setdefault(dep, []).append(key)
+        res = set()
+        queue = list(keys)
+        while queue:
+            key = queue.pop()
+            if key in res:
+                continue
+            res.add(key)
+            queue.extend(rdeps.get(key, []))
+        return set([key for key in res if key in self.modules])
+
+    def update_module(self, ref, text, in_format=None):
+        """Replace a module with a new text, and validate it again
+
+        The module with the same name as the module in `text`, and all
+        modules that depend on it according to `dependencies`, are
+        removed from the context, along with their errors.  They are
+        then added again from their texts, so that their validation
+        state is reset, and validated.  Other modules are not touched.
+
+        Returns the new module on success, and None on error.  If the
+        text cannot be parsed, the context is left as it was, except
+        for the parse errors.
+
+        The dependent modules are added again from the texts in
+        `module_sources`.  If `keep_module_sources` was not set when they
+        were added, they are read again from the files they were read
+        from.
+        """
+        if in_format is None:
+            in_format = util.guess_format(text)
+        if in_format == 'yin':
+            p = yin_parser.YinParser()
+            module = p.parse(self, ref, text)
+        else:
+            module = self._parse_yang(ref, text)
+        if (module is None or module.arg is None or
+            module.keyword not in ('module', 'submodule')):
+            # report the error
+            return self.add_parsed_module(module)
+        newkey = self._get_module_key(module)
+        oldkeys = [key for key in self.modules if key[0] == module.arg]
+        for key in oldkeys:
+            if self.module_sources.get(key, (None,))[0] == ref:
+                oldkeys = [key]
+                break
+        else:
+            oldkeys = [key for key in oldkeys if key == newkey]
+
+        affected = self.get_dependents(oldkeys + [(module.arg, None)])
+        refs = set([ref])
+        sources = []
+        for key in list(self.modules):
+            if key in affected:
+                m = self.modules.pop(key)
+                self.identity_index = None
+                if m is not None:
+                    refs.add(m.pos.ref)
+                source = self.module_sources.pop(key, None)
+                if source is None and m is not None:
+                    # the text was not kept; read the file again
+                    source = (m.pos.ref, None, None)
+                if key not in oldkeys and source is not None:
+                    sources.append((key, source))
+        self.errors = error.ErrorList(
+            [e for e in self.errors if not refs.intersection(_get_refs(e[0]))])
+
+        revs = self.revs.setdefault(module.arg, [])
+        for key in oldkeys:
+            if key[1] != newkey[1]:
+                # the old revision has been replaced by the new text
+                revs[:] = [x for x in revs if x[0] != key[1]]
+        if util.keysearch(newkey[1], 0, revs) is None:
+            revs.append((newkey[1], None))
+        m = self.add_parsed_module(module)
+        if m is not module:
+            return m
+        if self.keep_module_sources:
+            self.module_sources[newkey] = (ref, in_format, text)
+        for (key, (sref, sformat, stext)) in sources:
+            if key in self.modules:
+                continue
+            if stext is None:
+                try:
+                    with io.open(sref, "r", encoding="utf-8") as fd:
+                        stext = fd.read()
+                except (IOError, UnicodeDecodeError) as ex:
+                    error.err_add(self.errors, error.Position(sref),
+                                  'READ_ERROR', "%s: %s" % (sref, ex))
+                    continue
+                sformat = util.guess_format(stext)
+            m = None
+            if sformat != 'yin':
+                m = self._load_from_snapshot(sref, stext, key[0], key[1])
+            if m is None:
+                self.add_module(sref, stext, sformat)
+
+        for (i, m) in enumerate(self.deviation_modules):
+            key = self._get_module_key(m)
+            if key in oldkeys:
+                self.deviation_modules[i] = module
+            elif key in affected and key in self.modules:
+                self.deviation_modules[i] = self.modules[key]
+
+        uris = {}
+        for key in list(self.modules):
+            m = self.modules[key]
+            if m is None:
+                continue
+            statements.validate_module(self, m)
+            self._check_namespace(uris, m)
+        self._update_dependencies()
+        return module
+
+def _get_refs(pos):
+    """Return the refs of an error position, and of the uses it is in"""
+    refs = []
+    while pos is not None:
+        refs.append(pos.ref)
+        pos = pos.uses_pos
+    return refs
 
 class Repository(object):
     """Abstract base class that represents a module repository"""
@@ -378,10 +791,14 @@ class Repository(object):
 
 class FileRepository(Repository):
     def __init__(self, path="", use_env=True, no_path_recurse=False,
-                 verbose=False):
+                 verbose=False, index_file=None):
         """Create a Repository which searches the filesystem for modules
 
         `path` is a `os.pathsep`-separated string of directories
+        `index_file` is the name of a file where the contents of the
+              scanned directories are saved between runs.  Only
+              directories that have been modified since they were saved
+              are scanned again.
         """
 
         Repository.__init__(self)
@@ -389,6 +806,7 @@ class FileRepository(Repository):
         self.no_path_recurse = no_path_recurse
         self.modules = None
         self.verbose = verbose
+        self.index_file = index_file
 
         for directory in path.split(os.pathsep):
             self._add_directory(directory)
@@ -452,28 +870,104 @@ class FileRepository(Repository):
     def _setup(self, ctx):
         # check all dirs for yang and yin files
         self.modules = []
-        def add_files_from_dir(d):
+        index = self._read_index()
+        changed = [False]
+        def is_item(d, kind, fname):
+            absfilename = os.path.join(d, fname)
+            if kind == 'f':
+                return (os.path.isfile(absfilename) and
+                        os.access(absfilename, os.R_OK))
+            return os.path.isdir(absfilename)
+        def scan_dir(d):
+            """Return a list of the module files and directories in `d`"""
+            if self.index_file is not None:
+                absdir = os.path.abspath(d)
+                try:
+                    mtime = os.stat(d).st_mtime
+                except OSError:
+                    if index.pop(absdir, None) is not None:
+                        changed[0] = True
+                    return []
+                entry = index.get(absdir)
+                if entry is not None and entry['mtime'] == mtime:
+                    # the files may have been removed or made unreadable
+                    # without changing the directory
+                    return [[kind, fname] for (kind, fname) in entry['items']
+                            if is_item(d, kind, fname)]
             try:
                 files = os.listdir(d)
             except OSError:
                 files = []
+            items = []
             for fname in files:
                 absfilename = os.path.join(d, fname)
                 if os.path.isfile(absfilename):
                     m = syntax.re_filename.search(fname)
                     if m is not None:
-                        name, rev, in_format = m.groups()
                         if not os.access(absfilename, os.R_OK):
                             continue
-                        if absfilename.startswith("./"):
-                            absfilename = absfilename[2:]
-                        handle = in_format, absfilename
-                        self.modules.append((name, rev, handle))
-                elif (not self.no_path_recurse
-                      and d != '.' and os.path.isdir(absfilename)):
+                        items.append(['f', fname])
+                elif os.path.isdir(absfilename):
+                    items.append(['d', fname])
+            if self.index_file is not None:
+                # do not save a directory which may be modified again
+                # within the resolution of its timestamp
+                if abs(time.time() - mtime) > 2:
+                    index[absdir] = {'mtime': mtime, 'items': items}
+                else:
+                    index.pop(absdir, None)
+                changed[0] = True
+            return items
+        def add_files_from_dir(d):
+            for kind, fname in scan_dir(d):
+                absfilename = os.path.join(d, fname)
+                if kind == 'f':
+                    name, rev, in_format = \
+                        syntax.re_filename.search(fname).groups()
+                    if absfilename.startswith("./"):
+                        absfilename = absfilename[2:]
+                    handle = in_format, absfilename
+                    self.modules.append((name, rev, handle))
+                elif not self.no_path_recurse and d != '.':
                     add_files_from_dir(absfilename)
         for d in self.dirs:
             add_files_from_dir(d)
+        # drop the directories that no longer exist, also when they are
+        # no longer in the search path
+        for absdir in list(index):
+            if not os.path.isdir(absdir):
+                del index[absdir]
+                changed[0] = True
+        if changed[0]:
+            self._write_index(index)
+
+    def _read_index(self):
+        if self.index_file is None:
+            return {}
+        try:
+            with open(self.index_file, "r") as fd:
+                index = json.load(fd)
+            if index.get('version') == 1:
+                return index['dirs']
+        except (IOError, OSError, ValueError, KeyError, AttributeError):
+            pass
+        return {}
+
+    def _write_index(self, index):
+        # the index is just an optimization; never fail because of it
+        tmpfile = '%s.%s.tmp' % (self.index_file, os.getpid())
+        try:
+            d = os.path.dirname(self.index_file)
+            if d and not os.path.isdir(d):
+                os.makedirs(d)
+            with open(tmpfile, "w") as fd:
+                json.dump({'version': 1, 'dirs': index}, fd)
+            os.rename(tmpfile, self.index_file)
+        except (IOError, OSError):
+            try:
+                os.remove(tmpfile)
+            except OSError:
+                pass
 
     def get_modules_and_revisions(self, ctx):
         if self.modules is None:
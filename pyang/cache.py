@@ -0,0 +1,278 @@
+"""Persistent cache of parsed YANG modules
+
+The cache maps the text of a module to its raw statement tree, as
+produced by the YANG parser, before any validation is done.  Entries
+are content-addressed, i.e., keyed by a hash of the module text, the
+context options that affect parsing, and the pyang version and parser
+sources, so that a cache directory can be kept across upgrades.  Only
+modules that were parsed without any errors or warnings are stored, so
+that a cache hit is indistinguishable from a real parse.
+"""
+
+import collections
+import errno
+import hashlib
+import marshal
+import multiprocessing
+import os
+import zlib
+
+from . import error
+from . import statements
+from . import yang_parser
+
+CACHE_FORMAT = 1
+"""Version of the serialized format.  Bump when it changes."""
+
+_parser_digest = None
+
+def _get_parser_digest():
+    """Return a digest of the pyang version and the parser sources, so
+    that trees cached by another version of the parser are not used"""
+    global _parser_digest
+    if _parser_digest is None:
+        import pyang
+        h = hashlib.sha1(pyang.__version__.encode('utf-8'))
+        pkgdir = os.path.dirname(os.path.abspath(__file__))
+        for fname in ('yang_parser.py', 'statements.py'):
+            with open(os.path.join(pkgdir, fname), 'rb') as fd:
+                h.update(fd.read())
+        _parser_digest = h.hexdigest()
+    return _parser_digest
+
+def serialize(stmt):
+    """Return a compact, marshallable representation of `stmt`.
+
+    The representation is a nested tuple
+    (raw_keyword, arg, line, (substmt, ...)).
+    """
+    return (stmt.raw_keyword, stmt.arg, stmt.pos.line,
+            tuple([serialize(s) for s in stmt.substmts]))
+
+def deserialize(ref, data):
+    """Return a new Statement tree built from the output of serialize().
+
+    `ref` is used as the position reference of all statements.
+    """
+    pos = error.Position(ref)
+    (keyword, arg, line, substmts) = data
+    pos.line = line
+    top = statements.new_statement(None, None, pos, keyword, arg)
+    pos.top = top
+    def build(parent, substmts):
+        for (keyword, arg, line, subs) in substmts:
+            pos.line = line
+            stmt = statements.new_statement(top, parent, pos, keyword, arg)
+            parent.substmts.append(stmt)
+            build(stmt, subs)
+    build(top, substmts)
+    return top
+
+class _ParseContext(object):
+    """The parts of a Context used by the YANG parser"""
+
+    def __init__(self, max_line_len, lax_quote_checks):
+        self.errors = []
+        self.max_line_len = max_line_len
+        self.lax_quote_checks = lax_quote_checks
+        self.keep_comments = False
+        self.keep_arg_substrings = False
+
+def _parse_worker(args):
+    """Parse one module, possibly in another process.
+
+    Returns (key, <serialized tree>), or (key, None) if the module could
+    not be parsed without errors.
+    """
+    (key, ref, text, max_line_len, lax_quote_checks) = args
+    ctx = _ParseContext(max_line_len, lax_quote_checks)
+    try:
+        module = yang_parser.YangParser().parse(ctx, ref, text)
+    except Exception:
+        # leave it to the real parse to report the problem
+        return (key, None)
+    if module is None or len(ctx.errors) > 0:
+        return (key, None)
+    return (key, serialize(module))
+
+class ParseCache(object):
+    """Cache of parsed modules, kept in memory and optionally on disk"""
+
+    def __init__(self, directory=None, max_size=64*1024*1024,
+                 max_entries=None):
+        """Create a cache, persisted in `directory` if not None.
+
+        `max_size` is the maximum number of bytes used on disk;
+        when it is exceeded the least recently used entries are removed.
+        `max_entries`, if not None, is the maximum number of entries
+        kept in memory; when it is exceeded the least recently used
+        entries are removed from memory.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        """dict of key:<serialized tree>, least recently used first"""
+        self._disk_size = None
+
+    def is_enabled(self, ctx):
+        """Return True if modules parsed in `ctx` can be cached"""
+        # comments and argument substrings are not part of the
+        # serialized form
+        return not ctx.keep_comments and not ctx.keep_arg_substrings
+
+    def key(self, ctx, text):
+        """Return the cache key for `text` parsed in `ctx`"""
+        h = hashlib.sha1()
+        h.update(('%s:%s:%s:%s:' % (CACHE_FORMAT, _get_parser_digest(),
+                                    ctx.max_line_len,
+                                    ctx.lax_quote_checks)).encode('utf-8'))
+        h.update(text.encode('utf-8'))
+        return h.hexdigest()
+
+    def get(self, ctx, ref, text):
+        """Return a new Statement tree for `text`, or None if not cached"""
+        key = self.key(ctx, text)
+        data = self.entries.get(key)
+        if data is None and self.directory is not None:
+            data = self._read(key)
+        if data is None:
+            return None
+        self.add(key, data)
+        return deserialize(ref, data)
+
+    def put(self, ctx, text, module):
+        """Add the parsed `module` for `text` to the cache"""
+        key = self.key(ctx, text)
+        if key in self.entries:
+            return
+        data = serialize(module)
+        self.add(key, data)
+        if self.directory is not None:
+            self._write(key, data)
+
+    def prefetch(self, ctx, items, jobs):
+        """Parse the YANG modules in `items` using `jobs` processes.
+
+        `items` is a list of (ref, text).  The modules that are parsed
+        without errors are added to the cache.  The others are left to
+        the normal parse, so that errors are reported as usual.
+        """
+        if not self.is_enabled(ctx):
+            return
+        work = []
+        keys = set()
+        for (ref, text) in items:
+            key = self.key(ctx, text)
+            if key in keys or key in self.entries:
+                continue
+            keys.add(key)
+            if (self.directory is not None and
+                os.path.exists(self._filename(key))):
+                continue
+            work.append((key, ref, text, ctx.max_line_len,
+                         ctx.lax_quote_checks))
+        if len(work) == 0:
+            return
+        if jobs > 1 and len(work) > 1:
+            jobs = min(jobs, len(work))
+            pool = multiprocessing.Pool(jobs)
+            try:
+                res = pool.map(_parse_worker, work,
+                               max(1, len(work) // (jobs * 4)))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            res = [_parse_worker(w) for w in work]
+        for (key, data) in res:
+            if data is not None:
+                self.add(key, data)
+                if self.directory is not None:
+                    self._write(key, data)
+
+    def add(self, key, data):
+        """Add or move the entry `key` last in memory, and remove the
+        least recently used entries if there are too many"""
+        entries = self.entries
+        entries.pop(key, None)
+        entries[key] = data
+        if self.max_entries is not None:
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key + '.tree')
+
+    def _read(self, key):
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as fd:
+                data = marshal.loads(zlib.decompress(fd.read()))
+            # mark the entry as recently used
+            os.utime(filename, None)
+            return data
+        except (IOError, OSError, ValueError, EOFError, TypeError,
+                zlib.error):
+            return None
+
+    def _write(self, key, data):
+        filename = self._filename(key)
+        tmpfile = '%s.%s.tmp' % (filename, os.getpid())
+        try:
+            try:
+                os.makedirs(self.directory)
+            except OSError as ex:
+                if ex.errno != errno.EEXIST:
+                    raise
+            buf = zlib.compress(marshal.dumps(data))
+            with open(tmpfile, 'wb') as fd:
+                fd.write(buf)
+            os.rename(tmpfile, filename)
+        except (IOError, OSError):
+            # the cache is just an optimization; never fail because of it
+            try:
+                os.remove(tmpfile)
+            except OSError:
+                pass
+            return
+        if self._disk_size is None:
+            self._disk_size = self._du()
+        else:
+            self._disk_size += len(buf)
+        if self._disk_size > self.max_size:
+            self._evict()
+
+    def _list(self):
+        res = []
+        try:
+            fnames = os.listdir(self.directory)
+        except OSError:
+            return res
+        for fname in fnames:
+            if not fname.endswith('.tree'):
+                continue
+            filename = os.path.join(self.directory, fname)
+            try:
+                st = os.stat(filename)
+            except OSError:
+                continue
+            res.append((st.st_mtime, st.st_size, filename))
+        return res
+
+    def _du(self):
+        return sum([size for (_mtime, size, _filename) in self._list()])
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits"""
+        files = sorted(self._list())
+        size = sum([size for (_mtime, size, _filename) in files])
+        for (_mtime, fsize, filename) in files:
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(filename)
+                size -= fsize
+            except OSError:
+                pass
+        self._disk_size = size
@@ -16,6 +16,15 @@ class Position(object):
         self.top = None
         self.uses_pos = None
 
+    def __copy__(self):
+        # faster than the default copy of an object with __slots__
+        new = Position.__new__(self.__class__)
+        new.ref = self.ref
+        new.line = self.line
+        new.top = self.top
+        new.uses_pos = self.uses_pos
+        return new
+
     def __str__(self):
         s = self.ref + ':' + str(self.line)
         if self.uses_pos is None:
@@ -526,7 +535,152 @@ def err_to_str(tag, args):
     except KeyError:
         return 'unknown error %s' % tag
 
+def _error_key(pos, tag, args):
+    key = (pos.ref, pos.line, pos.top, tag, args)
+    try:
+        hash(key)
+    except TypeError:
+        # e.g. a list in the arguments
+        key = (pos.ref, pos.line, pos.top, tag, repr(args))
+    return key
+
+class ErrorList(list):
+    """A list of (<Position>, tag, args) errors, used for Context.errors.
+
+    err_add() finds an equal error in an ErrorList with a hash lookup,
+    instead of comparing with each error in the list.  The errors can be
+    added, removed and sorted with the usual list methods.
+    """
+
+    def __init__(self, errors=()):
+        list.__init__(self, errors)
+        self._size = 0
+        """number of errors in _keys and _files"""
+        self._keys = None
+        """set of the keys of the errors"""
+        self._files = None
+        """dict of ref:<list of errors>"""
+
+    def _update(self):
+        if self._keys is None or self._size > len(self):
+            self._keys = set()
+            self._files = {}
+            self._size = 0
+        keys = self._keys
+        files = self._files
+        for i in range(self._size, len(self)):
+            e = self[i]
+            (pos, tag, args) = e
+            keys.add(_error_key(pos, tag, args))
+            files.setdefault(pos.ref, []).append(e)
+        self._size = len(self)
+
+    def _changed(self):
+        # errors have been removed, replaced or moved
+        self._keys = None
+
+    def __copy__(self):
+        return ErrorList(self)
+
+    def add(self, pos, tag, args):
+        """Add an error, unless an equal error is already in the list.
+
+        Returns True if the error is added."""
+        if self._size != len(self) or self._keys is None:
+            self._update()
+        key = (pos.ref, pos.line, pos.top, tag, args)
+        try:
+            if key in self._keys:
+                return False
+        except TypeError:
+            key = _error_key(pos, tag, args)
+            if key in self._keys:
+                return False
+        e = (copy.copy(pos), tag, args)
+        list.append(self, e)
+        self._keys.add(key)
+        self._files.setdefault(pos.ref, []).append(e)
+        self._size += 1
+        return True
+
+    def by_file(self):
+        """Return a list of (ref, <list of errors>), sorted by ref.
+
+        The errors of each file are sorted by line, and are otherwise
+        in the order they were added."""
+        self._update()
+        res = []
+        for ref in sorted(self._files):
+            errors = sorted(self._files[ref], key=lambda e: e[0].line)
+            res.append((ref, errors))
+        return res
+
+    def __setitem__(self, i, e):
+        list.__setitem__(self, i, e)
+        self._changed()
+
+    def __delitem__(self, i):
+        list.__delitem__(self, i)
+        self._changed()
+
+    # python 2 slices
+    def __setslice__(self, i, j, errors):
+        list.__setslice__(self, i, j, errors)
+        self._changed()
+
+    def __delslice__(self, i, j):
+        list.__delslice__(self, i, j)
+        self._changed()
+
+    def __imul__(self, n):
+        res = list.__imul__(self, n)
+        self._changed()
+        return res
+
+    def insert(self, i, e):
+        list.insert(self, i, e)
+        self._changed()
+
+    def pop(self, *args):
+        e = list.pop(self, *args)
+        self._changed()
+        return e
+
+    def remove(self, e):
+        list.remove(self, e)
+        self._changed()
+
+    def clear(self):
+        del self[:]
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+def sort_errors(errors, first_ref=None):
+    """Return the errors sorted by file and line.
+
+    The errors in the file `first_ref` come first."""
+    if not isinstance(errors, ErrorList):
+        errors = ErrorList(errors)
+    res = []
+    rest = []
+    for (ref, file_errors) in errors.by_file():
+        if ref == first_ref:
+            res.extend(file_errors)
+        else:
+            rest.extend(file_errors)
+    res.extend(rest)
+    return res
+
 def err_add(errors, pos, tag, args):
+    if isinstance(errors, ErrorList):
+        errors.add(pos, tag, args)
+        return
     error = (copy.copy(pos), tag, args)
     # surely this can be done more elegant??
     for p, t, a in errors:
@@ -78,6 +78,7 @@ def add_stmt(stmt, arg_rules):
     """Use by plugins to add grammar for an extension statement."""
     (arg, rules) = arg_rules
     stmt_map[stmt] = (arg, rules)
+    _grammar_changed()
 
 def add_to_stmts_rules(stmts, rules):
     """Use by plugins to add extra rules to the existing rules for
@@ -104,6 +105,7 @@ def add_to_stmts_rules(stmts, rules):
                 i += 1
             if i == len(rules0):
                 rules0.insert(i, r)
+    _grammar_changed()
 
 stmt_map = {
     'module':
@@ -587,10 +589,98 @@ def chk_statement(ctx, stmt, grammar, canonical=False):
         canspec = grammar
     else:
         canspec = []
-    _chk_stmts(ctx, stmt.pos, [stmt], None, (grammar, canspec), canonical)
+    state = _get_state((grammar, canspec), canonical)
+    _chk_stmts(ctx, stmt.pos, [stmt], None, state, canonical)
     return n == len(ctx.errors)
 
-def _chk_stmts(ctx, pos, stmts, parent, spec, canonical):
+class _State(object):
+    """A state in the automaton for the substatements of a statement.
+
+    The grammar is compiled lazily: the first time a keyword is seen in
+    a state, the spec is matched with _match_stmt(), and the resulting
+    state and errors are stored as a transition.  Later statements with
+    the same keyword in the same state just follow the transition.
+    """
+    def __init__(self, specs):
+        self.specs = specs
+        """(spec, canspec), as used by _match_stmt()"""
+        self.transitions = {}
+        """dict of (keyword, yang-version):(<next _State> | None, errors)"""
+        self.missing = [keywd for (keywd, occurance) in specs[0]
+                        if occurance == '1' or occurance == '+']
+        """keywords that must occur before the end of the block"""
+
+_states = {}
+"""dict of (canonical, frozen spec, frozen canspec):_State"""
+
+_start_states = {}
+"""dict of (keyword, canonical):_State, the state for the first
+substatement of a statement"""
+
+generation = 0
+"""Incremented each time the grammar is changed by a plugin"""
+
+def _grammar_changed():
+    global generation
+    generation += 1
+    _states.clear()
+    _start_states.clear()
+
+def _freeze(spec):
+    if isinstance(spec, (list, tuple)):
+        return tuple([_freeze(x) for x in spec])
+    return spec
+
+def _get_state(specs, canonical):
+    key = (canonical, _freeze(specs[0]), _freeze(specs[1]))
+    state = _states.get(key)
+    if state is None:
+        state = _State(specs)
+        _states[key] = state
+    return state
+
+def _get_start_state(keyword, subspec, canonical):
+    state = _start_states.get((keyword, canonical))
+    if state is None:
+        if canonical:
+            cansubspec = subspec
+        else:
+            cansubspec = []
+        state = _get_state((subspec, cansubspec), canonical)
+        _start_states[(keyword, canonical)] = state
+    return state
+
+def _next_state(ctx, state, stmt, canonical):
+    """Match stmt in `state`.
+
+    Return None | <next _State>
+    """
+    i_module = getattr(stmt, 'i_module', None)
+    key = (stmt.keyword, getattr(i_module, 'i_version', None))
+    try:
+        (next_state, errors) = state.transitions[key]
+    except KeyError:
+        save_errors = ctx.errors
+        ctx.errors = []
+        try:
+            match_res = _match_stmt(ctx, stmt, state.specs, canonical)
+            # all errors from _match_stmt are reported on stmt, with
+            # stmt's keyword as the first argument
+            errors = [(tag, args[1:]) for (_pos, tag, args) in ctx.errors]
+        finally:
+            ctx.errors = save_errors
+        if match_res is None:
+            next_state = None
+        else:
+            next_state = _get_state(match_res, canonical)
+        state.transitions[key] = (next_state, errors)
+    if errors:
+        keywd = util.keyword_to_str(stmt.raw_keyword)
+        for (tag, args) in errors:
+            error.err_add(ctx.errors, stmt.pos, tag, (keywd,) + args)
+    return next_state
+
+def _chk_stmts(ctx, pos, stmts, parent, state, canonical):
     for stmt in stmts:
         stmt.is_grammatically_valid = False
         if stmt.keyword == '_comment':
@@ -604,14 +694,15 @@ def _chk_stmts(ctx, pos, stmts, parent, spec, canonical):
             else:
                 chk_grammar = False
         if chk_grammar:
-            match_res = _match_stmt(ctx, stmt, spec, canonical)
+            match_res = _next_state(ctx, state, stmt, canonical)
         else:
             match_res = None
         if match_res is None and chk_grammar:
             if canonical:
                 save_errors = ctx.errors
                 ctx.errors = []
-                if _match_stmt(ctx, stmt, (spec[1], []), False) is not None:
+                if (_match_stmt(ctx, stmt, (state.specs[1], []), False)
+                    is not None):
                     ctx.errors = save_errors
                     error.err_add(ctx.errors, stmt.pos,
                                   'UNEXPECTED_KEYWORD_CANONICAL',
@@ -652,31 +743,27 @@ def _chk_stmts(ctx, pos, stmts, parent, spec, canonical):
             else:
                 stmt.is_grammatically_valid = True
 
-            if canonical:
-                cansubspec = subspec
-            else:
-                cansubspec = []
             _chk_stmts(ctx, stmt.pos, stmt.substmts, stmt,
-                       (subspec, cansubspec), canonical)
-            spec = match_res
+                       _get_start_state(stmt.keyword, subspec, canonical),
+                       canonical)
+            state = match_res
         else:
             # unknown extension
             stmt.is_grammatically_valid = True
             nspec = [('$any', '*')]
             _chk_stmts(ctx, stmt.pos, stmt.substmts, stmt,
-                       (nspec, nspec), canonical)
+                       _get_state((nspec, nspec), canonical), canonical)
         # update last know position
         pos = stmt.pos
     # any non-optional statements left are errors
-    for keywd, occurance in spec[0]:
-        if occurance == '1' or occurance == '+':
-            if parent is None:
-                error.err_add(ctx.errors, pos, 'EXPECTED_KEYWORD',
-                              util.keyword_to_str(keywd))
-            else:
-                error.err_add(ctx.errors, pos, 'EXPECTED_KEYWORD_2',
-                              (util.keyword_to_str(keywd),
-                               util.keyword_to_str(parent.raw_keyword)))
+    for keywd in state.missing:
+        if parent is None:
+            error.err_add(ctx.errors, pos, 'EXPECTED_KEYWORD',
+                          util.keyword_to_str(keywd))
+        else:
+            error.err_add(ctx.errors, pos, 'EXPECTED_KEYWORD_2',
+                          (util.keyword_to_str(keywd),
+                           util.keyword_to_str(parent.raw_keyword)))
 
 def _match_stmt(ctx, stmt, specs, canonical):
     """Match stmt against the spec.
@@ -685,24 +685,22 @@ def chk_string(old, new, oldts, newts, ctx):
 def chk_enumeration(old, new, oldts, newts, ctx):
     # verify that all old enums are still in new, with the same values
     for name, val in oldts.enums:
-        n = util.keysearch(name, 0, newts.enums)
-        if n is None:
+        if name not in newts.values:
             err_add(ctx.errors, new.pos, 'CHK_DEF_REMOVED',
                     ('enum', name, old.pos))
-        elif n[1] != val:
+        elif newts.values[name] != val:
             err_add(ctx.errors, new.pos, 'CHK_ENUM_VALUE_CHANGED',
-                    (name, val, n[1]))
+                    (name, val, newts.values[name]))
 
 def chk_bits(old, new, oldts, newts, ctx):
     # verify that all old bits are still in new, with the same positions
     for name, pos in oldts.bits:
-        n = util.keysearch(name, 0, newts.bits)
-        if n is None:
+        if name not in newts.positions:
             err_add(ctx.errors, new.pos, 'CHK_DEF_REMOVED',
                     ('bit', name, old.pos))
-        elif n[1] != pos:
+        elif newts.positions[name] != pos:
             err_add(ctx.errors, new.pos, 'CHK_BIT_POSITION_CHANGED',
-                    (name, pos, n[1]))
+                    (name, pos, newts.positions[name]))
 
 def chk_binary(old, new, oldts, newts, ctx):
     # FIXME: see types.py; we can't check the length
@@ -0,0 +1,185 @@
+"""Profiling of the validation
+
+Set Context.validation_profile to a ValidationProfile to record, for
+each validated module, the time spent in each validation phase and in
+each validation function, the number of calls of each function, and the
+number of statements visited in each phase.
+
+The time of a module does not include the time spent validating other
+modules, e.g., imported modules, while it is validated.  While a
+profile is recorded, the phases are run one by one (see
+statements.set_phase_local()).
+"""
+
+import json
+import time
+
+from . import util
+
+_now = getattr(time, 'perf_counter', time.time)
+
+class ValidationProfile(object):
+    def __init__(self):
+        self.modules = {}
+        """dict of module name:<module entry>, where <module entry> is
+        a dict with:
+          'time': the time spent validating the module
+          'phases': dict of phase:{'time': ..., 'stmts': ...}
+          'functions': dict of (phase, keyword, function name):
+                         {'time': ..., 'calls': ...}
+        keyword is a keyword or a special variable in
+        statements._validation_map."""
+        self._stack = []
+        """list of [<module entry>, start time, nested time] for the
+        modules being validated"""
+
+    def begin_module(self, module):
+        entry = self.modules.get(module.arg)
+        if entry is None:
+            entry = {'time': 0.0, 'phases': {}, 'functions': {}}
+            self.modules[module.arg] = entry
+        self._stack.append([entry, _now(), 0.0])
+
+    def end_module(self):
+        (entry, start, nested) = self._stack.pop()
+        elapsed = _now() - start
+        entry['time'] += elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def start(self):
+        """Return a start mark for add_phase() and add_function()"""
+        return (_now(), self._stack[-1][2])
+
+    def _elapsed(self, mark):
+        (start, nested) = mark
+        return _now() - start - (self._stack[-1][2] - nested)
+
+    def add_phase(self, phase, mark):
+        p = self._get_phase(phase)
+        p['time'] += self._elapsed(mark)
+
+    def add_stmt(self, phase):
+        self._get_phase(phase)['stmts'] += 1
+
+    def _get_phase(self, phase):
+        phases = self._stack[-1][0]['phases']
+        p = phases.get(phase)
+        if p is None:
+            p = {'time': 0.0, 'stmts': 0}
+            phases[phase] = p
+        return p
+
+    def add_function(self, phase, keyword, name, mark):
+        functions = self._stack[-1][0]['functions']
+        key = (phase, keyword, name)
+        f = functions.get(key)
+        if f is None:
+            f = {'time': 0.0, 'calls': 0}
+            functions[key] = f
+        f['time'] += self._elapsed(mark)
+        f['calls'] += 1
+
+    def wrap(self, phase, keyword, fun):
+        """Return a function that calls `fun`, registered for
+        (`phase`, `keyword`) in _validation_map, and records the calls.
+
+        If `fun` is a sequence of functions added with
+        statements.add_validation_fun(), each of them is recorded.
+        """
+        funs = [(f, function_name(f))
+                for f in getattr(fun, 'funs', (fun,))]
+        def wrapper(ctx, stmt):
+            res = None
+            for (f, name) in funs:
+                mark = self.start()
+                res = f(ctx, stmt)
+                self.add_function(phase, keyword, name, mark)
+            return res
+        return wrapper
+
+    def report(self):
+        """Return the profile as a dict that can be serialized as JSON"""
+        def phase_list(phases):
+            return sorted([{'phase': phase,
+                            'time': p['time'],
+                            'stmts': p['stmts']}
+                           for (phase, p) in phases.items()],
+                          key=lambda x: (-x['time'], x['phase']))
+        def function_list(functions):
+            return sorted([{'phase': phase,
+                            'keyword': util.keyword_to_str(keyword),
+                            'function': name,
+                            'time': f['time'],
+                            'calls': f['calls']}
+                           for ((phase, keyword, name), f)
+                           in functions.items()],
+                          key=lambda x: (-x['time'], x['phase'],
+                                         x['keyword'], x['function']))
+        phases = {}
+        functions = {}
+        modules = {}
+        for (name, entry) in self.modules.items():
+            for (phase, p) in entry['phases'].items():
+                q = phases.setdefault(phase, {'time': 0.0, 'stmts': 0})
+                q['time'] += p['time']
+                q['stmts'] += p['stmts']
+            for (key, f) in entry['functions'].items():
+                g = functions.setdefault(key, {'time': 0.0, 'calls': 0})
+                g['time'] += f['time']
+                g['calls'] += f['calls']
+            modules[name] = {'time': entry['time'],
+                             'phases': phase_list(entry['phases']),
+                             'functions': function_list(entry['functions'])}
+        return {'time': sum([entry['time']
+                             for entry in self.modules.values()]),
+                'phases': phase_list(phases),
+                'functions': function_list(functions),
+                'modules': modules}
+
+    def write_json(self, fd):
+        fd.write(json.dumps(self.report(), indent=2, sort_keys=True))
+        fd.write('\n')
+
+    def write_summary(self, fd, n=10):
+        """Write the `n` most expensive phases, functions and modules"""
+        report = self.report()
+        total = report['time']
+        def percent(t):
+            if total == 0:
+                return 0.0
+            return 100.0 * t / total
+        fd.write('validation of %d modules: %.3fs\n' %
+                 (len(report['modules']), total))
+        fd.write('phases:\n')
+        for p in report['phases'][:n]:
+            fd.write('  %8.3fs %5.1f%% %9d stmts  %s\n' %
+                     (p['time'], percent(p['time']), p['stmts'], p['phase']))
+        fd.write('functions:\n')
+        for f in report['functions'][:n]:
+            fd.write('  %8.3fs %5.1f%% %9d calls  %s %s %s\n' %
+                     (f['time'], percent(f['time']), f['calls'],
+                      f['phase'], f['keyword'], f['function']))
+        fd.write('modules:\n')
+        modules = sorted(report['modules'].items(),
+                         key=lambda x: (-x[1]['time'], x[0]))
+        for (name, m) in modules[:n]:
+            fd.write('  %8.3fs %5.1f%%  %s\n' %
+                     (m['time'], percent(m['time']), name))
+
+def function_name(fun):
+    """Return a readable name for a validation function.
+
+    The functions in _validation_map are often lambdas that call a named
+    function; then the name of that function is used.
+    """
+    name = getattr(fun, '__name__', None)
+    if name is None:
+        return type(fun).__name__
+    code = getattr(fun, '__code__', None)
+    if name == '<lambda>' and code is not None and code.co_names:
+        name = code.co_names[0]
+    modname = getattr(fun, '__module__', None)
+    if modname:
+        name = '%s.%s' % (modname.split('.')[-1], name)
+    return name
@@ -0,0 +1,206 @@
+"""Server mode: run pyang commands in a resident process
+
+The server listens on a UNIX socket.  For each request, it forks a
+child process which runs the command with the client's arguments,
+current directory, environment and standard streams (which are passed
+over the socket), and sends back the exit code.  Since the child is a
+copy of the server, it starts with all plugins loaded and with the
+modules parsed by earlier requests in its parse cache.  When the child
+is done, it sends the modules it parsed back to the server.
+
+Only the parsed statement trees are kept (at most `max_entries` of
+them, the least recently used are dropped); the modules are validated
+again by each request.
+
+The client side is in bin/pyang, so that it can run without importing
+pyang.
+
+The protocol is: the client sends a 4 byte length (network order)
+followed by a JSON object with 'argv', 'cwd' and 'env', together with
+its stdin, stdout and stderr file descriptors.  The server replies with
+a JSON object with 'exit', the exit code, or 'fallback', if the client
+must run the command itself.
+"""
+
+import array
+import errno
+import io
+import json
+import marshal
+import os
+import select
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+from . import cache
+
+max_entries = 5000
+"""maximum number of parsed modules kept by the server"""
+
+class Fallback(Exception):
+    """Raised by a request handler when the client must run the command"""
+
+def serve(sockname, handler):
+    """Serve requests on the UNIX socket `sockname` until killed.
+
+    `handler` is called as handler(argv, parse_cache) in a child
+    process for each request, and returns the exit code, or raises
+    SystemExit or Fallback.
+    """
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(socket.socket, 'recvmsg'):
+        sys.stderr.write("server mode is not supported on this platform\n")
+        sys.exit(1)
+    parse_cache = cache.ParseCache(max_entries=max_entries)
+    sock = _listen(sockname)
+    # remove the socket when killed
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(0))
+    children = {}
+    """dict of pipe fd:(pid, [data])"""
+    try:
+        while True:
+            rfds = [sock.fileno()] + list(children)
+            try:
+                (ready, _w, _x) = select.select(rfds, [], [])
+            except (OSError, select.error) as ex:
+                if ex.args[0] == errno.EINTR:
+                    continue
+                raise
+            for fd in ready:
+                if fd == sock.fileno():
+                    (conn, _addr) = sock.accept()
+                    (pid, rfd) = _fork(sock, conn, handler, parse_cache)
+                    conn.close()
+                    children[rfd] = (pid, [])
+                else:
+                    (pid, chunks) = children[fd]
+                    data = os.read(fd, 65536)
+                    if data:
+                        chunks.append(data)
+                        continue
+                    os.close(fd)
+                    del children[fd]
+                    os.waitpid(pid, 0)
+                    _merge(parse_cache, b''.join(chunks))
+    finally:
+        sock.close()
+        os.remove(sockname)
+
+def _listen(sockname):
+    if os.path.exists(sockname):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            s.connect(sockname)
+        except socket.error:
+            # stale socket; remove it
+            os.remove(sockname)
+        else:
+            sys.stderr.write("a server is already running on %s\n" % sockname)
+            sys.exit(1)
+        finally:
+            s.close()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(sockname)
+    sock.listen(16)
+    return sock
+
+def _merge(parse_cache, data):
+    """Add the cache entries sent by a child to `parse_cache`"""
+    if not data:
+        return
+    try:
+        entries = marshal.loads(data)
+    except (ValueError, EOFError, TypeError):
+        return
+    for (key, tree) in entries:
+        parse_cache.add(key, tree)
+
+def _fork(sock, conn, handler, parse_cache):
+    (rfd, wfd) = os.pipe()
+    pid = os.fork()
+    if pid != 0:
+        os.close(wfd)
+        return (pid, rfd)
+    # child
+    os.close(rfd)
+    sock.close()
+    code = 1
+    try:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        old_keys = set(parse_cache.entries)
+        try:
+            (req, fds) = _recv_request(conn)
+        except (socket.error, ValueError, struct.error):
+            os._exit(1)
+        try:
+            os.chdir(req['cwd'])
+            os.environ.clear()
+            os.environ.update(req['env'])
+            for (i, fd) in enumerate(fds):
+                os.dup2(fd, i)
+                os.close(fd)
+            _reopen_std_streams()
+            sys.argv = req['argv']
+            try:
+                code = handler(sys.argv, parse_cache)
+            except SystemExit as ex:
+                code = ex.code
+            if code is None:
+                code = 0
+            elif not isinstance(code, int):
+                sys.stderr.write('%s\n' % code)
+                code = 1
+            reply = {'exit': code}
+        except Fallback:
+            reply = {'fallback': True}
+        except Exception:
+            traceback.print_exc()
+            code = 1
+            reply = {'exit': code}
+        for f in (sys.stdout, sys.stderr):
+            try:
+                f.flush()
+            except (IOError, OSError, ValueError):
+                pass
+        conn.sendall(json.dumps(reply).encode('utf-8'))
+        conn.close()
+        new = [(key, tree) for (key, tree) in parse_cache.entries.items()
+               if key not in old_keys]
+        with os.fdopen(wfd, 'wb') as fd:
+            fd.write(marshal.dumps(new))
+    finally:
+        os._exit(code)
+
+def _recv_request(conn):
+    fds = array.array('i')
+    (data, ancdata, _flags, _addr) = conn.recvmsg(
+        65536, socket.CMSG_LEN(3 * fds.itemsize))
+    for (level, type_, cdata) in ancdata:
+        if level == socket.SOL_SOCKET and type_ == socket.SCM_RIGHTS:
+            fds.frombytes(cdata[:len(cdata) - (len(cdata) % fds.itemsize)])
+    if len(fds) != 3:
+        raise ValueError('expected 3 file descriptors')
+    (size,) = struct.unpack('!I', data[:4])
+    data = data[4:]
+    while len(data) < size:
+        chunk = conn.recv(65536)
+        if not chunk:
+            raise ValueError('truncated request')
+        data += chunk
+    return (json.loads(data.decode('utf-8')), list(fds))
+
+def _reopen_std_streams():
+    """Make sys.stdin, sys.stdout and sys.stderr use the client's
+    file descriptors, with the buffering they would have in the client"""
+    for (name, fd, mode) in (('stdin', 0, 'r'),
+                             ('stdout', 1, 'w'),
+                             ('stderr', 2, 'w')):
+        old = getattr(sys, name)
+        line_buffering = fd == 2 or (fd == 1 and os.isatty(fd))
+        setattr(sys, name, io.open(fd, mode, closefd=False,
+                                   buffering=1 if line_buffering else -1,
+                                   encoding=old.encoding,
+                                   errors=old.errors))
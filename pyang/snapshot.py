@@ -0,0 +1,402 @@
+"""Snapshot of validated modules
+
+A snapshot holds a set of modules, normally the IETF and IANA modules
+distributed with pyang, that have been parsed and validated at build
+time.  When such a module is imported, and its text is identical to the
+text that was used to build the snapshot, the validated module is loaded
+from the snapshot instead of being parsed and validated again.
+
+The snapshot is only used if it was built in the same environment, i.e.,
+with the same pyang version, the same options and the same registered
+plugin extensions, as the current context.  Otherwise the modules are
+processed as usual.
+
+Build the default snapshot with:
+
+    python -m pyang.snapshot -o pyang/stdlib.snapshot \\
+        modules/ietf modules/iana
+"""
+
+import hashlib
+import io
+import optparse
+import os
+import pickle
+import struct
+import sys
+import weakref
+
+import pyang
+from . import grammar
+from . import plugin
+from . import statements
+from . import util
+from . import xpath
+
+SNAPSHOT_FORMAT = 1
+"""Version of the snapshot file format.  Bump when it changes."""
+
+default_filename = os.path.join(os.path.dirname(__file__), 'stdlib.snapshot')
+
+_string_types = (type(''), type(u''))
+
+def _describe(x):
+    """Return a string describing `x`, stable between runs"""
+    if isinstance(x, dict):
+        return '{%s}' % ','.join(sorted([_describe(k) + ':' + _describe(v)
+                                         for k, v in x.items()]))
+    elif isinstance(x, (list, tuple)):
+        return '[%s]' % ','.join([_describe(y) for y in x])
+    elif x is None or isinstance(x, _string_types + (bool, int, float)):
+        return repr(x)
+    elif callable(x) and hasattr(x, '__name__'):
+        # functions are described by their name, and for closures (such
+        # as the ones built by statements.add_validation_fun()) by the
+        # values they refer to
+        s = '%s.%s' % (getattr(x, '__module__', None), x.__name__)
+        closure = getattr(x, '__closure__', None)
+        if closure:
+            s += _describe([c.cell_contents for c in closure])
+        return s
+    else:
+        return type(x).__name__
+
+_source_digest = None
+
+def _get_source_digest():
+    """Return a digest of the pyang sources, since the snapshot contains
+    pickled instances of pyang's classes"""
+    global _source_digest
+    if _source_digest is None:
+        h = hashlib.sha1()
+        pkgdir = os.path.dirname(os.path.abspath(__file__))
+        # the plugins, translators and transforms are included, since
+        # they can change the grammar and the validation; the generated
+        # parser table is not, since it may be built after the snapshot
+        for (dirpath, dirnames, fnames) in os.walk(pkgdir):
+            dirnames.sort()
+            for fname in sorted(fnames):
+                if fname.endswith('.py') and fname != 'xpath_parsetab.py':
+                    fname = os.path.join(dirpath, fname)
+                    h.update(os.path.relpath(fname, pkgdir).encode('utf-8'))
+                    with open(fname, 'rb') as fd:
+                        h.update(fd.read())
+        _source_digest = h.hexdigest()
+    return _source_digest
+
+def fingerprint(ctx):
+    """Return a fingerprint of everything that affects the validation
+    of a module in `ctx`, except the module texts."""
+    desc = [
+        SNAPSHOT_FORMAT,
+        pyang.__version__,
+        _get_source_digest(),
+        list(sys.version_info[:2]),
+        bool(ctx.canonical),
+        bool(ctx.strict),
+        ctx.max_status,
+        ctx.max_line_len,
+        ctx.max_identifier_len,
+        bool(ctx.lax_quote_checks),
+        bool(ctx.lax_xpath_checks),
+        bool(ctx.keep_comments),
+        bool(ctx.keep_arg_substrings),
+        statements._validation_phases,
+        statements._validation_map,
+        statements._validation_variables,
+        statements._v_i_children,
+        statements._v_i_children_keywords,
+        statements._keyword_with_children,
+        statements.data_keywords,
+        statements._keywords_with_no_explicit_config,
+        statements._copy_uses_keywords,
+        statements._copy_augment_keywords,
+        statements._refinements,
+        statements._valid_deviations,
+        grammar.stmt_map,
+        xpath.extra_xpath_functions,
+    ]
+    return hashlib.sha1(_describe(desc).encode('utf-8')).hexdigest()
+
+def text_key(text):
+    """Return the key of a module text in a snapshot"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class Snapshot(object):
+    """A snapshot file, opened for reading"""
+
+    def __init__(self, filename):
+        """Open the snapshot in `filename`.
+
+        Raises IOError or ValueError if the file cannot be used.
+        """
+        self.filename = filename
+        with open(filename, 'rb') as fd:
+            (size,) = struct.unpack('!I', fd.read(4))
+            try:
+                header = pickle.loads(fd.read(size))
+            except Exception as ex:
+                raise ValueError('bad snapshot header: %s' % ex)
+        if (not isinstance(header, dict) or
+            header.get('format') != SNAPSHOT_FORMAT):
+            raise ValueError('unknown snapshot format')
+        self.offset = 4 + size
+        self.fingerprint = header['fingerprint']
+        self.entries = header['modules']
+        """dict of text key:<entry>, where <entry> is a dict with:
+             'name', 'revision': the module's name and latest revision
+             'imports': list of (modulename, revision-date | None,
+                                 text key, line)
+             'offset', 'size': the location of the pickled module"""
+        self._usable = weakref.WeakKeyDictionary()
+
+    def lookup(self, ctx, text):
+        """Return (key, entry) for the module `text`, or None if the
+        snapshot does not have it, or cannot be used in `ctx`."""
+        key = text_key(text)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        usable = self._usable.get(ctx)
+        if usable is None:
+            usable = fingerprint(ctx) == self.fingerprint
+            self._usable[ctx] = usable
+        if not usable:
+            return None
+        return (key, entry)
+
+    def load(self, ctx, ref, key):
+        """Return a new copy of the validated module `key`, read from `ref`.
+
+        The snapshot modules it imports must already have been loaded
+        into `ctx`.
+        """
+        entry = self.entries[key]
+        with open(self.filename, 'rb') as fd:
+            fd.seek(self.offset + entry['offset'])
+            data = fd.read(entry['size'])
+        mykey = (entry['name'], entry['revision'])
+
+        def get_ref(modkey):
+            if modkey == mykey:
+                return ref
+            return ctx.modules[modkey].pos.ref
+
+        def persistent_load(pid):
+            if pid[0] == 'ctx':
+                return ctx
+            modkey = (pid[1], pid[2])
+            if pid[0] == 'stmt':
+                return ctx.modules[modkey].i_snapshot_stmts[pid[3]]
+            elif pid[0] == 'ref':
+                return get_ref(modkey)
+            else: # 'at'
+                return 'at ' + get_ref(modkey) + pid[3]
+
+        stmts = _Unpickler(io.BytesIO(data), persistent_load).load()
+        module = stmts[0]
+        module.i_snapshot_stmts = stmts
+        module.i_snapshot_key = key
+        return module
+
+def open_default():
+    """Return the default Snapshot, or None if there is none.
+
+    The environment variable PYANG_SNAPSHOT can be used to select
+    another snapshot file, or set to the empty string to disable it.
+    """
+    filename = os.getenv('PYANG_SNAPSHOT', default_filename)
+    if not filename:
+        return None
+    try:
+        return Snapshot(filename)
+    except (IOError, OSError, ValueError, struct.error):
+        return None
+
+def build(ctx, filenames):
+    """Parse and validate the modules in `filenames` and return a snapshot.
+
+    Only modules that can be reused as-is in other contexts are kept:
+    modules without submodules, augments or deviations, that only import
+    other kept modules, and that have no errors or warnings.
+
+    Returns the contents of the snapshot file.
+    """
+    modules = {}
+    for filename in filenames:
+        with io.open(filename, 'r', encoding='utf-8') as fd:
+            text = fd.read()
+        module = ctx.add_module(filename, text, 'yang')
+        if module is not None:
+            modules[module.arg] = (module, text)
+
+    def is_candidate(module):
+        if module.keyword != 'module':
+            return False
+        for keyword in ('include', 'augment', 'deviation'):
+            if module.search_one(keyword) is not None:
+                return False
+        return True
+
+    # keep the modules that only import candidate modules
+    names = set([name for name in modules
+                 if is_candidate(modules[name][0])])
+    changed = True
+    while changed:
+        changed = False
+        for name in list(names):
+            for i in modules[name][0].search('import'):
+                r = i.search_one('revision-date')
+                if (i.arg not in names or
+                    (r is not None and r.arg !=
+                     util.get_latest_revision(modules[i.arg][0]))):
+                    names.remove(name)
+                    changed = True
+                    break
+
+    # order the modules so that imported modules come first
+    order = []
+    def add(name):
+        if name in order:
+            return
+        for i in modules[name][0].search('import'):
+            add(i.arg)
+        order.append(name)
+    for name in sorted(names):
+        add(name)
+
+    for name in order:
+        statements.validate_module(ctx, modules[name][0])
+    bad = set([epos.ref for (epos, _etag, _eargs) in ctx.errors])
+
+    refs = {}
+    registry = {}
+    entries = {}
+    blobs = []
+    offset = 0
+    for name in order:
+        (module, text) = modules[name]
+        if module.pos.ref in bad:
+            continue
+        imports = []
+        for i in module.search('import'):
+            r = i.search_one('revision-date')
+            (imodule, itext) = modules[i.arg]
+            if imodule.pos.ref in bad:
+                break
+            imports.append((i.arg, r and r.arg, text_key(itext), i.pos.line))
+        else:
+            modkey = (name, util.get_latest_revision(module))
+            refs[module.pos.ref] = modkey
+            stmts = []
+            seen = set()
+
+            def persistent_id(obj):
+                if obj is ctx:
+                    return ('ctx',)
+                elif isinstance(obj, statements.Statement):
+                    x = registry.get(id(obj))
+                    if x is not None:
+                        return ('stmt',) + x
+                    if id(obj) not in seen:
+                        seen.add(id(obj))
+                        stmts.append(obj)
+                elif obj.__class__ in _string_types:
+                    x = refs.get(obj)
+                    if x is not None:
+                        return ('ref',) + x
+                    if obj.startswith('at '):
+                        # type spec definitions, e.g. 'at <ref>:<line> '
+                        i = obj.rfind(':')
+                        x = refs.get(obj[3:i])
+                        if x is not None:
+                            return ('at',) + x + (obj[i:],)
+                return None
+
+            # find all statements that belong to this module, then
+            # pickle them
+            _dump(module, persistent_id)
+            data = _dump(stmts, persistent_id)
+            for (idx, stmt) in enumerate(stmts):
+                registry[id(stmt)] = modkey + (idx,)
+            key = text_key(text)
+            entries[key] = {'name': modkey[0],
+                            'revision': modkey[1],
+                            'imports': imports,
+                            'offset': offset,
+                            'size': len(data)}
+            blobs.append(data)
+            offset += len(data)
+            continue
+        bad.add(module.pos.ref)
+
+    header = pickle.dumps({'format': SNAPSHOT_FORMAT,
+                           'fingerprint': fingerprint(ctx),
+                           'modules': entries}, 2)
+    return struct.pack('!I', len(header)) + header + b''.join(blobs)
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, fd, persistent_id):
+        pickle.Pickler.__init__(self, fd, 2)
+        self._persistent_id = persistent_id
+
+    def persistent_id(self, obj):
+        return self._persistent_id(obj)
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, fd, persistent_load):
+        pickle.Unpickler.__init__(self, fd)
+        self._persistent_load = persistent_load
+
+    def persistent_load(self, pid):
+        return self._persistent_load(pid)
+
+def _dump(obj, persistent_id):
+    buf = io.BytesIO()
+    _Pickler(buf, persistent_id).dump(obj)
+    return buf.getvalue()
+
+def main():
+    usage = """%prog [options] <directory|filename>...
+
+Builds a snapshot of the validated YANG modules."""
+    optparser = optparse.OptionParser(usage)
+    optparser.add_option("-o", "--output",
+                         dest="output",
+                         default=default_filename,
+                         help="Write the snapshot to OUTPUT")
+
+    plugin.init([])
+    for p in plugin.plugins:
+        p.add_opts(optparser)
+    (o, args) = optparser.parse_args()
+
+    filenames = []
+    for arg in args:
+        if os.path.isdir(arg):
+            filenames.extend(sorted([os.path.join(arg, fname)
+                                     for fname in os.listdir(arg)
+                                     if fname.endswith('.yang')]))
+        else:
+            filenames.append(arg)
+    path = os.pathsep.join(set([os.path.dirname(f) or '.'
+                                for f in filenames]))
+
+    repos = pyang.FileRepository(path, use_env=False)
+    ctx = pyang.Context(repos)
+    ctx.opts = o
+    for p in plugin.plugins:
+        p.setup_ctx(ctx)
+    for p in plugin.plugins:
+        p.pre_load_modules(ctx)
+
+    # the statement trees are deep
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    data = build(ctx, filenames)
+    tmpfile = o.output + '.tmp'
+    with open(tmpfile, 'wb') as fd:
+        fd.write(data)
+    os.rename(tmpfile, o.output)
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,7 @@ from . import types
 from . import syntax
 from . import grammar
 from . import xpath
-from .error import err_add
+from .error import err_add, ErrorList
 
 ### Functions that plugins can use
 
@@ -14,6 +14,7 @@ def add_validation_phase(phase, before=None, after=None):
     """Add a validation phase to the framework.
 
     Can be used by plugins to do special validation of extensions."""
+    _clear_validation_plans()
     idx = 0
     for x in _validation_phases:
         if x == before:
@@ -32,29 +33,49 @@ def _sequence(one, two):
         return two
     elif two is None:
         return one
-    return lambda *args, **kargs: (one(*args, **kargs), two(*args, **kargs))[1]
+    fun = lambda *args, **kargs: (one(*args, **kargs), two(*args, **kargs))[1]
+    # the functions called, for profiling
+    fun.funs = getattr(one, 'funs', (one,)) + getattr(two, 'funs', (two,))
+    return fun
 
 def add_validation_fun(phase, keywords, fun):
     """Add a validation function to some phase in the framework.
 
     Function `fun` is called for each valid occurance of each keyword in
     `keywords`.
-    Can be used by plugins to do special validation of extensions."""
+    Can be used by plugins to do special validation of extensions.
+
+    The phase is no longer run in the same tree walk as the phase
+    before it; use set_phase_local() after adding `fun` if `fun` allows
+    it."""
     for keyword in keywords:
         _validation_map[phase, keyword] = _sequence(
             _validation_map.get((phase, keyword)), fun)
+    _local_phases.pop(phase, None)
+    _clear_validation_plans()
 
 def add_validation_var(var_name, var_fun):
     """Add a validation variable to the framework.
 
     Can be used by plugins to do special validation of extensions."""
     _validation_variables.append((var_name, var_fun))
+    _clear_validation_plans()
 
 def set_phase_i_children(phase):
     """Marks that the phase is run over the expanded i_children.
 
     Default is to run over substmts."""
     _v_i_children[phase] = True
+    _clear_validation_plans()
+
+def set_phase_local(phase):
+    """Marks that the phase only depends on the results of the phase
+    before it for the statement itself and its ancestors, so that the two
+    phases can be run in the same walk over the statement tree.
+
+    The phase's functions must not return 'stop'."""
+    _local_phases[phase] = True
+    _clear_validation_plans()
 
 def add_keyword_phase_i_children(phase, keyword):
     """Marks that the stmt is run in the expanded i_children phase."""
@@ -66,6 +87,7 @@ def add_data_keyword(keyword):
 
 def add_keyword_with_children(keyword):
     _keyword_with_children[keyword] = True
+    _clear_validation_plans()
 
 def is_keyword_with_children(keyword):
     return keyword in _keyword_with_children
@@ -255,6 +277,13 @@ _v_i_children = {
 """Phases in this dict are run over the stmts which has i_children.
 Note that the tests are not run in grouping definitions."""
 
+_local_phases = {
+    'init2':True,
+}
+"""Phases in this dict are run in the same walk over the statement tree
+as the phase before them.  For each statement, the functions of the
+phases are called in phase order.  See set_phase_local()."""
+
 _v_i_children_keywords = {
     ('reference_2', 'when'): True,
     ('reference_2', 'must'): True,
@@ -292,6 +321,13 @@ _copy_uses_keywords = []
 
 _copy_augment_keywords = []
 
+_shared_uses_keywords = ['description', 'reference',
+                         'error-message', 'error-app-tag']
+"""Statements that the nodes expanded from a grouping share with the
+grouping, instead of copying them, if Context.copy_on_write_uses is set.
+These statements are never modified after the expansion; a refine
+replaces them in the expanded node."""
+
 _refinements = [
     # (<keyword>, <list of keywords for which <keyword> can be refined>,
     #  <merge>, <validation function>)
@@ -355,31 +391,15 @@ def validate_module(ctx, module):
     if module.i_is_validated:
         return
 
-    def iterate(stmt, phase):
+    def iterate(stmt, phase, plan, skip):
         # if the grammar is not yet checked or if it is checked and
         # valid, then we continue.
         if getattr(stmt, 'is_grammatically_valid', None) is False:
             return
-        # first check an exact match
-        key = (phase, stmt.keyword)
+        # run the exact match, then the matches by special variable,
+        # then the wildcard
         res = 'recurse'
-        if key in _validation_map:
-            f = _validation_map[key]
-            res = f(ctx, stmt)
-            if res == 'stop':
-                raise Abort
-        # then also run match by special variable
-        for var_name, var_f in _validation_variables:
-            key = phase, var_name
-            if key in _validation_map and var_f(stmt.keyword) is True:
-                f = _validation_map[key]
-                res = f(ctx, stmt)
-                if res == 'stop':
-                    raise Abort
-        # then run wildcard
-        wildcard = (phase, '*')
-        if wildcard in _validation_map:
-            f = _validation_map[wildcard]
+        for f in plan.get_funs(stmt.keyword):
             res = f(ctx, stmt)
             if res == 'stop':
                 raise Abort
@@ -396,23 +416,270 @@ def validate_module(ctx, module):
                     return
                 if hasattr(stmt, 'i_children'):
                     for s in stmt.i_children:
-                        iterate(s, phase)
+                        iterate(s, phase, plan, skip)
                 for s in stmt.substmts:
                     if (hasattr(s, 'i_has_i_children') or
                         (phase, s.keyword) in _v_i_children_keywords):
-                        iterate(s, phase)
-            else:
+                        iterate(s, phase, plan, skip)
+            elif not (skip and plan.can_skip_substmts(stmt.keyword)):
                 for s in stmt.substmts:
-                    iterate(s, phase)
+                    iterate(s, phase, plan, skip)
+
+    def iterate_fused(stmt, walks):
+        # run several substmts phases in one walk; `walks` is a list
+        # of [phase, plan, skip, errors]
+        if getattr(stmt, 'is_grammatically_valid', None) is False:
+            return
+        subwalks = walks
+        for walk in walks:
+            plan = walk[1]
+            res = 'recurse'
+            funs = plan.get_funs(stmt.keyword)
+            if funs and walk[3] is None:
+                # the first phase reports its errors directly
+                for f in funs:
+                    res = f(ctx, stmt)
+                    if res == 'stop':
+                        raise Abort
+            elif funs:
+                # the other phases report their errors separately, so
+                # that they are added in the same order as when the
+                # phases are run one by one
+                save_errors = ctx.errors
+                ctx.errors = walk[3]
+                try:
+                    for f in funs:
+                        res = f(ctx, stmt)
+                        if res == 'stop':
+                            raise Abort
+                finally:
+                    walk[3] = ctx.errors
+                    ctx.errors = save_errors
+            if (res == 'continue' or
+                (walk[2] and plan.can_skip_substmts(stmt.keyword))):
+                if subwalks is walks:
+                    subwalks = list(walks)
+                subwalks.remove(walk)
+        if subwalks:
+            for s in stmt.substmts:
+                iterate_fused(s, subwalks)
+
+    has_unknown_subtrees = []
+    def get_skip(plan):
+        if plan.skip == 'always':
+            return True
+        elif plan.skip == 'grammar':
+            # the substatements of unknown extensions are not
+            # covered by the grammar
+            if not has_unknown_subtrees:
+                has_unknown_subtrees.append(_has_unknown_subtrees(module))
+            return not has_unknown_subtrees[0]
+        else:
+            return False
 
     module.i_is_validated = 'in_progress'
+    profile = ctx.validation_profile
+    if profile is None:
+        schedule = list(_get_validation_schedule())
+    else:
+        # run the phases one by one, to get the time of each phase
+        schedule = [[phase] for phase in _validation_phases]
+        profile.begin_module(module)
     try:
-        for phase in _validation_phases:
-            iterate(module, phase)
+        for phases in schedule:
+            if len(phases) == 1:
+                plan = _get_validation_plan(phases[0])
+                skip = get_skip(plan)
+                if profile is None:
+                    iterate(module, phases[0], plan, skip)
+                else:
+                    mark = profile.start()
+                    try:
+                        iterate(module, phases[0],
+                                _ProfiledPlan(plan, profile), skip)
+                    finally:
+                        profile.add_phase(phases[0], mark)
+                continue
+            walks = []
+            for phase in phases:
+                plan = _get_validation_plan(phase)
+                walks.append([phase, plan, get_skip(plan), ErrorList()])
+            walks[0][3] = None
+            try:
+                iterate_fused(module, walks)
+            finally:
+                for (_phase, _plan, _skip, errors) in walks[1:]:
+                    for (epos, etag, eargs) in errors:
+                        err_add(ctx.errors, epos, etag, eargs)
     except Abort:
         pass
+    finally:
+        if profile is not None:
+            profile.end_module()
     module.i_is_validated = True
 
+class _ValidationPlan(object):
+    """The validation functions to run in a phase, by keyword.
+
+    Built from _validation_map and _validation_variables when needed.
+    """
+
+    def __init__(self, phase):
+        self.phase = phase
+        self.funs = {}
+        """dict of keyword:<tuple of functions to call in order>"""
+        self.variables = [(var_name, var_f)
+                          for (var_name, var_f) in _validation_variables
+                          if (phase, var_name) in _validation_map]
+        keywords = set([keyword for (p, keyword) in _validation_map
+                        if p == phase])
+        self.keywords = keywords
+        """keywords with functions in this phase"""
+        self.skip = None
+        """'always' if no function can run below the module statement,
+        'grammar' if the grammar tells which substatements can be
+        skipped (see can_skip_substmts()), or None"""
+        if not keywords:
+            self.skip = 'always'
+        elif (phase in _validation_phases and
+              'grammar' in _validation_phases and
+              _validation_phases.index(phase) >
+              _validation_phases.index('grammar') and
+              not [k for k in keywords
+                   if util.is_prefixed(k) or k == '*' or k.startswith('$')]):
+            self.skip = 'grammar'
+        self._can_skip = {}
+
+    def get_entries(self, keyword):
+        """Return the list of keys in _validation_map for the functions
+        to call for `keyword`, in order"""
+        keys = []
+        if (self.phase, keyword) in _validation_map:
+            keys.append((self.phase, keyword))
+        for (var_name, var_f) in self.variables:
+            if var_f(keyword) is True:
+                keys.append((self.phase, var_name))
+        if (self.phase, '*') in _validation_map:
+            keys.append((self.phase, '*'))
+        return keys
+
+    def get_funs(self, keyword):
+        funs = self.funs.get(keyword)
+        if funs is None:
+            funs = tuple([_validation_map[key]
+                          for key in self.get_entries(keyword)])
+            self.funs[keyword] = funs
+        return funs
+
+    def can_skip_substmts(self, keyword):
+        """Return True if no function in this phase can run for any
+        substatement of a grammatically valid `keyword` statement"""
+        if self.skip == 'always':
+            return True
+        res = self._can_skip.get(keyword)
+        if res is None:
+            reachable = _get_substmt_keywords(keyword)
+            res = reachable is not None and not (reachable & self.keywords)
+            self._can_skip[keyword] = res
+        return res
+
+class _ProfiledPlan(object):
+    """A _ValidationPlan that records the statements visited and the
+    function calls in a profiling.ValidationProfile"""
+
+    def __init__(self, plan, profile):
+        self.plan = plan
+        self.profile = profile
+        self.funs = {}
+
+    def get_funs(self, keyword):
+        phase = self.plan.phase
+        self.profile.add_stmt(phase)
+        funs = self.funs.get(keyword)
+        if funs is None:
+            funs = tuple([self.profile.wrap(phase, key[1], _validation_map[key])
+                          for key in self.plan.get_entries(keyword)])
+            self.funs[keyword] = funs
+        return funs
+
+    def can_skip_substmts(self, keyword):
+        return self.plan.can_skip_substmts(keyword)
+
+_validation_plans = {}
+"""dict of phase:_ValidationPlan"""
+
+_substmt_keywords = {}
+"""cache for _get_substmt_keywords()"""
+
+_validation_schedule = []
+"""list of lists of phases that are run in the same tree walk"""
+
+_validation_plans_generation = None
+"""grammar.generation when _validation_plans was filled"""
+
+def _clear_validation_plans():
+    """Called when the validation functions or phases are changed"""
+    _validation_plans.clear()
+    _substmt_keywords.clear()
+    del _validation_schedule[:]
+
+def _get_validation_schedule():
+    if not _validation_schedule:
+        prev = None
+        for phase in _validation_phases:
+            if (phase in _local_phases and prev is not None and
+                prev not in _v_i_children and phase not in _v_i_children):
+                _validation_schedule[-1].append(phase)
+            else:
+                _validation_schedule.append([phase])
+            prev = phase
+    return _validation_schedule
+
+def _get_validation_plan(phase):
+    global _validation_plans_generation
+    if _validation_plans_generation != grammar.generation:
+        _clear_validation_plans()
+        _validation_plans_generation = grammar.generation
+    plan = _validation_plans.get(phase)
+    if plan is None:
+        plan = _ValidationPlan(phase)
+        _validation_plans[phase] = plan
+    return plan
+
+def _get_substmt_keywords(keyword):
+    """Return the set of keywords that the grammar allows at any depth
+    below `keyword`, or None if it allows any keyword."""
+    if keyword in _substmt_keywords:
+        return _substmt_keywords[keyword]
+    res = set()
+    todo = [keyword]
+    while todo:
+        kw = todo.pop()
+        if kw not in grammar.stmt_map:
+            res = None
+            break
+        (_arg_type, subspec) = grammar.stmt_map[kw]
+        for (subkw, _occurance) in grammar.flatten_spec(subspec):
+            if subkw == '$cut':
+                continue
+            if subkw not in res:
+                res.add(subkw)
+                todo.append(subkw)
+    _substmt_keywords[keyword] = res
+    return res
+
+def _has_unknown_subtrees(stmt):
+    """Return True if there are extension statements with substatements
+    that are not checked by the grammar below `stmt`."""
+    for s in stmt.substmts:
+        if (s.substmts and util.is_prefixed(s.keyword) and
+            (s.keyword[0] not in grammar.extension_modules or
+             s.keyword not in grammar.stmt_map)):
+            return True
+        if _has_unknown_subtrees(s):
+            return True
+    return False
+
 def v_init_module(ctx, stmt):
     ## remember that the grammar is not validated
     vsn = stmt.search_one('yang-version')
@@ -496,7 +763,19 @@ def v_init_extension(ctx, stmt):
     stmt.i_extension_revision = revision
     stmt.i_extension = None
 
+# shared by the statements without typedefs, groupings and uniques
+# in compact mode; see Context.compact_statements
+_empty_defs = {}
+_empty_uniques = []
+
 def v_init_stmt(ctx, stmt):
+    if (ctx.compact_statements and stmt.parent is not None and
+        stmt.search_one('typedef') is None and
+        stmt.search_one('grouping') is None):
+        stmt.i_typedefs = _empty_defs
+        stmt.i_groupings = _empty_defs
+        stmt.i_uniques = _empty_uniques
+        return
     stmt.i_typedefs = {}
     stmt.i_groupings = {}
     stmt.i_uniques = []
@@ -532,8 +811,12 @@ def v_grammar_all(ctx, stmt):
 
 def v_grammar_unique_defs(ctx, stmt):
     """Verify that all typedefs and groupings are unique
-    Called for every statement.
-    Stores all typedefs in stmt.i_typedef, groupings in stmt.i_grouping
+    Called for every statement, after its parent.
+    Stores all typedefs in stmt.i_typedef, groupings in stmt.i_grouping,
+    and sets stmt.i_def_scope to the closest statement, starting with
+    stmt, where search_typedef() and search_grouping() look for
+    definitions.  The module is always such a scope, since the
+    definitions in its submodules are added to it in the 'import' phase.
     """
     defs = [('typedef', 'TYPE_ALREADY_DEFINED', stmt.i_typedefs),
             ('grouping', 'GROUPING_ALREADY_DEFINED', stmt.i_groupings)]
@@ -550,6 +833,10 @@ def v_grammar_unique_defs(ctx, stmt):
                         errcode, (definition.arg, other.pos))
             else:
                 stmtdefs[definition.arg] = definition
+    if stmt.parent is None or stmt.i_typedefs or stmt.i_groupings:
+        stmt.i_def_scope = stmt
+    else:
+        stmt.i_def_scope = _def_scope(stmt.parent)
 
 def v_grammar_identifier(ctx, stmt):
     try:
@@ -804,12 +1091,9 @@ def v_type_type(ctx, stmt):
     if stmt.i_typedef is not None:
         typedef_type = stmt.i_typedef.search_one('type')
         if typedef_type is not None and hasattr(typedef_type, 'i_type_spec'):
-            # copy since we modify the typespec's definition
-            stmt.i_type_spec = copy.copy(typedef_type.i_type_spec)
-            if stmt.i_type_spec is not None:
-                stmt.i_type_spec.definition = ('at ' +
-                                               str(stmt.i_typedef.pos) +
-                                               ' ')
+            stmt.i_type_spec = _typedef_ref_type_spec(
+                stmt.i_typedef, typedef_type.i_type_spec,
+                stmt.search_one('require-instance') is None)
 
     if stmt.i_type_spec is None:
         # an error has been added already; skip further validation
@@ -970,6 +1254,30 @@ def v_type_type(ctx, stmt):
                         (t.arg, t.pos))
                 return False
 
+def _typedef_ref_type_spec(typedef, type_spec, shared):
+    """Return the type spec of a type statement that refers to `typedef`,
+    where `type_spec` is the type spec of the typedef's type.
+
+    It is a copy of `type_spec`, since its definition is the typedef.
+    If `shared` is True, the copy is shared by all type statements that
+    refer to the typedef, and must not be modified.  Leafrefs are never
+    shared, since their path is resolved for each leaf."""
+    if type_spec is None:
+        return None
+    definition = 'at ' + str(typedef.pos) + ' '
+    if isinstance(type_spec, types.PathTypeSpec):
+        shared = False
+    if shared:
+        cached = getattr(typedef, 'i_ref_type_spec', None)
+        if (cached is not None and cached[0] is type_spec and
+            cached[1].definition == definition):
+            return cached[1]
+    spec = copy.copy(type_spec)
+    spec.definition = definition
+    if shared:
+        typedef.i_ref_type_spec = (type_spec, spec)
+    return spec
+
 def v_type_leaf(ctx, stmt):
     stmt.i_default = None
     stmt.i_default_str = ""
@@ -1476,8 +1784,8 @@ def v_expand_1_uses(ctx, stmt):
             if hasattr(node, 'i_children'):
                 if module is None:
                     return None
-                child = search_child(node.i_children, module.i_modulename,
-                                     identifier)
+                child = util.search_child_node(node, module.i_modulename,
+                                               identifier)
                 if child is None:
                     err_add(ctx.errors, refinement.pos, 'NODE_NOT_FOUND',
                             (module.i_modulename, identifier))
@@ -1528,6 +1836,11 @@ def v_expand_1_uses(ctx, stmt):
     for s in whens:
         s.i_origin = 'uses'
     iffeatures = list(stmt.search('if-feature'))
+    nocopy = ['type','uses','unique', 'if-feature', 'typedef','grouping']
+    if ctx.copy_on_write_uses:
+        nocopy.extend(_shared_uses_keywords)
+    # the positions of the copies, shared by line in compact mode
+    positions = {}
     # first, copy the grouping into our i_children
     for g in stmt.i_grouping.i_children:
         if util.keysearch(g.keyword, 0, subspec) is None:
@@ -1548,26 +1861,27 @@ def v_expand_1_uses(ctx, stmt):
             new.i_children = []
             new.i_uniques = []
             new.pos.uses_pos = stmt.pos
+            if ctx.compact_statements:
+                pos = new.pos
+                new.pos = positions.setdefault(
+                    (pos.ref, pos.line, pos.top), pos)
             # build the i_children list of pointers
             if hasattr(old, 'i_children'):
+                substmt_idx = {}
+                for (idx, x) in enumerate(old.substmts):
+                    substmt_idx.setdefault(id(x), idx)
                 for x in old.i_children:
                     # check if this i_child is a pointer to a substmt
-                    if x in old.substmts:
+                    idx = substmt_idx.get(id(x))
+                    if idx is not None:
                         # if so, create an equivalent pointer
-                        idx = old.substmts.index(x)
                         new.i_children.append(new.substmts[idx])
                     else:
                         # otherwise, copy the i_child
-                        newx = x.copy(new, stmt,
-                                      nocopy=['type','uses', 'unique',
-                                              'if-feature',
-                                              'typedef','grouping'],
+                        newx = x.copy(new, stmt, nocopy=nocopy,
                                       copyf=post_copy)
                         new.i_children.append(newx)
-        newg = g.copy(stmt.parent, stmt,
-                      nocopy=['type','uses','unique', 'if-feature',
-                              'typedef','grouping'],
-                      copyf=post_copy)
+        newg = g.copy(stmt.parent, stmt, nocopy=nocopy, copyf=post_copy)
         for s in whens:
             news = s.copy(newg)
             newg.substmts.append(news)
@@ -1737,8 +2051,8 @@ def v_expand_2_augment(ctx, stmt):
     # copy the expanded children into the target node
     def add_tmp_children(node, tmp_children):
         for tmp in tmp_children:
-            ch = search_child(node.i_children, stmt.i_module.i_modulename,
-                              tmp.arg)
+            ch = util.search_child_node(node, stmt.i_module.i_modulename,
+                                        tmp.arg)
             if ch is not None:
                 del ch.i_module.i_undefined_augment_nodes[tmp]
                 if not hasattr(ch, 'i_children'):
@@ -1760,8 +2074,8 @@ def v_expand_2_augment(ctx, stmt):
         if hasattr(stmt, 'i_not_implemented'):
             c.i_not_implemented = stmt.i_not_implemented
 
-        ch = search_child(stmt.i_target_node.i_children,
-                          stmt.i_module.i_modulename, c.arg)
+        ch = util.search_child_node(stmt.i_target_node,
+                                    stmt.i_module.i_modulename, c.arg)
         if ch is not None:
             if ch.keyword == '__tmp_augment__':
                 # replace this node with the proper one,
@@ -1774,6 +2088,7 @@ def v_expand_2_augment(ctx, stmt):
                     return
                 idx = stmt.i_target_node.i_children.index(ch)
                 stmt.i_target_node.i_children[idx] = c
+                util.reset_child_index(stmt.i_target_node)
                 c.parent = stmt.i_target_node
                 try:
                     add_tmp_children(c, ch.i_children)
@@ -1975,6 +2290,8 @@ def v_reference_list(ctx, stmt):
                         return
                 # add this unique statement to ptr's list of unique conditions
                 # it is part of.
+                if ptr.i_uniques is _empty_uniques:
+                    ptr.i_uniques = []
                 ptr.i_uniques.append(u)
                 found.append(ptr)
             if not found:
@@ -2106,6 +2423,7 @@ def v_reference_deviate(ctx, stmt):
         # delete the node from i_children
         idx = t.parent.i_children.index(t)
         del t.parent.i_children[idx]
+        util.reset_child_index(t.parent)
         # find and delete the node from substmts
         # it may not be there if it is a shorthand case
         t1 = t.parent.search_one(t.keyword, t.arg, t.parent.substmts)
@@ -2341,36 +2659,80 @@ def search_data_node(children, modulename, identifier, last_skipped = None):
 def search_typedef(stmt, name):
     """Search for a typedef in scope
     First search the hierarchy, then the module and its submodules."""
-    mod = stmt.i_orig_module
-    while stmt is not None:
-        if name in stmt.i_typedefs:
-            t = stmt.i_typedefs[name]
-            if (mod is not None and
-                mod != t.i_orig_module and
-                t.i_orig_module.keyword == 'submodule'):
-                # make sure this submodule is included
-                if mod.search_one('include', t.i_orig_module.arg) is None:
-                    return None
-            return t
-        stmt = stmt.parent
-    return None
+    try:
+        scope = stmt.i_def_scope
+    except AttributeError:
+        scope = _def_scope(stmt)
+    cache = scope.i_typedef_cache
+    if cache is None:
+        cache = scope.i_typedef_cache = {}
+    t = cache.get(name, _unknown)
+    if t is _unknown:
+        t = _scope_lookup(scope, 'i_typedefs', 'i_typedef_cache', name)
+    return _check_included(stmt, t)
 
 def search_grouping(stmt, name):
     """Search for a grouping in scope
     First search the hierarchy, then the module and its submodules."""
+    try:
+        scope = stmt.i_def_scope
+    except AttributeError:
+        scope = _def_scope(stmt)
+    cache = scope.i_grouping_cache
+    if cache is None:
+        cache = scope.i_grouping_cache = {}
+    g = cache.get(name, _unknown)
+    if g is _unknown:
+        g = _scope_lookup(scope, 'i_groupings', 'i_grouping_cache', name)
+    return _check_included(stmt, g)
+
+_unknown = object()
+
+def _check_included(stmt, d):
+    """Return the definition `d` if it can be used from `stmt`"""
+    if d is None:
+        return None
     mod = stmt.i_orig_module
-    while stmt is not None:
-        if name in stmt.i_groupings:
-            g = stmt.i_groupings[name]
-            if (mod is not None and
-                mod != g.i_orig_module and
-                g.i_orig_module.keyword == 'submodule'):
-                # make sure this submodule is included
-                if mod.search_one('include', g.i_orig_module.arg) is None:
-                    return None
-            return g
-        stmt = stmt.parent
-    return None
+    if (mod is not None and
+        mod != d.i_orig_module and
+        d.i_orig_module.keyword == 'submodule'):
+        # make sure this submodule is included
+        if mod.search_one('include', d.i_orig_module.arg) is None:
+            return None
+    return d
+
+def _def_scope(stmt):
+    """Return the closest statement, starting with `stmt` and going up
+    the hierarchy, that has typedefs or groupings, or the module.
+
+    This is set in i_def_scope by v_grammar_unique_defs() for the
+    statements in the module; statements created later get it from
+    their parent."""
+    try:
+        return stmt.i_def_scope
+    except AttributeError:
+        pass
+    if stmt.parent is None or stmt.i_typedefs or stmt.i_groupings:
+        return stmt
+    return _def_scope(stmt.parent)
+
+def _scope_lookup(scope, defs_attr, cache_attr, name):
+    """Return the definition `name` visible in `scope`, or None, and
+    cache it in the scopes on the way"""
+    d = getattr(scope, defs_attr).get(name)
+    if d is None and scope.parent is not None:
+        parent_scope = _def_scope(scope.parent)
+        cache = getattr(parent_scope, cache_attr)
+        if cache is not None and name in cache:
+            d = cache[name]
+        else:
+            d = _scope_lookup(parent_scope, defs_attr, cache_attr, name)
+    cache = getattr(scope, cache_attr)
+    if cache is None:
+        cache = {}
+        setattr(scope, cache_attr, cache)
+    cache[name] = d
+    return d
 
 def search_data_keyword_child(children, modulename, identifier):
     for child in children:
@@ -2400,7 +2762,7 @@ def find_target_node(ctx, stmt, is_augment=False):
 
     if stmt.parent.keyword in ('module', 'submodule') or is_absolute:
         # find the first node
-        node = search_child(module.i_children, module.i_modulename, identifier)
+        node = util.search_child_node(module, module.i_modulename, identifier)
         if not is_submodule_included(stmt, node):
             node = None
         if node is None:
@@ -2425,8 +2787,8 @@ def find_target_node(ctx, stmt, is_augment=False):
                 stmt.i_module, prefix, stmt.pos, ctx.errors)
             if module is None:
                 return None
-            child = search_child(node.i_children, module.i_modulename,
-                                 identifier)
+            child = util.search_child_node(node, module.i_modulename,
+                                           identifier)
             if child is None and module == stmt.i_module and is_augment:
                 # create a temporary statement
                 child = Statement(node.top, node, stmt.pos, '__tmp_augment__',
@@ -2560,10 +2922,9 @@ def validate_leafref_path(ctx, stmt, path_spec, path,
 
     def follow_path(ptr, up, dn):
         path_list = []
-        last_skipped = None
         if up == -1: # absolute path
             (pmodule, name) = find_identifier(dn[0])
-            ptr = search_child(pmodule.i_children, pmodule.i_modulename, name)
+            ptr = util.search_child_node(pmodule, pmodule.i_modulename, name)
             if not is_submodule_included(path, ptr):
                 ptr = None
             if ptr is None:
@@ -2571,8 +2932,8 @@ def validate_leafref_path(ctx, stmt, path_spec, path,
                 for inc in path.i_orig_module.search('include'):
                     submod = ctx.get_module(inc.arg)
                     if submod is not None:
-                        ptr = search_child(submod.i_children,
-                                           submod.arg, name)
+                        ptr = util.search_child_node(submod,
+                                                     submod.arg, name)
                         if ptr is not None:
                             break
                 if ptr is None:
@@ -2596,8 +2957,6 @@ def validate_leafref_path(ctx, stmt, path_spec, path,
                             (stmt.arg, stmt.pos))
                     raise NotFound
                 while ptr.keyword in ['case', 'choice', 'input', 'output']:
-                    if ptr.keyword in ['input', 'output']:
-                        last_skipped = ptr.keyword
                     ptr = ptr.parent
                     if ptr is None:
                         err_add(ctx.errors, pathpos, 'LEAFREF_TOO_MANY_UP',
@@ -2664,8 +3023,7 @@ def validate_leafref_path(ctx, stmt, path_spec, path,
                         (ptr.i_module.arg, ptr.arg, stmt.arg, stmt.pos))
                 raise NotFound
             if ptr.keyword in _keyword_with_children:
-                ptr = search_data_node(ptr.i_children, module_name, name,
-                                       last_skipped)
+                ptr = util.search_data_node_child(ptr, module_name, name)
                 if not is_submodule_included(path, ptr):
                     ptr = None
                 if ptr is None:
@@ -2758,6 +3116,28 @@ def validate_leafref_path(ctx, stmt, path_spec, path,
 
 ### structs used to represent a YANG module
 
+def compact_statements(ctx, stmt):
+    """Make the statements in the tree `stmt` share equal keywords,
+    arguments and positions, see Context.compact_statements"""
+    strings = ctx.strings
+    positions = {}
+    def intern(s):
+        if s.__class__ is tuple:
+            s = tuple([intern(x) for x in s])
+        return strings.setdefault(s, s)
+    def iterate(stmt):
+        stmt.raw_keyword = intern(stmt.raw_keyword)
+        stmt.keyword = intern(stmt.keyword)
+        if stmt.arg is not None:
+            stmt.arg = intern(stmt.arg)
+        pos = stmt.pos
+        if pos.uses_pos is None:
+            key = (pos.ref, pos.line, pos.top)
+            stmt.pos = positions.setdefault(key, pos)
+        for s in stmt.substmts:
+            iterate(s)
+    iterate(stmt)
+
 def new_statement(top, parent, pos, keyword, arg=None):
     stmt_class = STMT_CLASS_FOR_KEYWD.get(keyword, Statement)
     return stmt_class(top, parent, pos, keyword, arg)
@@ -2788,12 +3168,16 @@ class Statement(object):
 
         # see v_init_has_children()
         'i_children',
+        'i_child_index',             # see util.child_index()
 
         # Applicable to most (all?) statements - see v_init_stmt()
         'i_typedefs',
         'i_groupings',
         'i_uniques',
 
+        # see v_grammar_unique_defs()
+        'i_def_scope',
+
         # Only on copied Statements - see copy()
         'i_uses',
         'i_uses_pos',
@@ -2808,6 +3192,11 @@ class Statement(object):
         '__dict__',
     )
 
+    # set in the statements that have typedefs or groupings, or are
+    # modules, when they are searched; see search_typedef()
+    i_typedef_cache = None
+    i_grouping_cache = None
+
     # NOTE: don't use this function directly; instead use
     # statements.new_statement()
     def __init__(self, top, parent, pos, keyword, arg=None):
@@ -2960,6 +3349,7 @@ class ModSubmodStatement(Statement):
                     for d in deletes:
                         idx = n.i_children.index(d)
                         del n.i_children[idx]
+                    util.reset_child_index(n)
         p(self)
 
 class AugmentStatement(Statement):
@@ -3076,6 +3466,7 @@ class TypedefStatement(Statement):
         'i_leafref',                    # also in LeafLeaflistStatement
         'i_leafref_ptr',                # also in LeafLeaflistStatement
         'i_leafref_expanded',           # also in LeafLeaflistStatement
+        'i_ref_type_spec',              # see _typedef_ref_type_spec()
     )
 
 
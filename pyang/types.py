@@ -1,18 +1,11 @@
 """YANG built-in types"""
 
 import base64
-from xml.sax.saxutils import quoteattr
-from xml.sax.saxutils import escape
-
-try:
-    # python 2
-    from StringIO import StringIO
-except ImportError:
-    # python 3
-    from io import StringIO
+import bisect
 
 from . import util
 from . import syntax
+from . import xsd_regex
 from .error import err_add
 
 class Abort(Exception):
@@ -30,6 +23,13 @@ class TypeSpec(object):
     def validate(self, errors, pos, val, module, errstr=''):
         return True;
 
+    def validate_many(self, errors, pos, vals, module, errstr=''):
+        """Validate each value in `vals`.
+
+        Returns a list with the result of validate() for each value."""
+        return [self.validate(errors, pos, val, module, errstr)
+                for val in vals]
+
     def restrictions(self):
         return []
 
@@ -262,20 +262,72 @@ def is_derived_from(a, b):
         # an identity is not derived from itself
         return False
     else:
-        return is_derived_from_or_self(a, b, [])
+        return b in identity_ancestors(a)
 
-def is_derived_from_or_self(a, b, visited):
+def is_derived_from_or_self(a, b, visited=None):
     # return True if a is derived from b
-    if a == b:
-        return True
-    for p in a.search('base'):
-        if hasattr(p, 'i_identity'):
-            val = p.i_identity
-            if val not in visited:
-                visited.append(val)
-                if is_derived_from_or_self(val, b, visited):
-                    return True
-    return False
+    # `visited` is not used; kept for backwards compatibility
+    return a == b or b in identity_ancestors(a)
+
+def identity_ancestors(identity):
+    """Return the set of identities that `identity` is derived from,
+    directly or through other identities.
+
+    The set is stored in the identity once all its bases, and theirs,
+    have been resolved by the 'type' phase.
+    """
+    try:
+        return identity.i_ancestors
+    except AttributeError:
+        pass
+    ancestors = set()
+    complete = True
+    stack = [identity]
+    while stack:
+        i = stack.pop()
+        for base in i.search('base'):
+            if not hasattr(base, 'i_identity'):
+                complete = False
+                continue
+            val = base.i_identity
+            if val is None or val in ancestors:
+                continue
+            ancestors.add(val)
+            cached = getattr(val, 'i_ancestors', None)
+            if cached is not None:
+                ancestors.update(cached)
+            else:
+                stack.append(val)
+    ancestors = frozenset(ancestors)
+    if complete:
+        identity.i_ancestors = ancestors
+    return ancestors
+
+class IdentityIndex(object):
+    """The identities defined in a set of modules, and the identities
+    derived from each of them.  See Context.get_identity_index()."""
+    def __init__(self, modules):
+        self.identities = []
+        """all identities, in module order"""
+        self.derived = {}
+        """dict of identity:list of identities derived from it, directly
+        or through other identities, in the order of `identities`"""
+        seen = set()
+        for m in modules:
+            if m is None or m.keyword != 'module':
+                # the identities in submodules are in their modules
+                continue
+            for i in m.i_identities.values():
+                if i in seen:
+                    continue
+                seen.add(i)
+                self.identities.append(i)
+                for a in identity_ancestors(i):
+                    self.derived.setdefault(a, []).append(i)
+
+    def get_derived(self, identity):
+        """Return the list of identities derived from `identity`"""
+        return self.derived.get(identity, [])
 
 ## type restrictions
 
@@ -324,6 +376,35 @@ def validate_ranges(errors, pos, ranges, type_):
             cur_lo = hi
     return (ranges, pos)
 
+def _interval_bounds(intervals, minimum, maximum):
+    """Return (lows, highs) for a list of increasing (lo, hi) intervals.
+
+    'min' and 'max' are replaced by `minimum` and `maximum`, and a
+    single value lo by the interval lo..lo."""
+    lows = []
+    highs = []
+    for (lo, hi) in intervals:
+        if lo is None:
+            # an error has been reported already
+            continue
+        if lo == 'min':
+            lo = minimum
+        elif lo == 'max':
+            lo = maximum
+        if hi is None:
+            hi = lo
+        elif hi == 'min':
+            hi = minimum
+        elif hi == 'max':
+            hi = maximum
+        lows.append(lo)
+        highs.append(hi)
+    return (lows, highs)
+
+def _in_intervals(lows, highs, val):
+    i = bisect.bisect_right(lows, val) - 1
+    return i >= 0 and val <= highs[i]
+
 class RangeTypeSpec(TypeSpec):
     def __init__(self, base, range_spec):
         TypeSpec.__init__(self, base.name)
@@ -333,18 +414,22 @@ class RangeTypeSpec(TypeSpec):
         self.ranges_pos = ranges_pos
         if ranges:
             self.min = ranges[0][0]
-            if self.min == 'min':
-                self.min = base.min
             self.max = ranges[-1][1]
             if self.max is None: # single range
                 self.max = ranges[-1][0]
-            if self.max == 'max':
-                self.max = base.max
+            # e.g. range "max" gives min 'max'
+            if self.min in ('min', 'max'):
+                self.min = getattr(base, self.min)
+            if self.max in ('min', 'max'):
+                self.max = getattr(base, self.max)
         else:
             self.min = base.min
             self.max = base.max
         if hasattr(base, 'fraction_digits'):
             self.fraction_digits = base.fraction_digits
+        # the ranges as sorted lists of lower and upper bounds, for
+        # binary search
+        (self.lows, self.highs) = _interval_bounds(ranges, base.min, base.max)
 
     def str_to_val(self, errors, pos, string, module):
         return self.base.str_to_val(errors, pos, string, module)
@@ -352,19 +437,37 @@ class RangeTypeSpec(TypeSpec):
     def validate(self, errors, pos, val, module, errstr=''):
         if self.base.validate(errors, pos, val, module, errstr) is False:
             return False
-        for lo, hi in self.ranges:
-            if ((lo == 'min' or lo == 'max' or val >= lo) and
-                ((hi is None and val == lo) or hi == 'max' or \
-                     (hi is not None and val <= hi))):
-                return True
+        if _in_intervals(self.lows, self.highs, val):
+            return True
+        self._range_error(errors, pos, val, errstr)
+        return False
+
+    def validate_many(self, errors, pos, vals, module, errstr=''):
+        res = self.base.validate_many(errors, pos, vals, module, errstr)
+        lows = self.lows
+        highs = self.highs
+        for i, val in enumerate(vals):
+            if res[i] is False:
+                continue
+            j = bisect.bisect_right(lows, val) - 1
+            if j >= 0 and val <= highs[j]:
+                res[i] = True
+            else:
+                self._range_error(errors, pos, val, errstr)
+                res[i] = False
+        return res
+
+    def _range_error(self, errors, pos, val, errstr):
         err_add(errors, pos, 'TYPE_VALUE',
                 (str(val), self.definition, 'range error' + errstr +
                  ' for range defined at ' + str(self.ranges_pos)))
-        return False
 
     def restrictions(self):
         return self.base.restrictions()
 
+max_length = 18446744073709551615
+"""the largest length allowed in a length restriction"""
+
 def validate_length_expr(errors, stmt):
     def f(lostr, histr):
         try:
@@ -411,7 +514,7 @@ def validate_length_expr(errors, stmt):
             cur_lo = lo
         else:
             cur_lo = hi
-        if isinstance(cur_lo, util.int_types) and cur_lo > 18446744073709551615:
+        if isinstance(cur_lo, util.int_types) and cur_lo > max_length:
             err_add(errors, stmt.pos, 'LENGTH_VALUE', str(cur_lo))
             return None
     return (lengths, stmt.pos)
@@ -423,6 +526,9 @@ class LengthTypeSpec(TypeSpec):
         (lengths, length_pos) = length_spec
         self.lengths = lengths
         self.length_pos = length_pos
+        # the lengths as sorted lists of lower and upper bounds, for
+        # binary search
+        (self.lows, self.highs) = _interval_bounds(lengths, 0, max_length)
 
     def str_to_val(self, errors, pos, string, module):
         return self.base.str_to_val(errors, pos, string, module)
@@ -430,74 +536,48 @@ class LengthTypeSpec(TypeSpec):
     def validate(self, errors, pos, val, module, errstr=''):
         if self.base.validate(errors, pos, val, module, errstr) is False:
             return False
-        vallen = len(val)
-        for lo, hi in self.lengths:
-            if ((lo == 'min' or vallen >= lo) and
-                ((hi is None and vallen == lo) or hi == 'max' or
-                 (hi is not None and vallen <= hi))):
-                return True
+        if _in_intervals(self.lows, self.highs, len(val)):
+            return True
+        self._length_error(errors, pos, val, errstr)
+        return False
+
+    def validate_many(self, errors, pos, vals, module, errstr=''):
+        res = self.base.validate_many(errors, pos, vals, module, errstr)
+        lows = self.lows
+        highs = self.highs
+        for i, val in enumerate(vals):
+            if res[i] is False:
+                continue
+            vallen = len(val)
+            j = bisect.bisect_right(lows, vallen) - 1
+            if j >= 0 and vallen <= highs[j]:
+                res[i] = True
+            else:
+                self._length_error(errors, pos, val, errstr)
+                res[i] = False
+        return res
+
+    def _length_error(self, errors, pos, val, errstr):
         err_add(errors, pos, 'TYPE_VALUE',
                 (val, self.definition, 'length error' + errstr +
                  ' for length defined at ' + str(self.length_pos)))
-        return False
 
     def restrictions(self):
         return self.base.restrictions()
 
 
-def _validate_pattern_libxml2(errors, stmt, invert_match):
-    try:
-        import libxml2
-        try:
-            re = libxml2.regexpCompile(stmt.arg)
-            return ('libxml2', re, stmt.pos, invert_match, stmt.arg)
-        except libxml2.treeError as v:
-            err_add(errors, stmt.pos, 'PATTERN_ERROR', str(v))
-            return None
-    except ImportError:
-    ## Do not report a warning in this case.  Maybe we should add some
-    ## flag to turn on this warning...
-    #        err_add(errors, stmt.pos, 'PATTERN_FAILURE',
-    #                "Could not import python module libxml2 "
-    #                    "(see http://xmlsoft.org for installation help)")
-        return False
-
-def _validate_pattern_lxml(errors, stmt, invert_match):
-    try:
-        import lxml.etree
-        doc = StringIO(
-            '<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">' \
-            '  <xsd:element name="a" type="x"/>' \
-            '    <xsd:simpleType name="x">' \
-            '      <xsd:restriction base="xsd:string">' \
-            '        <xsd:pattern value=%s/>' \
-            '      </xsd:restriction>' \
-            '     </xsd:simpleType>' \
-            '   </xsd:schema>' % quoteattr(stmt.arg))
-        try:
-            sch = lxml.etree.XMLSchema(lxml.etree.parse(doc))
-            return ('lxml', sch, stmt.pos, invert_match, stmt.arg)
-        except lxml.etree.XMLSchemaParseError as v:
-            err_add(errors, stmt.pos, 'PATTERN_ERROR', str(v))
-            return None
-    except ImportError:
-        return False
-
 def validate_pattern_expr(errors, stmt):
     invert_match = False
     if stmt.search_one('modifier', arg='invert-match') is not None:
         invert_match = True
-    ## check that it's syntactically correct
-    # First try with lxml
-    res = _validate_pattern_lxml(errors, stmt, invert_match)
-    if res is not False:
-        return res
-    # Then try with libxml2
-    res = _validate_pattern_libxml2(errors, stmt, invert_match)
-    if res is not False:
-        return res
-    # Otherwise we can't validate patterns :(
-    return ('skip', None, stmt.pos, invert_match, stmt.arg)
+    ## check that it's syntactically correct.  all patterns can be
+    ## checked, so PATTERN_FAILURE is no longer reported.
+    try:
+        xsd_regex.check(stmt.arg)
+    except xsd_regex.XSDRegexError as v:
+        err_add(errors, stmt.pos, 'PATTERN_ERROR', str(v))
+        return None
+    return ('xsd', None, stmt.pos, invert_match, stmt.arg)
 
 class PatternTypeSpec(TypeSpec):
     def __init__(self, base, pattern_specs):
@@ -511,15 +591,9 @@ class PatternTypeSpec(TypeSpec):
     def validate(self, errors, pos, val, module, errstr=''):
         if self.base.validate(errors, pos, val, module, errstr) is False:
             return False
-        for type_, re, re_pos, invert_match, patstr in self.res:
-            if type_ == 'libxml2':
-                is_valid = re.regexpExec(val) == 1
-            elif type_ == 'lxml':
-                import lxml
-                doc = StringIO('<a>%s</a>' % escape(val))
-                is_valid = re.validate(lxml.etree.parse(doc))
-            elif type_ == 'skip':
-                continue # can't validate patterns
+        for _type, _re, re_pos, invert_match, patstr in self.res:
+            # the patterns are compiled when they are first used
+            is_valid = xsd_regex.compile(patstr).match(val) is not None
             if ((not is_valid and not invert_match) or
                 (is_valid and invert_match)):
                 err_add(errors, pos, 'TYPE_VALUE',
@@ -585,6 +659,9 @@ class EnumerationTypeSpec(TypeSpec):
     def get_value(self, val):
         return None
 
+    def get_name(self, value):
+        return None
+
     def restrictions(self):
         return ['enum']
 
@@ -593,9 +670,19 @@ class EnumTypeSpec(TypeSpec):
         TypeSpec.__init__(self, base.name)
         self.base = base
         self.enums = [(e.arg, e.i_value) for e in enums]
+        self.values = {}
+        """dict of name:value"""
+        self.names = {}
+        """dict of value:name"""
+        # if a name or value is defined more than once, an error has
+        # been reported; use the first one
+        for (name, value) in self.enums:
+            self.values.setdefault(name, value)
+            if value is not None:
+                self.names.setdefault(value, name)
 
     def validate(self, errors, pos, val, _module, errstr=''):
-        if util.keysearch(val, 0, self.enums) is None:
+        if val not in self.values:
             err_add(errors, pos, 'TYPE_VALUE',
                     (val, self.definition, 'enum not defined' + errstr))
             return False
@@ -603,11 +690,11 @@ class EnumTypeSpec(TypeSpec):
             return True
 
     def get_value(self, val):
-        r  = util.keysearch(val, 0, self.enums)
-        if r is not None:
-            return r[1]
-        else:
-            return None
+        return self.values.get(val)
+
+    def get_name(self, value):
+        """Return the name of the enum with the value `value`, or None"""
+        return self.names.get(value)
 
     def restrictions(self):
         return self.base.restrictions()
@@ -664,6 +751,9 @@ class BitsTypeSpec(TypeSpec):
     def get_position(self, bit):
         return None
 
+    def get_name(self, position):
+        return None
+
     def restrictions(self):
         return ['bit']
 
@@ -672,24 +762,34 @@ class BitTypeSpec(TypeSpec):
         TypeSpec.__init__(self, base.name)
         self.base = base
         self.bits = [(b.arg, b.i_position) for b in bits]
+        self.positions = {}
+        """dict of name:position"""
+        self.names = {}
+        """dict of position:name"""
+        # if a name or position is defined more than once, an error has
+        # been reported; use the first one
+        for (name, position) in self.bits:
+            self.positions.setdefault(name, position)
+            if position is not None:
+                self.names.setdefault(position, name)
 
     def str_to_val(self, errors, pos, string, _module):
         return string.split()
 
     def validate(self, errors, pos, val, _module, errstr=''):
         for v in val:
-            if util.keysearch(v, 0, self.bits) is None:
+            if v not in self.positions:
                 err_add(errors, pos, 'TYPE_VALUE',
                         (v, self.definition, 'bit not defined' + errstr))
                 return False
         return True
 
     def get_position(self, bit):
-        r  = util.keysearch(bit, 0, self.bits)
-        if r is not None:
-            return r[1]
-        else:
-            return None
+        return self.positions.get(bit)
+
+    def get_name(self, position):
+        """Return the name of the bit at `position`, or None"""
+        return self.names.get(position)
 
     def restrictions(self):
         return self.base.restrictions()
@@ -879,22 +979,128 @@ class UnionTypeSpec(TypeSpec):
         TypeSpec.__init__(self, 'union')
         # no base - no restrictions allowed
         self.types = types
+        self.members = None
+        """list of (type spec, test) for each member type, built when the
+        first value is validated; see union_member_test()"""
+        self.stats = None
+        """if enabled by enable_stats(), a list of [skipped, failed, matched]
+        counts for each member type"""
 
     def str_to_val(self, errors, pos, string, _module):
         return string
 
+    def enable_stats(self):
+        """Count, for each member type, the values that were skipped by
+        the lexical test, the values that failed, and the values that
+        matched"""
+        self.stats = [[0, 0, 0] for _t in self.types]
+
+    def __getstate__(self):
+        # the tests cannot be pickled; they are built again when the
+        # unpickled type spec is used
+        state = self.__dict__.copy()
+        state['members'] = None
+        return state
+
     def validate(self, errors, pos, val, module, errstr=''):
+        members = self.members
+        if members is None:
+            members = self.members = [
+                (t.i_type_spec, union_member_test(t.i_type_spec))
+                for t in self.types]
+        lexical = isinstance(val, util.str_types)
+        stats = self.stats
         # try to validate against each membertype
-        for t in self.types:
-            if t.i_type_spec is not None:
-                t_val = t.i_type_spec.str_to_val([], pos, val, module)
-                if t_val is not None:
-                    if t.i_type_spec.validate([], pos, t_val, module):
-                        return True
+        for i, (spec, test) in enumerate(members):
+            if spec is None:
+                continue
+            if lexical and test is not None and not test(val):
+                # the member type cannot match a string like this
+                if stats is not None:
+                    stats[i][0] += 1
+                continue
+            t_val = spec.str_to_val([], pos, val, module)
+            if t_val is not None:
+                if spec.validate([], pos, t_val, module):
+                    if stats is not None:
+                        stats[i][2] += 1
+                    return True
+            if stats is not None:
+                stats[i][1] += 1
         err_add(errors, pos, 'TYPE_VALUE',
                 (val, self.definition, 'no member type matched' + errstr))
         return False
 
+_boolean_strings = frozenset(['true', 'false'])
+
+def _int_syntax(val):
+    s = val.strip()
+    return s[:1].isdigit() or (len(s) > 1 and s[0] in '+-')
+
+def _decimal_syntax(val):
+    c = val[:1]
+    return c != '' and c in '+-0123456789'
+
+def _never(_val):
+    return False
+
+def _chars_test(excluded, required):
+    def test(val):
+        if not excluded.isdisjoint(val):
+            return False
+        for c in required:
+            if c not in val:
+                return False
+        return True
+    return test
+
+def union_member_test(spec):
+    """Return a function that returns False for the strings that
+    cannot be a value of `spec`, without converting and validating them,
+    or None if there is no such test.
+
+    The test looks at the built-in type and, for strings, at the
+    characters used by the patterns."""
+    excluded = set()
+    required = set()
+    while isinstance(spec, (RangeTypeSpec, LengthTypeSpec, PatternTypeSpec)):
+        if isinstance(spec, PatternTypeSpec):
+            for (_type, _re, _pos, invert_match, patstr) in spec.res:
+                if invert_match:
+                    continue
+                try:
+                    (chars, req) = xsd_regex.analyze(patstr)
+                except xsd_regex.XSDRegexError:
+                    continue
+                excluded.update(_ascii_excluded(chars))
+                required.update(req)
+        spec = spec.base
+    if isinstance(spec, IntTypeSpec):
+        return _int_syntax
+    elif isinstance(spec, Decimal64TypeSpec):
+        return _decimal_syntax
+    elif isinstance(spec, BooleanTypeSpec):
+        return _boolean_strings.__contains__
+    elif isinstance(spec, EmptyTypeSpec):
+        return _never
+    elif isinstance(spec, EnumTypeSpec):
+        return spec.values.__contains__
+    elif isinstance(spec, StringTypeSpec) and (excluded or required):
+        return _chars_test(frozenset(excluded), tuple(required))
+    return None
+
+def _ascii_excluded(ranges):
+    """Return the ASCII characters that are not in `ranges`"""
+    excluded = []
+    nxt = 0
+    for (lo, hi) in ranges:
+        if lo >= 128:
+            break
+        excluded.extend(chr(c) for c in range(nxt, lo))
+        nxt = hi + 1
+    excluded.extend(chr(c) for c in range(nxt, 128))
+    return excluded
+
 yang_type_specs = {
    'int8': IntTypeSpec('int8', -128, 127),
    'int16': IntTypeSpec('int16', -32768, 32767),
@@ -146,8 +146,10 @@ def report_file_read(filename, extra=None):
     files_read[realpath] = True
 
 
+_data_node_skip = ('choice', 'case', 'input', 'output')
+
 def search_data_node(children, modulename, identifier, last_skipped = None):
-    skip = ['choice', 'case', 'input', 'output']
+    skip = list(_data_node_skip)
     if last_skipped is not None:
         skip.append(last_skipped)
     for child in children:
@@ -162,6 +164,100 @@ def search_data_node(children, modulename, identifier, last_skipped = None):
     return None
 
 
+# lists with fewer children than this are searched without an index
+_min_index_size = 8
+
+class ChildIndex(object):
+    """Index of the i_children of a statement.
+
+    `children` is the indexed list, and the first `size` children are in
+    the index.  Children appended to the list are added to the index when
+    it is used.  If children are removed or replaced, the statement's
+    index must be reset with reset_child_index().
+    """
+    __slots__ = ('children', 'size', 'nodes', 'data_nodes', 'skipped')
+
+    def __init__(self, children):
+        self.children = children
+        self.size = 0
+        self.nodes = {}
+        """dict of (module name, identifier):child, where module name is
+        the name of the child's module, or of the module that includes
+        the child's submodule"""
+        self.data_nodes = {}
+        """dict of (module name, identifier):position for the children
+        that are not choice, case, input or output"""
+        self.skipped = []
+        """positions of the choice, case, input and output children"""
+        self.update()
+
+    def update(self):
+        children = self.children
+        for i in range(self.size, len(children)):
+            child = children[i]
+            m = child.i_module
+            self.nodes.setdefault((m.i_modulename, child.arg), child)
+            if m.i_including_modulename is not None:
+                self.nodes.setdefault((m.i_including_modulename, child.arg),
+                                      child)
+            if child.keyword in _data_node_skip:
+                self.skipped.append(i)
+            else:
+                self.data_nodes.setdefault((m.i_modulename, child.arg), i)
+        self.size = len(children)
+
+def child_index(node):
+    """Return the ChildIndex of `node`'s i_children, or None if the list
+    is too small to be worth indexing."""
+    children = node.i_children
+    if len(children) < _min_index_size:
+        return None
+    index = getattr(node, 'i_child_index', None)
+    if index is None or index.children is not children or \
+       index.size > len(children):
+        index = ChildIndex(children)
+        node.i_child_index = index
+    elif index.size < len(children):
+        index.update()
+    return index
+
+def reset_child_index(node):
+    """Must be called when children are removed from or replaced in
+    node.i_children"""
+    node.i_child_index = None
+
+def search_child_node(node, modulename, identifier):
+    """Like statements.search_child(node.i_children, ...), with an index"""
+    index = child_index(node)
+    if index is None:
+        for child in node.i_children:
+            if child.arg == identifier:
+                m = child.i_module
+                if (m.i_modulename == modulename or
+                    m.i_including_modulename is not None and
+                    m.i_including_modulename == modulename):
+                    return child
+        return None
+    return index.nodes.get((modulename, identifier))
+
+def search_data_node_child(node, modulename, identifier):
+    """Like search_data_node(node.i_children, ...), with an index"""
+    index = child_index(node)
+    if index is None:
+        return search_data_node(node.i_children, modulename, identifier)
+    pos = index.data_nodes.get((modulename, identifier))
+    # a node in a choice or case before the match is found first
+    for i in index.skipped:
+        if pos is not None and i > pos:
+            break
+        r = search_data_node_child(index.children[i], modulename, identifier)
+        if r is not None:
+            return r
+    if pos is None:
+        return None
+    return index.children[pos]
+
+
 def closest_ancestor_data_node(node):
     if node.keyword in ['choice', 'case']:
         return closest_ancestor_data_node(node.parent)
@@ -1,7 +1,7 @@
 from . import xpath_lexer
 from . import xpath_parser
 from .error import err_add
-from .util import prefix_to_module, search_data_node, data_node_up
+from .util import prefix_to_module, search_data_node_child, data_node_up
 from .syntax import re_identifier
 
 core_functions = {
@@ -245,10 +245,14 @@ def chk_xpath_path(ctx, mod, pos, initial, node, path):
             # the paths
             if pmodule is not None and node is not None and initial is not None:
                 if node == 'root':
-                    children = pmodule.i_children
+                    parent = pmodule
                 else:
-                    children = getattr(node, 'i_children', None) or []
-                child = search_data_node(children, pmodule.i_modulename, name)
+                    parent = node
+                if getattr(parent, 'i_children', None):
+                    child = search_data_node_child(parent,
+                                                   pmodule.i_modulename, name)
+                else:
+                    child = None
                 if child is None and node == 'root':
                     err_add(ctx.errors, pos, 'XPATH_NODE_NOT_FOUND2',
                             (pmodule.i_modulename, name, pmodule.arg))
@@ -0,0 +1,101 @@
+
+# xpath_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ExprleftORleftANDleftEQNEQleftLTLTEGTGTErightUMINUSAND AT BAR COMMA DIV DOLLAR DOT DOTDOT DOUBLECOLON DOUBLESLASH EQ GT GTE LBRACKET LPAREN LT LTE MINUS MOD NEQ OR PLUS RBRACKET RPAREN SLASH STAR axis function_name literal name node_type number prefix_test wildcardLocationPath : RelativeLocationPathLocationPath : AbsoluteLocationPathAbsoluteLocationPath : SLASH RelativeLocationPathAbsoluteLocationPath : SLASHAbsoluteLocationPath : AbbreviatedAbsoluteLocationPathRelativeLocationPath : StepRelativeLocationPath : RelativeLocationPath SLASH StepRelativeLocationPath : AbbreviatedRelativeLocationPathStep : axis DOUBLECOLON NodeTest PredicateListStep : axis DOUBLECOLON NodeTestStep : AT name PredicateListStep : AT nameStep : NodeTest PredicateListStep : NodeTestStep : AbbreviatedStep PredicateListStep : AbbreviatedStepPredicateList : PredicateList PredicatePredicateList : PredicateNodeTest : NameTestNodeTest : node_type LPAREN RPARENNodeTest : node_type LPAREN literal RPARENPredicate : LBRACKET PredicateExpr RBRACKETPredicateExpr : ExprAbbreviatedAbsoluteLocationPath : DOUBLESLASH RelativeLocationPathAbbreviatedRelativeLocationPath : RelativeLocationPath DOUBLESLASH StepAbbreviatedStep : DOTAbbreviatedStep : DOTDOTExpr : OrExprPrimaryExpr : DOLLAR namePrimaryExpr : LPAREN Expr RPARENPrimaryExpr : literalPrimaryExpr : numberPrimaryExpr : FunctionCallFunctionCall : function_name LPAREN RPARENFunctionCall : function_name LPAREN ArgumentList RPARENArgumentList : ArgumentList COMMA ArgumentArgumentList : ArgumentArgument : ExprUnionExpr : PathExprUnionExpr : UnionExpr BAR PathExprPathExpr : LocationPathPathExpr : FilterExprPathExpr : FilterExpr SLASH RelativeLocationPathPathExpr : FilterExpr DOUBLESLASH RelativeLocationPathFilterExpr : PrimaryExprFilterExpr : FilterExpr PredicateOrExpr : AndExprOrExpr : OrExpr OR AndExprAndExpr : EqualityExprAndExpr : AndExpr AND EqualityExprEqualityExpr : RelationalExprEqualityExpr : EqualityExpr EQ RelationalExprEqualityExpr : EqualityExpr NEQ RelationalExprRelationalExpr : AdditiveExprRelationalExpr : RelationalExpr LT AdditiveExprRelationalExpr : RelationalExpr GT AdditiveExprRelationalExpr : RelationalExpr LTE AdditiveExprRelationalExpr : RelationalExpr GTE AdditiveExprAdditiveExpr : MultiplicativeExprAdditiveExpr : AdditiveExpr PLUS MultiplicativeExprAdditiveExpr : AdditiveExpr MINUS MultiplicativeExprMultiplicativeExpr : UnaryExprMultiplicativeExpr : MultiplicativeExpr MultiplyOperator UnaryExprMultiplicativeExpr : MultiplicativeExpr DIV UnaryExprMultiplicativeExpr : MultiplicativeExpr MOD UnaryExprUnaryExpr : UnionExprUnaryExpr : MINUS UnaryExpr %prec UMINUSMultiplyOperator : STARNameTest : wildcardNameTest : prefix_testNameTest : name'
+    
+_lr_action_items = {'MINUS':([0,6,7,8,9,10,11,12,13,14,15,17,18,19,20,21,23,24,25,26,27,29,31,33,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,57,58,59,62,63,66,67,68,69,70,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,105,106,],[8,48,-59,8,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,8,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,8,8,8,8,8,8,8,8,8,8,8,8,8,-68,-67,-46,8,-3,-24,-29,-13,-18,-12,-15,8,48,48,48,48,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,8,-21,]),'SLASH':([0,8,13,15,18,19,20,23,24,25,26,27,29,31,33,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,57,58,59,62,63,66,67,68,69,70,86,87,90,91,92,93,94,95,96,100,102,103,104,105,106,],[14,14,55,60,-45,-6,-8,-71,14,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,14,14,14,14,14,14,14,14,14,14,14,14,14,-68,14,-46,14,60,60,-29,-13,-18,-12,-15,14,60,60,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,14,-21,]),'DOLLAR':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,58,70,105,],[22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-68,22,22,22,22,]),'LPAREN':([0,8,24,32,34,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,58,70,105,],[24,24,24,70,71,24,24,24,24,24,24,24,24,24,24,24,24,24,-68,24,24,24,24,]),'literal':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,58,70,71,105,],[25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,-68,25,25,25,101,25,]),'number':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,58,70,105,],[26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,-68,26,26,26,26,]),'axis':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,70,105,],[28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,-68,28,28,28,28,28,28,28,28,]),'AT':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,70,105,],[30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,-68,30,30,30,30,30,30,30,30,]),'DOUBLESLASH':([0,8,13,15,18,19,20,23,24,25,26,27,29,31,33,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,57,58,59,62,63,66,67,68,69,70,86,87,90,91,92,93,94,95,96,100,102,103,104,105,106,],[16,16,56,61,-45,-6,-8,-71,16,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,16,16,16,16,16,16,16,16,16,16,16,16,16,-68,16,-46,16,61,61,-29,-13,-18,-12,-15,16,61,61,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,16,-21,]),'function_name':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,58,70,105,],[32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-68,32,32,32,32,]),'node_type':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,65,70,105,],[34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,-68,34,34,34,34,34,34,34,34,34,]),'DOT':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,70,105,],[35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,-68,35,35,35,35,35,35,35,35,]),'DOTDOT':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,70,105,],[36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,-68,36,36,36,36,36,36,36,36,]),'wildcard':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,65,70,105,],[37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,-68,37,37,37,37,37,37,37,37,37,]),'prefix_test':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,65,70,105,],[38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,-68,38,38,38,38,38,38,38,38,38,]),'name':([0,8,14,16,22,24,30,39,40,41,42,43,44,45,46,47,48,49,50,51,52,54,55,56,58,60,61,65,70,105,],[23,23,23,23,63,23,68,23,23,23,23,23,23,23,23,23,23,23,23,23,-68,23,23,23,23,23,23,23,23,23,]),'$end':([1,2,3,4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[0,-28,-47,-49,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,-48,-50,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'RPAREN':([2,3,4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,64,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,106,107,],[-28,-47,-49,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,92,-13,-18,-12,-15,96,100,-48,-50,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,104,-37,-38,-20,106,-22,-9,-35,-21,-36,]),'RBRACKET':([2,3,4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,100,102,103,104,106,],[-28,-47,-49,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,-48,-50,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,102,-23,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'COMMA':([2,3,4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,97,98,99,100,102,103,104,106,107,],[-28,-47,-49,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,-48,-50,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,105,-37,-38,-20,-22,-9,-35,-21,-36,]),'OR':([2,3,4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[39,-47,-49,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,-48,-50,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'AND':([3,4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[40,-49,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,40,-50,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'EQ':([4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[41,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,41,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'NEQ':([4,5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[42,-51,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,42,-52,-53,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'LT':([5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[43,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,43,43,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'GT':([5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[44,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,44,44,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'LTE':([5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[45,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,45,45,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'GTE':([5,6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,74,75,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[46,-54,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,46,46,-55,-56,-57,-58,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'PLUS':([6,7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,76,77,78,79,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[47,-59,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,47,47,47,47,-60,-61,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'DIV':([7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[50,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,50,50,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'MOD':([7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[51,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,51,51,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'STAR':([7,9,10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,53,57,59,62,63,66,67,68,69,80,81,82,83,84,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[52,-62,-66,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-67,-46,-3,-24,-29,-13,-18,-12,-15,52,52,-63,-64,-65,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'BAR':([10,11,12,13,14,15,17,18,19,20,21,23,25,26,27,29,31,33,35,36,37,38,57,59,62,63,66,67,68,69,85,86,87,90,91,92,93,94,95,96,100,102,103,104,106,],[54,-39,-41,-42,-4,-1,-2,-45,-6,-8,-5,-71,-31,-32,-33,-14,-16,-19,-26,-27,-69,-70,-46,-3,-24,-29,-13,-18,-12,-15,-40,-43,-44,-7,-25,-30,-10,-17,-11,-34,-20,-22,-9,-35,-21,]),'LBRACKET':([13,18,23,25,26,27,29,31,33,35,36,37,38,57,63,66,67,68,69,92,93,94,95,96,100,102,103,104,106,],[58,-45,-71,-31,-32,-33,58,58,-19,-26,-27,-69,-70,-46,-29,58,-18,58,58,-30,58,-17,58,-34,-20,-22,58,-35,-21,]),'DOUBLECOLON':([28,],[65,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'Expr':([0,24,58,70,105,],[1,64,89,99,99,]),'OrExpr':([0,24,58,70,105,],[2,2,2,2,2,]),'AndExpr':([0,24,39,58,70,105,],[3,3,72,3,3,3,]),'EqualityExpr':([0,24,39,40,58,70,105,],[4,4,4,73,4,4,4,]),'RelationalExpr':([0,24,39,40,41,42,58,70,105,],[5,5,5,5,74,75,5,5,5,]),'AdditiveExpr':([0,24,39,40,41,42,43,44,45,46,58,70,105,],[6,6,6,6,6,6,76,77,78,79,6,6,6,]),'MultiplicativeExpr':([0,24,39,40,41,42,43,44,45,46,47,48,58,70,105,],[7,7,7,7,7,7,7,7,7,7,80,81,7,7,7,]),'UnaryExpr':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,58,70,105,],[9,53,9,9,9,9,9,9,9,9,9,9,9,82,83,84,9,9,9,]),'UnionExpr':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,58,70,105,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'PathExpr':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,58,70,105,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,85,11,11,11,]),'LocationPath':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,58,70,105,],[12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,]),'FilterExpr':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,58,70,105,],[13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,]),'RelativeLocationPath':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,55,56,58,70,105,],[15,15,59,62,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,86,87,15,15,15,]),'AbsoluteLocationPath':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,58,70,105,],[17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,]),'PrimaryExpr':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,58,70,105,],[18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,]),'Step':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,55,56,58,60,61,70,105,],[19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,90,91,19,19,]),'AbbreviatedRelativeLocationPath':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,55,56,58,70,105,],[20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,]),'AbbreviatedAbsoluteLocationPath':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,58,70,105,],[21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,]),'FunctionCall':([0,8,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,58,70,105,],[27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,]),'NodeTest':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,55,56,58,60,61,65,70,105,],[29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,93,29,29,]),'AbbreviatedStep':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,55,56,58,60,61,70,105,],[31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,]),'NameTest':([0,8,14,16,24,39,40,41,42,43,44,45,46,47,48,49,50,51,54,55,56,58,60,61,65,70,105,],[33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,]),'MultiplyOperator':([7,80,81,],[49,49,49,]),'Predicate':([13,29,31,66,68,69,93,95,103,],[57,67,67,94,67,94,67,94,94,]),'PredicateList':([29,31,68,93,],[66,69,95,103,]),'PredicateExpr':([58,],[88,]),'ArgumentList':([70,],[97,]),'Argument':([70,105,],[98,107,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> Expr","S'",1,None,None,None),
+  ('LocationPath -> RelativeLocationPath','LocationPath',1,'p_location_path_1','xpath_parser.py',29),
+  ('LocationPath -> AbsoluteLocationPath','LocationPath',1,'p_location_path_2','xpath_parser.py',32),
+  ('AbsoluteLocationPath -> SLASH RelativeLocationPath','AbsoluteLocationPath',2,'p_abs_location_path_1','xpath_parser.py',37),
+  ('AbsoluteLocationPath -> SLASH','AbsoluteLocationPath',1,'p_abs_location_path_2','xpath_parser.py',40),
+  ('AbsoluteLocationPath -> AbbreviatedAbsoluteLocationPath','AbsoluteLocationPath',1,'p_abs_location_path_3','xpath_parser.py',43),
+  ('RelativeLocationPath -> Step','RelativeLocationPath',1,'p_rel_location_path_1','xpath_parser.py',48),
+  ('RelativeLocationPath -> RelativeLocationPath SLASH Step','RelativeLocationPath',3,'p_rel_location_path_2','xpath_parser.py',51),
+  ('RelativeLocationPath -> AbbreviatedRelativeLocationPath','RelativeLocationPath',1,'p_rel_location_path_3','xpath_parser.py',55),
+  ('Step -> axis DOUBLECOLON NodeTest PredicateList','Step',4,'p_step_1','xpath_parser.py',60),
+  ('Step -> axis DOUBLECOLON NodeTest','Step',3,'p_step_2','xpath_parser.py',63),
+  ('Step -> AT name PredicateList','Step',3,'p_step_3','xpath_parser.py',66),
+  ('Step -> AT name','Step',2,'p_step_4','xpath_parser.py',69),
+  ('Step -> NodeTest PredicateList','Step',2,'p_step_5','xpath_parser.py',72),
+  ('Step -> NodeTest','Step',1,'p_step_6','xpath_parser.py',75),
+  ('Step -> AbbreviatedStep PredicateList','Step',2,'p_step_7','xpath_parser.py',78),
+  ('Step -> AbbreviatedStep','Step',1,'p_step_8','xpath_parser.py',88),
+  ('PredicateList -> PredicateList Predicate','PredicateList',2,'p_pred_list_1','xpath_parser.py',92),
+  ('PredicateList -> Predicate','PredicateList',1,'p_pred_list_2','xpath_parser.py',96),
+  ('NodeTest -> NameTest','NodeTest',1,'p_node_test_1','xpath_parser.py',101),
+  ('NodeTest -> node_type LPAREN RPAREN','NodeTest',3,'p_node_test_2','xpath_parser.py',104),
+  ('NodeTest -> node_type LPAREN literal RPAREN','NodeTest',4,'p_node_test_3','xpath_parser.py',107),
+  ('Predicate -> LBRACKET PredicateExpr RBRACKET','Predicate',3,'p_pred','xpath_parser.py',114),
+  ('PredicateExpr -> Expr','PredicateExpr',1,'p_pred_expr','xpath_parser.py',119),
+  ('AbbreviatedAbsoluteLocationPath -> DOUBLESLASH RelativeLocationPath','AbbreviatedAbsoluteLocationPath',2,'p_abbrev_abs_loc_path','xpath_parser.py',124),
+  ('AbbreviatedRelativeLocationPath -> RelativeLocationPath DOUBLESLASH Step','AbbreviatedRelativeLocationPath',3,'p_abbrev_rel_loc_path','xpath_parser.py',130),
+  ('AbbreviatedStep -> DOT','AbbreviatedStep',1,'p_abbrev_step_1','xpath_parser.py',137),
+  ('AbbreviatedStep -> DOTDOT','AbbreviatedStep',1,'p_abbrev_step_2','xpath_parser.py',140),
+  ('Expr -> OrExpr','Expr',1,'p_expr','xpath_parser.py',145),
+  ('PrimaryExpr -> DOLLAR name','PrimaryExpr',2,'p_prim_expr_1','xpath_parser.py',150),
+  ('PrimaryExpr -> LPAREN Expr RPAREN','PrimaryExpr',3,'p_prim_expr_2','xpath_parser.py',153),
+  ('PrimaryExpr -> literal','PrimaryExpr',1,'p_prim_expr_3','xpath_parser.py',156),
+  ('PrimaryExpr -> number','PrimaryExpr',1,'p_prim_expr_4','xpath_parser.py',159),
+  ('PrimaryExpr -> FunctionCall','PrimaryExpr',1,'p_prim_expr_5','xpath_parser.py',162),
+  ('FunctionCall -> function_name LPAREN RPAREN','FunctionCall',3,'p_fun_call_1','xpath_parser.py',167),
+  ('FunctionCall -> function_name LPAREN ArgumentList RPAREN','FunctionCall',4,'p_fun_call_2','xpath_parser.py',170),
+  ('ArgumentList -> ArgumentList COMMA Argument','ArgumentList',3,'p_arg_list_1','xpath_parser.py',174),
+  ('ArgumentList -> Argument','ArgumentList',1,'p_arg_list_2','xpath_parser.py',178),
+  ('Argument -> Expr','Argument',1,'p_arg','xpath_parser.py',183),
+  ('UnionExpr -> PathExpr','UnionExpr',1,'p_union_expr_1','xpath_parser.py',188),
+  ('UnionExpr -> UnionExpr BAR PathExpr','UnionExpr',3,'p_union_expr_2','xpath_parser.py',191),
+  ('PathExpr -> LocationPath','PathExpr',1,'p_path_expr_1','xpath_parser.py',196),
+  ('PathExpr -> FilterExpr','PathExpr',1,'p_path_expr_2','xpath_parser.py',199),
+  ('PathExpr -> FilterExpr SLASH RelativeLocationPath','PathExpr',3,'p_path_expr_3','xpath_parser.py',202),
+  ('PathExpr -> FilterExpr DOUBLESLASH RelativeLocationPath','PathExpr',3,'p_path_expr_4','xpath_parser.py',206),
+  ('FilterExpr -> PrimaryExpr','FilterExpr',1,'p_filter_expr_1','xpath_parser.py',213),
+  ('FilterExpr -> FilterExpr Predicate','FilterExpr',2,'p_filter_expr_2','xpath_parser.py',216),
+  ('OrExpr -> AndExpr','OrExpr',1,'p_or_expr_1','xpath_parser.py',221),
+  ('OrExpr -> OrExpr OR AndExpr','OrExpr',3,'p_or_expr_2','xpath_parser.py',224),
+  ('AndExpr -> EqualityExpr','AndExpr',1,'p_and_expr_1','xpath_parser.py',229),
+  ('AndExpr -> AndExpr AND EqualityExpr','AndExpr',3,'p_and_expr_2','xpath_parser.py',232),
+  ('EqualityExpr -> RelationalExpr','EqualityExpr',1,'p_eq_expr_1','xpath_parser.py',237),
+  ('EqualityExpr -> EqualityExpr EQ RelationalExpr','EqualityExpr',3,'p_eq_expr_2','xpath_parser.py',240),
+  ('EqualityExpr -> EqualityExpr NEQ RelationalExpr','EqualityExpr',3,'p_eq_expr_3','xpath_parser.py',243),
+  ('RelationalExpr -> AdditiveExpr','RelationalExpr',1,'p_rel_expr_1','xpath_parser.py',248),
+  ('RelationalExpr -> RelationalExpr LT AdditiveExpr','RelationalExpr',3,'p_rel_expr_2','xpath_parser.py',251),
+  ('RelationalExpr -> RelationalExpr GT AdditiveExpr','RelationalExpr',3,'p_rel_expr_3','xpath_parser.py',254),
+  ('RelationalExpr -> RelationalExpr LTE AdditiveExpr','RelationalExpr',3,'p_rel_expr_4','xpath_parser.py',257),
+  ('RelationalExpr -> RelationalExpr GTE AdditiveExpr','RelationalExpr',3,'p_rel_expr_5','xpath_parser.py',260),
+  ('AdditiveExpr -> MultiplicativeExpr','AdditiveExpr',1,'p_add_expr_1','xpath_parser.py',265),
+  ('AdditiveExpr -> AdditiveExpr PLUS MultiplicativeExpr','AdditiveExpr',3,'p_add_expr_2','xpath_parser.py',268),
+  ('AdditiveExpr -> AdditiveExpr MINUS MultiplicativeExpr','AdditiveExpr',3,'p_add_expr_3','xpath_parser.py',271),
+  ('MultiplicativeExpr -> UnaryExpr','MultiplicativeExpr',1,'p_mul_expr_1','xpath_parser.py',276),
+  ('MultiplicativeExpr -> MultiplicativeExpr MultiplyOperator UnaryExpr','MultiplicativeExpr',3,'p_mul_expr_2','xpath_parser.py',279),
+  ('MultiplicativeExpr -> MultiplicativeExpr DIV UnaryExpr','MultiplicativeExpr',3,'p_mul_expr_3','xpath_parser.py',282),
+  ('MultiplicativeExpr -> MultiplicativeExpr MOD UnaryExpr','MultiplicativeExpr',3,'p_mul_expr_4','xpath_parser.py',285),
+  ('UnaryExpr -> UnionExpr','UnaryExpr',1,'p_unary_expr_1','xpath_parser.py',290),
+  ('UnaryExpr -> MINUS UnaryExpr','UnaryExpr',2,'p_unary_expr_2','xpath_parser.py',293),
+  ('MultiplyOperator -> STAR','MultiplyOperator',1,'p_mul_oper','xpath_parser.py',298),
+  ('NameTest -> wildcard','NameTest',1,'p_name_test_1','xpath_parser.py',303),
+  ('NameTest -> prefix_test','NameTest',1,'p_name_test_2','xpath_parser.py',306),
+  ('NameTest -> name','NameTest',1,'p_name_test_3','xpath_parser.py',309),
+]
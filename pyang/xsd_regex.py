@@ -0,0 +1,653 @@
+"""XML Schema regular expressions
+
+YANG patterns are regular expressions as defined in XML Schema Part 2,
+Appendix F.  This module translates them to Python regular expressions.
+
+XML Schema regular expressions are implicitly anchored at both ends of
+the string, and `^` and `$` are normal characters.  Character class
+escapes (\\d, \\w, \\p{..} etc.) and character class subtraction are
+translated to explicit character ranges.
+"""
+
+import itertools
+import re
+import string
+import sys
+import unicodedata
+
+try:
+    _chr = unichr
+except NameError:
+    _chr = chr
+
+_maxchar = sys.maxunicode
+
+class XSDRegexError(Exception):
+    """raised for a syntax error in a regular expression"""
+
+    def __init__(self, msg, pattern, pos):
+        Exception.__init__(self, msg)
+        self.msg = msg
+        self.pattern = pattern
+        self.pos = pos
+
+    def __str__(self):
+        return '%s at position %d in "%s"' % (self.msg, self.pos + 1,
+                                               self.pattern)
+
+_compiled = {}
+"""dict of pattern:<compiled Python regular expression>"""
+
+def check(pattern):
+    """Check the syntax of `pattern`.
+
+    Raises XSDRegexError if the pattern is not valid.  This does not
+    build the character classes, and is faster than compile()."""
+    if pattern not in _compiled:
+        _Parser(pattern, False).parse()
+
+def translate(pattern):
+    """Return a Python regular expression that matches the same strings
+    as `pattern` when used with re.match().
+
+    Raises XSDRegexError if the pattern is not valid."""
+    return '(?:%s)\\Z' % _Parser(pattern, True).parse()
+
+def compile(pattern):
+    """Return the compiled Python regular expression for `pattern`.
+
+    Use the match() method of the result to match a string.  The
+    compiled expressions are cached by pattern.
+
+    Raises XSDRegexError if the pattern is not valid."""
+    try:
+        return _compiled[pattern]
+    except KeyError:
+        pass
+    res = re.compile(translate(pattern), re.UNICODE)
+    _compiled[pattern] = res
+    return res
+
+def match(pattern, s):
+    """Return True if the string `s` matches `pattern`"""
+    return compile(pattern).match(s) is not None
+
+def analyze(pattern):
+    """Return (chars, required) for `pattern`.
+
+    `chars` are the ranges of the characters that can occur in a string
+    that matches the pattern, and `required` is the set of characters
+    that occur in every such string.
+
+    Raises XSDRegexError if the pattern is not valid."""
+    check(pattern)
+    analyzer = _Analyzer(pattern)
+    required = analyzer.parse()
+    return (_normalize(analyzer.chars), frozenset(required))
+
+### character sets, as sorted lists of disjoint (first, last) ranges
+
+def _normalize(ranges):
+    res = []
+    for (lo, hi) in sorted(ranges):
+        if res and lo <= res[-1][1] + 1:
+            if hi > res[-1][1]:
+                res[-1] = (res[-1][0], hi)
+        else:
+            res.append((lo, hi))
+    return res
+
+def _complement(ranges):
+    res = []
+    nxt = 0
+    for (lo, hi) in ranges:
+        if lo > nxt:
+            res.append((nxt, lo - 1))
+        nxt = hi + 1
+    if nxt <= _maxchar:
+        res.append((nxt, _maxchar))
+    return res
+
+def _subtract(a, b):
+    return _complement(_normalize(_complement(a) + b))
+
+def _clip(ranges):
+    return [(lo, min(hi, _maxchar)) for (lo, hi) in ranges if lo <= _maxchar]
+
+_class_special = u'\\]^-['
+
+def _class_char(c):
+    ch = _chr(c)
+    if ch in _class_special:
+        return u'\\' + ch
+    return ch
+
+def _set_to_re(ranges):
+    if not ranges:
+        # matches nothing
+        return u'(?!)'
+    parts = []
+    for (lo, hi) in ranges:
+        if lo == hi:
+            parts.append(_class_char(lo))
+        elif lo + 1 == hi:
+            parts.append(_class_char(lo) + _class_char(hi))
+        else:
+            parts.append(_class_char(lo) + u'-' + _class_char(hi))
+    return u'[' + u''.join(parts) + u']'
+
+### Unicode general categories
+
+_categories = None
+
+def _scan_categories(cats, lo, hi):
+    pos = lo
+    for (cat, chars) in itertools.groupby(
+            map(unicodedata.category, map(_chr, range(lo, hi + 1)))):
+        n = len(list(chars))
+        cats.setdefault(cat, []).append((pos, pos + n - 1))
+        pos += n
+
+def _get_categories():
+    """Return a dict of Unicode general category:ranges.
+
+    The categories are computed from the unicodedata module the first
+    time they are needed."""
+    global _categories
+    if _categories is not None:
+        return _categories
+    cats = {}
+    _scan_categories(cats, 0, min(0x3ffff, _maxchar))
+    if _maxchar > 0x3ffff:
+        # planes 4 to 13 have no assigned characters, and take most of
+        # the time to scan
+        unassigned = (0x40000, 0xdffff)
+        if all(unicodedata.category(_chr(c)) == 'Cn'
+               for c in range(unassigned[0], unassigned[1] + 1, 0x100)):
+            cats.setdefault('Cn', []).append(unassigned)
+        else:
+            _scan_categories(cats, unassigned[0], unassigned[1])
+        _scan_categories(cats, 0xe0000, _maxchar)
+    for cat in list(cats):
+        cats.setdefault(cat[0], []).extend(cats[cat])
+    for cat in cats:
+        cats[cat] = _normalize(cats[cat])
+    _categories = cats
+    return cats
+
+_category_names = [
+    'L', 'Lu', 'Ll', 'Lt', 'Lm', 'Lo',
+    'M', 'Mn', 'Mc', 'Me',
+    'N', 'Nd', 'Nl', 'No',
+    'P', 'Pc', 'Pd', 'Ps', 'Pe', 'Pi', 'Pf', 'Po',
+    'Z', 'Zs', 'Zl', 'Zp',
+    'S', 'Sm', 'Sc', 'Sk', 'So',
+    'C', 'Cc', 'Cf', 'Co', 'Cn',
+]
+
+### Unicode blocks, as listed in XML Schema Part 2, Appendix F
+
+_blocks = {
+    'BasicLatin': [(0x0000, 0x007f)],
+    'Latin-1Supplement': [(0x0080, 0x00ff)],
+    'LatinExtended-A': [(0x0100, 0x017f)],
+    'LatinExtended-B': [(0x0180, 0x024f)],
+    'IPAExtensions': [(0x0250, 0x02af)],
+    'SpacingModifierLetters': [(0x02b0, 0x02ff)],
+    'CombiningDiacriticalMarks': [(0x0300, 0x036f)],
+    'Greek': [(0x0370, 0x03ff)],
+    'Cyrillic': [(0x0400, 0x04ff)],
+    'Armenian': [(0x0530, 0x058f)],
+    'Hebrew': [(0x0590, 0x05ff)],
+    'Arabic': [(0x0600, 0x06ff)],
+    'Syriac': [(0x0700, 0x074f)],
+    'Thaana': [(0x0780, 0x07bf)],
+    'Devanagari': [(0x0900, 0x097f)],
+    'Bengali': [(0x0980, 0x09ff)],
+    'Gurmukhi': [(0x0a00, 0x0a7f)],
+    'Gujarati': [(0x0a80, 0x0aff)],
+    'Oriya': [(0x0b00, 0x0b7f)],
+    'Tamil': [(0x0b80, 0x0bff)],
+    'Telugu': [(0x0c00, 0x0c7f)],
+    'Kannada': [(0x0c80, 0x0cff)],
+    'Malayalam': [(0x0d00, 0x0d7f)],
+    'Sinhala': [(0x0d80, 0x0dff)],
+    'Thai': [(0x0e00, 0x0e7f)],
+    'Lao': [(0x0e80, 0x0eff)],
+    'Tibetan': [(0x0f00, 0x0fff)],
+    'Myanmar': [(0x1000, 0x109f)],
+    'Georgian': [(0x10a0, 0x10ff)],
+    'HangulJamo': [(0x1100, 0x11ff)],
+    'Ethiopic': [(0x1200, 0x137f)],
+    'Cherokee': [(0x13a0, 0x13ff)],
+    'UnifiedCanadianAboriginalSyllabics': [(0x1400, 0x167f)],
+    'Ogham': [(0x1680, 0x169f)],
+    'Runic': [(0x16a0, 0x16ff)],
+    'Khmer': [(0x1780, 0x17ff)],
+    'Mongolian': [(0x1800, 0x18af)],
+    'LatinExtendedAdditional': [(0x1e00, 0x1eff)],
+    'GreekExtended': [(0x1f00, 0x1fff)],
+    'GeneralPunctuation': [(0x2000, 0x206f)],
+    'SuperscriptsandSubscripts': [(0x2070, 0x209f)],
+    'CurrencySymbols': [(0x20a0, 0x20cf)],
+    'CombiningMarksforSymbols': [(0x20d0, 0x20ff)],
+    'LetterlikeSymbols': [(0x2100, 0x214f)],
+    'NumberForms': [(0x2150, 0x218f)],
+    'Arrows': [(0x2190, 0x21ff)],
+    'MathematicalOperators': [(0x2200, 0x22ff)],
+    'MiscellaneousTechnical': [(0x2300, 0x23ff)],
+    'ControlPictures': [(0x2400, 0x243f)],
+    'OpticalCharacterRecognition': [(0x2440, 0x245f)],
+    'EnclosedAlphanumerics': [(0x2460, 0x24ff)],
+    'BoxDrawing': [(0x2500, 0x257f)],
+    'BlockElements': [(0x2580, 0x259f)],
+    'GeometricShapes': [(0x25a0, 0x25ff)],
+    'MiscellaneousSymbols': [(0x2600, 0x26ff)],
+    'Dingbats': [(0x2700, 0x27bf)],
+    'BraillePatterns': [(0x2800, 0x28ff)],
+    'CJKRadicalsSupplement': [(0x2e80, 0x2eff)],
+    'KangxiRadicals': [(0x2f00, 0x2fdf)],
+    'IdeographicDescriptionCharacters': [(0x2ff0, 0x2fff)],
+    'CJKSymbolsandPunctuation': [(0x3000, 0x303f)],
+    'Hiragana': [(0x3040, 0x309f)],
+    'Katakana': [(0x30a0, 0x30ff)],
+    'Bopomofo': [(0x3100, 0x312f)],
+    'HangulCompatibilityJamo': [(0x3130, 0x318f)],
+    'Kanbun': [(0x3190, 0x319f)],
+    'BopomofoExtended': [(0x31a0, 0x31bf)],
+    'EnclosedCJKLettersandMonths': [(0x3200, 0x32ff)],
+    'CJKCompatibility': [(0x3300, 0x33ff)],
+    'CJKUnifiedIdeographsExtensionA': [(0x3400, 0x4db5)],
+    'CJKUnifiedIdeographs': [(0x4e00, 0x9fff)],
+    'YiSyllables': [(0xa000, 0xa48f)],
+    'YiRadicals': [(0xa490, 0xa4cf)],
+    'HangulSyllables': [(0xac00, 0xd7a3)],
+    'HighSurrogates': [(0xd800, 0xdb7f)],
+    'HighPrivateUseSurrogates': [(0xdb80, 0xdbff)],
+    'LowSurrogates': [(0xdc00, 0xdfff)],
+    'PrivateUse': [(0xe000, 0xf8ff), (0xf0000, 0xffffd),
+                   (0x100000, 0x10fffd)],
+    'CJKCompatibilityIdeographs': [(0xf900, 0xfaff)],
+    'AlphabeticPresentationForms': [(0xfb00, 0xfb4f)],
+    'ArabicPresentationForms-A': [(0xfb50, 0xfdff)],
+    'CombiningHalfMarks': [(0xfe20, 0xfe2f)],
+    'CJKCompatibilityForms': [(0xfe30, 0xfe4f)],
+    'SmallFormVariants': [(0xfe50, 0xfe6f)],
+    'ArabicPresentationForms-B': [(0xfe70, 0xfefe)],
+    'Specials': [(0xfeff, 0xfeff), (0xfff0, 0xfffd)],
+    'HalfwidthandFullwidthForms': [(0xff00, 0xffef)],
+    'OldItalic': [(0x10300, 0x1032f)],
+    'Gothic': [(0x10330, 0x1034f)],
+    'Deseret': [(0x10400, 0x1044f)],
+    'ByzantineMusicalSymbols': [(0x1d000, 0x1d0ff)],
+    'MusicalSymbols': [(0x1d100, 0x1d1ff)],
+    'MathematicalAlphanumericSymbols': [(0x1d400, 0x1d7ff)],
+    'CJKUnifiedIdeographsExtensionB': [(0x20000, 0x2a6d6)],
+    'CJKCompatibilityIdeographsSupplement': [(0x2f800, 0x2fa1f)],
+    'Tags': [(0xe0000, 0xe007f)],
+}
+
+### multi-character escapes
+
+# \i and \c use the NameStartChar and NameChar productions of XML 1.0
+# fifth edition, which XML Schema 1.1 also uses
+_name_start_chars = [
+    (0x3a, 0x3a), (0x41, 0x5a), (0x5f, 0x5f), (0x61, 0x7a),
+    (0xc0, 0xd6), (0xd8, 0xf6), (0xf8, 0x2ff), (0x370, 0x37d),
+    (0x37f, 0x1fff), (0x200c, 0x200d), (0x2070, 0x218f),
+    (0x2c00, 0x2fef), (0x3001, 0xd7ff), (0xf900, 0xfdcf),
+    (0xfdf0, 0xfffd), (0x10000, 0xeffff),
+]
+
+_name_chars = _normalize(_name_start_chars + [
+    (0x2d, 0x2e), (0x30, 0x39), (0xb7, 0xb7), (0x300, 0x36f),
+    (0x203f, 0x2040),
+])
+
+_space_chars = [(0x9, 0xa), (0xd, 0xd), (0x20, 0x20)]
+
+def _multi_char_esc(c):
+    """Return the ranges of the escape \\`c`"""
+    if c == 's':
+        return _space_chars
+    elif c == 'i':
+        return _clip(_name_start_chars)
+    elif c == 'c':
+        return _clip(_name_chars)
+    elif c == 'd':
+        return _get_categories().get('Nd', [])
+    else: # 'w'
+        cats = _get_categories()
+        return _complement(_normalize(
+            cats.get('P', []) + cats.get('Z', []) + cats.get('C', [])))
+
+_single_char_esc = {'n': u'\n', 'r': u'\r', 't': u'\t'}
+
+def _single_esc_char(c):
+    """Return the character that \\`c` stands for, or None"""
+    try:
+        return _single_char_esc[c]
+    except KeyError:
+        pass
+    # XML Schema only allows \\, \|, \., \-, \^, \?, \*, \+, \{, \}, \(,
+    # \), \[ and \], but libxml2 accepts any escaped punctuation
+    # character, and such patterns are used in modules
+    if c in string.punctuation:
+        return c
+    return None
+
+_atom_special = u'.^$*+?{}[]\\|()'
+
+class _Parser(object):
+    """Recursive descent parser for XML Schema regular expressions.
+
+    If `emit` is False, the pattern is only checked, and parse() returns
+    None."""
+
+    def __init__(self, pattern, emit):
+        self.s = pattern
+        self.pos = 0
+        self.emit = emit
+
+    def error(self, msg, pos=None):
+        if pos is None:
+            pos = self.pos
+        raise XSDRegexError(msg, self.s, pos)
+
+    def peek(self):
+        if self.pos < len(self.s):
+            return self.s[self.pos]
+        return None
+
+    def parse(self):
+        res = self.regexp()
+        if self.pos < len(self.s):
+            # only a ')' can end a regexp early
+            self.error('unbalanced parenthesis')
+        return res
+
+    def regexp(self):
+        branches = [self.branch()]
+        while self.peek() == '|':
+            self.pos += 1
+            branches.append(self.branch())
+        if self.emit:
+            return u'|'.join(branches)
+
+    def branch(self):
+        pieces = []
+        while True:
+            c = self.peek()
+            if c is None or c == '|' or c == ')':
+                break
+            atom = self.atom()
+            quant = self.quantifier()
+            if self.emit:
+                pieces.append(atom + quant)
+        if self.emit:
+            return u''.join(pieces)
+
+    def quantifier(self):
+        c = self.peek()
+        if c in ('?', '*', '+'):
+            self.pos += 1
+            return c
+        if c != '{':
+            return u''
+        start = self.pos
+        self.pos += 1
+        lo = self.quantity()
+        if lo is None:
+            self.error('bad quantifier', start)
+        hi = lo
+        if self.peek() == ',':
+            self.pos += 1
+            hi = self.quantity()
+        if self.peek() != '}':
+            self.error('bad quantifier', start)
+        self.pos += 1
+        if hi is not None and hi < lo:
+            self.error('bad quantifier range', start)
+        if hi is None:
+            return u'{%d,}' % lo
+        elif hi == lo:
+            return u'{%d}' % lo
+        else:
+            return u'{%d,%d}' % (lo, hi)
+
+    def quantity(self):
+        start = self.pos
+        while self.peek() is not None and self.peek() in '0123456789':
+            self.pos += 1
+        if start == self.pos:
+            return None
+        return int(self.s[start:self.pos])
+
+    def atom(self):
+        c = self.peek()
+        if c == '(':
+            start = self.pos
+            self.pos += 1
+            res = self.regexp()
+            if self.peek() != ')':
+                self.error('unbalanced parenthesis', start)
+            self.pos += 1
+            if self.emit:
+                return u'(?:' + res + u')'
+            return None
+        elif c == '[':
+            ranges = self.char_class_expr()
+        elif c == '.':
+            self.pos += 1
+            return u'[^\n\r]'
+        elif c == '\\':
+            ranges = self.escape(False)
+        elif c in '?*+{':
+            self.error('quantifier without an atom')
+        elif c in ']}':
+            self.error('unescaped "%s"' % c)
+        else:
+            self.pos += 1
+            if c in _atom_special:
+                return u'\\' + c
+            return c
+        if self.emit:
+            if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+                c = _chr(ranges[0][0])
+                if c in _atom_special:
+                    return u'\\' + c
+                return c
+            return _set_to_re(ranges)
+        return None
+
+    def escape(self, single_only):
+        """Parse an escape.
+
+        Returns a character if `single_only` is True, otherwise
+        the ranges of the escaped characters."""
+        start = self.pos
+        self.pos += 1
+        c = self.peek()
+        if c is None:
+            self.error('incomplete escape', start)
+        self.pos += 1
+        ch = _single_esc_char(c)
+        if ch is not None:
+            if single_only:
+                return ch
+            if self.emit:
+                return [(ord(ch), ord(ch))]
+            return None
+        if single_only:
+            self.error('a character class escape cannot be used here', start)
+        if c in 'sicdw':
+            if self.emit:
+                return _multi_char_esc(c)
+            return None
+        elif c in 'SICDW':
+            if self.emit:
+                return _complement(_multi_char_esc(c.lower()))
+            return None
+        elif c in 'pP':
+            ranges = self.char_prop(start)
+            if c == 'P' and self.emit:
+                return _complement(ranges)
+            return ranges
+        else:
+            self.error('unknown escape "\\%s"' % c, start)
+
+    def char_prop(self, start):
+        if self.peek() != '{':
+            self.error('expected "{" after "\\p"', start)
+        end = self.s.find('}', self.pos)
+        if end == -1:
+            self.error('missing "}" after "\\p"', start)
+        name = self.s[self.pos + 1:end]
+        self.pos = end + 1
+        if name.startswith('Is'):
+            block = _blocks.get(name[2:])
+            if block is None:
+                self.error('unknown block name "%s"' % name, start)
+            if self.emit:
+                return _clip(block)
+            return None
+        if name not in _category_names:
+            self.error('unknown character category "%s"' % name, start)
+        if self.emit:
+            return _get_categories().get(name, [])
+        return None
+
+    def char_class_expr(self):
+        """Parse a character class expression [...]"""
+        start = self.pos
+        self.pos += 1
+        negate = False
+        if self.peek() == '^':
+            self.pos += 1
+            negate = True
+        ranges = []
+        first = True
+        while True:
+            c = self.peek()
+            if c is None:
+                self.error('unterminated character class', start)
+            if c == ']':
+                if first:
+                    self.error('empty character class', start)
+                self.pos += 1
+                break
+            if c == '-' and not first:
+                if self.s[self.pos + 1:self.pos + 2] == '[':
+                    # character class subtraction
+                    self.pos += 1
+                    subtracted = self.char_class_expr()
+                    if self.peek() != ']':
+                        self.error('expected "]" after a subtraction')
+                    self.pos += 1
+                    if self.emit:
+                        ranges = self.class_ranges(ranges, negate)
+                        return _subtract(ranges, subtracted)
+                    return None
+                # XSD requires "\-" here, but a "-" that does not start
+                # a range is taken literally, as libxml2 does, so that
+                # e.g. [\w-_] and [a-z0-9-_.] can be used
+            self.char_range(ranges, first)
+            first = False
+        if self.emit:
+            return self.class_ranges(ranges, negate)
+        return None
+
+    def class_ranges(self, ranges, negate):
+        ranges = _normalize(ranges)
+        if negate:
+            return _complement(ranges)
+        return ranges
+
+    def char_range(self, ranges, first):
+        """Parse a character, a range or an escape in a character class,
+        and add it to `ranges`"""
+        start = self.pos
+        c = self.peek()
+        if c == '\\':
+            nxt = self.s[self.pos + 1:self.pos + 2]
+            if _single_esc_char(nxt) is None:
+                res = self.escape(False)
+                if self.emit:
+                    ranges.extend(res)
+                return
+            lo = self.escape(True)
+        elif c == '[':
+            self.error('unescaped "[" in character class')
+        else:
+            self.pos += 1
+            lo = c
+        if (self.peek() == '-' and
+            self.s[self.pos + 1:self.pos + 2] not in ('[', ']', '')):
+            # a range
+            if c == '-' and first:
+                self.error('unescaped "-" in character class', start)
+            self.pos += 1
+            c = self.peek()
+            if c == '\\':
+                hi = self.escape(True)
+            elif c == '[':
+                self.error('unescaped "[" in character class')
+            else:
+                self.pos += 1
+                hi = c
+            if ord(hi) < ord(lo):
+                self.error('bad character range', start)
+            ranges.append((ord(lo), ord(hi)))
+        else:
+            ranges.append((ord(lo), ord(lo)))
+
+class _Analyzer(_Parser):
+    """Parser that finds the characters used by a valid pattern.
+
+    parse() returns the set of characters that occur in all strings
+    that match the pattern, and the ranges of all characters that can
+    occur in them are collected in `chars`."""
+
+    def __init__(self, pattern):
+        _Parser.__init__(self, pattern, True)
+        self.chars = []
+
+    def regexp(self):
+        required = self.branch()
+        while self.peek() == '|':
+            self.pos += 1
+            required = required & self.branch()
+        return required
+
+    def branch(self):
+        required = set()
+        while True:
+            c = self.peek()
+            if c is None or c == '|' or c == ')':
+                return required
+            atom = self.atom()
+            quant = self.quantifier()
+            if quant not in ('?', '*') and not quant.startswith('{0'):
+                required |= atom
+
+    def atom(self):
+        c = self.peek()
+        if c == '(':
+            self.pos += 1
+            required = self.regexp()
+            self.pos += 1
+            return required
+        elif c == '[':
+            ranges = self.char_class_expr()
+        elif c == '.':
+            self.pos += 1
+            ranges = _complement([(0xa, 0xa), (0xd, 0xd)])
+        elif c == '\\':
+            ranges = self.escape(False)
+        else:
+            self.pos += 1
+            ranges = [(ord(c), ord(c))]
+        self.chars.extend(ranges)
+        if len(ranges) == 1 and ranges[0][0] == ranges[0][1]:
+            return set([_chr(ranges[0][0])])
+        return set()
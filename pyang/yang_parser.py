@@ -2,7 +2,8 @@
 
 The parser does not check any keywords or grammar.
 """
-import collections
+import io
+import re
 import sys
 from . import error
 from . import util
@@ -13,7 +14,7 @@ class YangTokenizer(object):
     def __init__(self, text, pos, errors,
                  max_line_len=None, keep_comments=False,
                  strict_quoting = False):
-        self.lines = collections.deque(text.splitlines(True))
+        self.lines = iter(text.splitlines(True))
         self.pos = pos
         self.buf = ''
         self.offset = 0
@@ -32,9 +33,10 @@ class YangTokenizer(object):
         self.strict_quoting = strict_quoting
 
     def readline(self):
-        if len(self.lines) == 0:
+        try:
+            self.buf = next(self.lines)
+        except StopIteration:
             raise error.Eof
-        self.buf = self.lines.popleft()
         self.pos.line += 1
         self.offset = 0
         if self.max_line_len is not None:
@@ -268,7 +270,368 @@ class YangTokenizer(object):
                     return [(res, '')]
                 i = i + 1
 
+class _ChunkReader(io.RawIOBase):
+    """Raw binary stream that reads from an iterator of byte strings"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.chunk = b''
+        self.offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while self.offset >= len(self.chunk):
+            try:
+                self.chunk = next(self.chunks)
+            except StopIteration:
+                return 0
+            self.offset = 0
+        n = min(len(b), len(self.chunk) - self.offset)
+        b[:n] = self.chunk[self.offset:self.offset + n]
+        self.offset += n
+        return n
+
+def iter_lines(fd, encoding='utf-8', chunk_size=65536):
+    """Return an iterator over the lines of the text in `fd`.
+
+    `fd` is a binary file object, or an iterable of byte strings.  It
+    is read and decoded as the lines are needed.  The lines are the
+    same as text.splitlines(True), where text is the result of
+    io.open(filename, encoding=`encoding`).read().  Raises
+    UnicodeDecodeError if the text cannot be decoded.
+    """
+    if hasattr(fd, 'read'):
+        chunks = iter(lambda: fd.read(chunk_size), b'')
+    else:
+        chunks = fd
+    # the wrapper closes the _ChunkReader, but not `fd`
+    text = io.TextIOWrapper(io.BufferedReader(_ChunkReader(chunks)),
+                            encoding=encoding)
+    for line in text:
+        # str.splitlines() splits at more characters than '\n'
+        for l in line.splitlines(True):
+            yield l
+
+# the line boundaries used by str.splitlines()
+_re_line_end = re.compile(u'\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+_re_non_space = re.compile(r'\S', re.UNICODE)
+_re_unquoted_end = re.compile(r'[\s;{}]|//|/\*|\*/', re.UNICODE)
+_re_dquote_special = re.compile(r'["\\]')
+
+class YangOffsetTokenizer(object):
+    """Tokenizer that scans the text with an offset.
+
+    Returns the same tokens and reports the same errors as
+    YangTokenizer, which keeps the current line in a buffer and slices
+    off each token, but without copying the rest of the line for each
+    token.  Lines are only found as the offset moves into them, and
+    the text is only scanned up to the end of the current line, so
+    that a subclass can replace `text` when it reads the next line.
+    """
+
+    def __init__(self, text, pos, errors,
+                 max_line_len=None, keep_comments=False,
+                 strict_quoting = False):
+        self.text = text
+        self.pos = pos
+        self.i = 0
+        """Offset of the next character in text."""
+        self.line_start = 0
+        self.line_end = 0
+        """Offset after the current line, including its line break."""
+        self.line_adjust = 0
+        """Number of characters removed from the start of the line
+        in a multi-line comment, which are not counted in `offset`."""
+
+        self.max_line_len = max_line_len
+        if self.max_line_len == 0:
+            self.max_line_len = None
+        self.keep_comments = keep_comments
+        self.errors = errors
+        self.is_1_1 = False
+        self.strict_quoting = strict_quoting
+
+    @property
+    def offset(self):
+        """Position on line.  Used to remove leading whitespace from strings."""
+        return self.i - self.line_start - self.line_adjust
+
+    def readline(self):
+        """Move to the start of the next line"""
+        text = self.text
+        if self.line_end >= len(text):
+            raise error.Eof
+        start = self.line_end
+        m = _re_line_end.search(text, start)
+        if m is None:
+            end = len(text)
+        else:
+            end = m.end()
+        self.i = self.line_start = start
+        self.line_end = end
+        self.line_adjust = 0
+        self.pos.line += 1
+        self.check_line_len()
+
+    def check_line_len(self):
+        if self.max_line_len is not None:
+            text = self.text
+            end = self.line_end
+            curlen = end - self.line_start
+            if curlen >= 1 and text[end-1] == '\n':
+                if curlen >= 2 and text[end-2] == '\r':
+                    curlen -= 2
+                else:
+                    curlen -= 1
+            if curlen > self.max_line_len:
+                error.err_add(self.errors, self.pos, 'LONG_LINE',
+                              (curlen, self.max_line_len))
+
+    def skip(self, keep_comments=False):
+        """Skip whitespace and count position"""
+        while True:
+            m = _re_non_space.search(self.text, self.i, self.line_end)
+            if m is None:
+                self.readline()
+                continue
+            self.i = m.start()
+            # do not keep comments in the syntax tree
+            text = self.text
+            if keep_comments or text[self.i] != '/':
+                return
+            nextc = text[self.i+1:self.i+2]
+            if nextc == '/':
+                # skip line comment
+                self.readline()
+            elif nextc == '*':
+                # skip block comment
+                i = text.find('*/', self.i, self.line_end)
+                while i == -1:
+                    self.readline()
+                    i = self.text.find('*/', self.i, self.line_end)
+                self.i = i + 2
+            else:
+                return
+
+    def get_comment(self, last_line):
+        """ret: string()"""
+        is_multi_line = False
+        is_line_end = False
+        self.skip(keep_comments=True)
+        offset = self.offset
+        text = self.text
+        m = syntax.re_comment.match(text, self.i, self.line_end)
+        if m is None:
+            return None, is_line_end, is_multi_line
+        else:
+            cmt = m.group(0)
+            self.i = m.end()
+            is_line_end = (last_line == self.pos.line)
+            # look for a multiline comment
+            if cmt[:2] == '/*' and cmt[-2:] != '*/':
+                i = text.find('*/', self.i, self.line_end)
+                is_multi_line = True
+                while i == -1:
+                    self.readline()
+                    text = self.text
+                    # remove at most the same number of whitespace as
+                    # the comment start was indented
+                    start = self.line_start
+                    end = self.line_end
+                    j = start
+                    while (j - start < offset and j < end and
+                           text[j].isspace()):
+                        j = j + 1
+                    self.line_adjust = j - start
+                    cmt += '\n' + text[j:end].replace('\n','')
+                    i = text.find('*/', j, end)
+                self.i = i + 2
+            return cmt, is_line_end, is_multi_line
+
+    def get_keyword(self):
+        """ret: identifier | (prefix, identifier)"""
+        self.skip()
+
+        text = self.text
+        m = syntax.re_keyword.match(text, self.i, self.line_end)
+        if m is None:
+            error.err_add(self.errors, self.pos,
+                          'SYNTAX_ERROR',
+                          'illegal keyword: ' + text[self.i:self.line_end])
+            raise error.Abort
+        else:
+            i = self.i = m.end()
+            # check the separator
+            c = text[i:i+1]
+            if (c.isspace() or
+                (c == '/' and text[i+1:i+2] in ('/', '*')) or
+                (c in (';','{'))):
+                pass
+            else:
+                error.err_add(self.errors, self.pos,
+                              'SYNTAX_ERROR', 'expected separator, got: "' +
+                              text[i:min(i+6, self.line_end)] + '..."')
+                raise error.Abort
+
+            if m.group(2) is None: # no prefix
+                return m.group(3)
+            else:
+                return (m.group(2), m.group(3))
+
+    def peek(self):
+        """Return next real character in input stream.
+
+        Skips whitespace and comments, and returns next character
+        without consuming it.  Use skip_tok() to consume the characater.
+        """
+        self.skip(self.keep_comments)
+        return self.text[self.i]
+
+    def skip_tok(self):
+        self.skip(self.keep_comments)
+        self.i += 1
+
+    def get_strings(self, need_quote=False):
+        """ret: string"""
+        self.skip()
+
+        text = self.text
+        c = text[self.i]
+        if c == ';' or c == '{' or c == '}':
+            error.err_add(self.errors, self.pos, 'EXPECTED_ARGUMENT', c)
+            raise error.Abort
+        if c == '"' or c == "'":
+            # see YangTokenizer.get_strings(); the offsets are absolute,
+            # and `bufstart` is the start of its buffer
+            quote_char = c
+            strs = []
+            res = []
+            indentpos = self.offset
+            bufstart = self.i
+            i = self.i + 1
+            while True:
+                end = self.line_end
+                start = i
+                while i < end:
+                    if quote_char == '"':
+                        m = _re_dquote_special.search(text, i, end)
+                        i = end if m is None else m.start()
+                    else:
+                        i = text.find(quote_char, i, end)
+                        if i == -1:
+                            i = end
+                    if i == end:
+                        break
+                    if text[i] == quote_char:
+                        # end-of-string; copy the text to output
+                        res.append(text[start:i])
+                        strs.append((u''.join(res), quote_char))
+                        self.i = i + 1
+                        # check for '+' operator
+                        self.skip()
+                        if self.text[self.i] == '+':
+                            self.i += 1
+                            self.skip()
+                            nstrs = self.get_strings(need_quote=True)
+                            strs.extend(nstrs)
+                        return strs
+                    elif i < end - 1:
+                        # check for special characters
+                        special = None
+                        nextc = text[i+1]
+                        if nextc == 'n':
+                            special = '\n'
+                        elif nextc == 't':
+                            special = '\t'
+                        elif nextc == '\"':
+                            special = '\"'
+                        elif nextc == '\\':
+                            special = '\\'
+                        elif self.strict_quoting and self.is_1_1:
+                            error.err_add(self.errors, self.pos,
+                                          'ILLEGAL_ESCAPE', nextc)
+                            raise error.Abort
+                        elif self.strict_quoting:
+                            error.err_add(self.errors, self.pos,
+                                          'ILLEGAL_ESCAPE_WARN', nextc)
+                        if special is not None:
+                            res.append(text[start:i])
+                            res.append(special)
+                            i = i + 1
+                            start = i + 1
+                    i = i + 1
+                # end-of-line
+                # first strip trailing whitespace in double quoted strings
+                if i - bufstart > 2 and text[i-2] == '\r':
+                    j = i - 3
+                else:
+                    j = i - 2
+                k = j
+                while j >= bufstart and text[j].isspace():
+                    j = j - 1
+                if j != k: # we found trailing whitespace
+                    res.append(text[start:j+1] + text[k+1:i])
+                else:
+                    res.append(text[start:i])
+                self.readline()
+                text = self.text
+                bufstart = i = self.line_start
+                indent = 0
+                if quote_char == '"':
+                    # skip whitespace used for indentation
+                    end = self.line_end
+                    while (i < end and text[i].isspace() and
+                           indent <= indentpos):
+                        if text[i] == '\t':
+                            indent = indent + 8
+                        else:
+                            indent = indent + 1
+                        i = i + 1
+                    if indent > indentpos + 1:
+                        res.append(' ' * (indent - indentpos - 1))
+                    elif i == end:
+                        # whitespace only on this line; keep it as is
+                        i = bufstart
+        elif need_quote is True:
+            error.err_add(self.errors, self.pos, 'EXPECTED_QUOTED_STRING', ())
+            raise error.Abort
+        else:
+            # unquoted string
+            m = _re_unquoted_end.search(text, self.i, self.line_end)
+            i = self.line_end if m is None else m.start()
+            res = text[self.i:i]
+            self.i = i
+            return [(res, '')]
+
+class YangStreamTokenizer(YangOffsetTokenizer):
+    """Tokenizer that reads the lines one by one from an iterator,
+    e.g., as returned by iter_lines().  `text` is the current line."""
+
+    def __init__(self, lines, pos, errors,
+                 max_line_len=None, keep_comments=False,
+                 strict_quoting = False):
+        YangOffsetTokenizer.__init__(self, u'', pos, errors, max_line_len,
+                                     keep_comments, strict_quoting)
+        self.lines = iter(lines)
+
+    def readline(self):
+        try:
+            self.text = next(self.lines)
+        except StopIteration:
+            raise error.Eof
+        self.i = self.line_start = 0
+        self.line_end = len(self.text)
+        self.line_adjust = 0
+        self.pos.line += 1
+        self.check_line_len()
+
 class YangParser(object):
+    tokenizer_class = YangOffsetTokenizer
+    """The tokenizer used by parse(); YangOffsetTokenizer or
+    YangTokenizer."""
+
     def __init__(self, extra=None):
         pass
 
@@ -277,15 +640,27 @@ class YangParser(object):
 
         Return a Statement on success or None on failure
         """
+        return self._parse(ctx, ref, self.tokenizer_class, text)
+
+    def parse_lines(self, ctx, ref, lines):
+        """Parse a YANG statement from `lines`, an iterator over the
+        lines of the text, e.g., as returned by iter_lines().
+
+        The lines are read as they are parsed, so the whole text is
+        never kept in memory.
+        Return a Statement on success or None on failure
+        """
+        return self._parse(ctx, ref, YangStreamTokenizer, lines)
 
+    def _parse(self, ctx, ref, tokenizer_class, text):
         self.ctx = ctx
         self.pos = error.Position(ref)
         self.last_line = 0
         self.top = None
         try:
-            self.tokenizer = YangTokenizer(text, self.pos, ctx.errors,
-                                           ctx.max_line_len, ctx.keep_comments,
-                                           not ctx.lax_quote_checks)
+            self.tokenizer = tokenizer_class(
+                text, self.pos, ctx.errors, ctx.max_line_len,
+                ctx.keep_comments, not ctx.lax_quote_checks)
             stmt = self._parse_statement(None)
         except error.Abort:
             return None
@@ -358,6 +733,116 @@ class YangParser(object):
         self.last_line = self.pos.line
         return stmt
 
+class YangHeader(object):
+    """The header of a module, as returned by scan_header()"""
+
+    def __init__(self, keyword, name):
+        self.keyword = keyword
+        """'module' or 'submodule'"""
+
+        self.name = name
+        """the name of the (sub)module"""
+
+        self.revision = 'unknown'
+        """the latest revision, as returned by util.get_latest_revision()"""
+
+        self.belongs_to = None
+        """the name of the module a submodule belongs to"""
+
+        self.imports = []
+        """list of (modulename, revision-date | None)"""
+
+        self.includes = []
+        """list of (submodulename, revision-date | None)"""
+
+_header_keywords = {
+    'yang-version': True,
+    'namespace': True,
+    'prefix': True,
+    'belongs-to': True,
+    'import': True,
+    'include': True,
+    'organization': True,
+    'contact': True,
+    'description': True,
+    'reference': True,
+    'revision': True,
+}
+
+def scan_header(ref, text):
+    """Scan the header of the YANG module in `text`, without parsing it.
+
+    Only the statements up to the first body statement are read.  The
+    statements' arguments are tokenized as in a real parse, so comments
+    and strings are handled correctly.
+
+    Return a YangHeader, or None if the header could not be scanned,
+    in which case the module should be parsed normally to get the
+    proper error messages.
+    """
+    tokenizer = YangParser.tokenizer_class(text, error.Position(ref), [])
+
+    def get_arg():
+        tok = tokenizer.peek()
+        if tok == '{' or tok == ';':
+            return None
+        return u''.join([a[0] for a in tokenizer.get_strings()])
+
+    def get_substmts():
+        """Return list of (keyword, arg) for the substatements"""
+        res = []
+        tok = tokenizer.peek()
+        if tok == ';':
+            tokenizer.skip_tok()
+            return res
+        if tok != '{':
+            raise error.Abort
+        tokenizer.skip_tok()
+        while tokenizer.peek() != '}':
+            keywd = tokenizer.get_keyword()
+            res.append((keywd, get_arg()))
+            get_substmts()
+        tokenizer.skip_tok()
+        return res
+
+    try:
+        keywd = tokenizer.get_keyword()
+        if keywd not in ('module', 'submodule'):
+            return None
+        header = YangHeader(keywd, get_arg())
+        if header.name is None or tokenizer.peek() != '{':
+            return None
+        tokenizer.skip_tok()
+        revisions = []
+        while tokenizer.peek() != '}':
+            keywd = tokenizer.get_keyword()
+            if not util.is_prefixed(keywd) and keywd not in _header_keywords:
+                # first body statement; the header is done
+                break
+            arg = get_arg()
+            if keywd == 'import' or keywd == 'include':
+                revdate = None
+                for (k, a) in get_substmts():
+                    if k == 'revision-date':
+                        revdate = a
+                if keywd == 'import':
+                    header.imports.append((arg, revdate))
+                else:
+                    header.includes.append((arg, revdate))
+            else:
+                get_substmts()
+                if keywd == 'revision':
+                    revisions.append(arg)
+                elif keywd == 'belongs-to':
+                    header.belongs_to = arg
+    except (error.Abort, error.Eof):
+        return None
+    if None in revisions:
+        return None
+    if revisions:
+        header.revision = max(revisions)
+    return header
+
 # FIXME: tmp debug
 def ppkeywd(tok):
     if util.is_prefixed(tok):
@@ -85,6 +85,7 @@ setup(name='pyang',
       distclass=PyangDist,
       scripts=script_files,
       packages=['pyang', 'pyang.plugins', 'pyang.translators'],
+      package_data={'pyang': ['stdlib.snapshot']},
       data_files=[
             ('share/man/man1', man1),
             ('share/yang/modules/iana', modules_iana),
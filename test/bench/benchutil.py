@@ -0,0 +1,64 @@
+"""Helpers shared by the benchmarks"""
+
+import gc
+import io
+import optparse
+import os
+import sys
+import time
+
+import pyang
+from pyang import plugin
+
+_opts = []
+
+def default_opts():
+    """Return the default values of all plugin options"""
+    if _opts:
+        return _opts[0]
+    optparser = optparse.OptionParser()
+    plugin.init([])
+    for p in plugin.plugins:
+        p.add_opts(optparser)
+    (opts, _args) = optparser.parse_args([])
+    _opts.append(opts)
+    return opts
+
+def load(dirs, **attrs):
+    """Return a Context where the .yang files in `dirs` are validated.
+    `attrs` are set on the Context before the modules are added."""
+    sys.setrecursionlimit(10000)
+    path = os.pathsep.join(dirs)
+    ctx = pyang.Context(pyang.FileRepository(path, use_env=False))
+    ctx.opts = default_opts()
+    for (name, value) in attrs.items():
+        setattr(ctx, name, value)
+    for d in dirs:
+        for fname in sorted(os.listdir(d)):
+            if fname.endswith('.yang'):
+                filename = os.path.join(d, fname)
+                with io.open(filename, 'r', encoding='utf-8') as fd:
+                    ctx.add_module(filename, fd.read())
+    ctx.validate()
+    return ctx
+
+def timed(f, *args, **kwargs):
+    """Return the result of f(*args, **kwargs) and the time it took"""
+    start = time.time()
+    res = f(*args, **kwargs)
+    return (res, time.time() - start)
+
+def measure(f, *args, **kwargs):
+    """Return the result of f(*args, **kwargs), the time it took and the
+    memory still allocated afterwards"""
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    (res, t) = timed(f, *args, **kwargs)
+    gc.collect()
+    (size, _peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (res, t, size)
+
+def mb(size):
+    return size / 1048576.0
@@ -0,0 +1,14 @@
+"""Print the memory used by the modules in the given directories, with
+and without Context.compact_statements"""
+
+import sys
+
+import benchutil
+
+dirs = sys.argv[1:]
+(_ctx, _t, size) = benchutil.measure(benchutil.load, dirs)
+(_ctx, _t, csize) = benchutil.measure(benchutil.load, dirs,
+                                      compact_statements=True)
+print('compact: default %.1f MB, compact %.1f MB (%.0f%% less)' %
+      (benchutil.mb(size), benchutil.mb(csize),
+       100.0 * (size - csize) / size))
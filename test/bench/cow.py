@@ -0,0 +1,15 @@
+"""Print the time and memory used to validate the modules in the given
+directories, with and without Context.copy_on_write_uses"""
+
+import sys
+
+import benchutil
+
+dirs = sys.argv[1:]
+(_ctx, t, size) = benchutil.measure(benchutil.load, dirs)
+(_ctx, ct, csize) = benchutil.measure(benchutil.load, dirs,
+                                      copy_on_write_uses=True)
+print('copy-on-write: default %.2fs %.1f MB, copy-on-write %.2fs %.1f MB '
+      '(%.0f%% less)' %
+      (t, benchutil.mb(size), ct, benchutil.mb(csize),
+       100.0 * (size - csize) / size))
@@ -0,0 +1,35 @@
+"""Print the time used to validate a module with a large enumeration,
+and to validate all its names"""
+
+import benchutil
+import pyang
+
+def module_text(n):
+    enums = ''.join('      enum alarm-%d { value %d; }\n' % (i, 3 * i)
+                    for i in range(n))
+    return u'''module e {
+  namespace "urn:e";
+  prefix e;
+
+  leaf b {
+    type enumeration {
+%s    }
+    default alarm-%d;
+  }
+}
+''' % (enums, n - 1)
+
+def load(n):
+    ctx = pyang.Context(pyang.FileRepository('.', use_env=False))
+    m = ctx.add_module('e.yang', module_text(n))
+    ctx.validate()
+    return (ctx, m)
+
+n = 3000
+((ctx, m), t) = benchutil.timed(load, n)
+spec = m.search_one('leaf', 'b').search_one('type').i_type_spec
+names = ['alarm-%d' % i for i in range(n)]
+(_res, vt) = benchutil.timed(spec.validate_many, ctx.errors, None, names,
+                             None)
+print('enums: %d enums: validate the module %.2fs, %d values %.3fs' %
+      (n, t, n, vt))
@@ -0,0 +1,21 @@
+"""Print the time used to add many errors to a list and to an
+error.ErrorList"""
+
+import benchutil
+from pyang import error
+
+def add_all(errors, adds):
+    for (pos, tag, args) in adds:
+        error.err_add(errors, pos, tag, args)
+    return errors
+
+n = 20000
+adds = []
+# a unique line for each error, as with many lint warnings
+for i in range(n):
+    pos = error.Position('f.yang')
+    pos.line = i
+    adds.append((pos, 'UNUSED_TYPEDEF', 'x'))
+(_errors, t) = benchutil.timed(add_all, [], adds)
+(_errors, et) = benchutil.timed(add_all, error.ErrorList(), adds)
+print('errlist: %d errors: list %.2fs, ErrorList %.3fs' % (n, t, et))
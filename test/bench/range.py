@@ -0,0 +1,26 @@
+"""Print the time used to validate many values against a restriction
+with many ranges, with validate() and validate_many()"""
+
+import random
+
+import benchutil
+from pyang import error
+from pyang import types
+
+def validate_all(spec, pos, vals):
+    for v in vals:
+        spec.validate([], pos, v, None)
+
+n = 100000
+rnd = random.Random(7)
+base = types.IntTypeSpec('uint16', 0, 65535)
+pos = error.Position('range.py')
+bounds = sorted(rnd.sample(range(1, 65535), 400))
+ranges = [(bounds[i], bounds[i + 1]) for i in range(0, 400, 2)]
+spec = types.RangeTypeSpec(base, (ranges, pos))
+vals = [rnd.randint(0, 65535) for _ in range(n)]
+(_res, t) = benchutil.timed(validate_all, spec, pos, vals)
+(_res, mt) = benchutil.timed(spec.validate_many, error.ErrorList(), pos,
+                             vals, None)
+print('range: 200 ranges, %d values: validate %.3fs, validate_many %.3fs' %
+      (n, t, mt))
@@ -0,0 +1,18 @@
+"""Print the time used to compile an XML Schema pattern and to match
+many values against it"""
+
+import benchutil
+from pyang import xsd_regex
+
+def match_all(pattern, values):
+    for v in values:
+        xsd_regex.match(pattern, v)
+
+n = 100000
+pattern = (u'(([0-1]?[0-9]?[0-9]|2[0-4][0-9]|25[0-5])\\.){3}'
+           u'([0-1]?[0-9]?[0-9]|2[0-4][0-9]|25[0-5])'
+           u'(%[\\p{N}\\p{L}]+)?')
+values = [u'10.0.%d.%d%%eth0' % (i // 256 % 256, i % 256) for i in range(n)]
+(_res, t) = benchutil.timed(xsd_regex.compile, pattern)
+(_res, mt) = benchutil.timed(match_all, pattern, values)
+print('regex: compile %.3fs, %d matches %.3fs' % (t, n, mt))
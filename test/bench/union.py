@@ -0,0 +1,46 @@
+"""Print the time used to validate values of inet:host, with and without
+the lexical tests of the union member types"""
+
+import benchutil
+import pyang
+
+module_text = u'''module u {
+  namespace "urn:u";
+  prefix u;
+
+  import ietf-inet-types { prefix inet; }
+
+  leaf host {
+    type inet:host;
+  }
+}
+'''
+
+def validate_all(s, vals):
+    return [s.validate([], None, v, None) for v in vals]
+
+def without_tests(s):
+    """Remove the lexical tests of the member types of `s`, and of the
+    unions in them"""
+    members = s.members
+    s.members = [(t.i_type_spec, None) for t in s.types]
+    for (t, _test) in members:
+        if t is not None and t.name == 'union':
+            without_tests(t)
+
+n = 30000
+repo = pyang.FileRepository('../../modules/ietf', use_env=False)
+ctx = pyang.Context(repo)
+m = ctx.add_module('u.yang', module_text)
+ctx.validate()
+s = m.search_one('leaf', 'host').search_one('type').i_type_spec
+vals = (['10.1.%d.%d' % (i // 256 % 256, i % 256) for i in range(n)] +
+        ['fe80::%x' % i for i in range(n)] +
+        ['host-%d.example.com' % i for i in range(n)])
+# compile the patterns
+validate_all(s, vals[::n])
+(_res, t) = benchutil.timed(validate_all, s, vals)
+without_tests(s)
+(_res, wt) = benchutil.timed(validate_all, s, vals)
+print('union: %d values: %.2fs, without the lexical tests %.2fs' %
+      (len(vals), t, wt))
@@ -0,0 +1,52 @@
+"""Validate the modules in the given directories, with and without
+Context.compact_statements, and print whether the errors and the tree
+output are the same."""
+
+import io
+import optparse
+import os
+import sys
+
+import pyang
+from pyang import error
+from pyang import plugin
+from pyang.plugins import tree
+
+def load(dirs, opts, compact):
+    path = os.pathsep.join(dirs)
+    ctx = pyang.Context(pyang.FileRepository(path, use_env=False))
+    ctx.opts = opts
+    ctx.compact_statements = compact
+    for d in dirs:
+        for fname in sorted(os.listdir(d)):
+            if fname.endswith('.yang'):
+                filename = os.path.join(d, fname)
+                with io.open(filename, 'r', encoding='utf-8') as fd:
+                    ctx.add_module(filename, fd.read())
+    ctx.validate()
+    return ctx
+
+def output(ctx):
+    """Return the errors, and the tree output for all modules"""
+    fd = io.StringIO()
+    for (pos, tag, args) in ctx.errors:
+        fd.write(u'%s: %s\n' % (pos, error.err_to_str(tag, args)))
+    modules = [ctx.modules[key] for key in sorted(ctx.modules)]
+    tree.emit_tree(ctx, modules, fd, None, None, None)
+    return fd.getvalue()
+
+def main():
+    sys.setrecursionlimit(10000)
+    optparser = optparse.OptionParser()
+    plugin.init([])
+    for p in plugin.plugins:
+        p.add_opts(optparser)
+    (opts, dirs) = optparser.parse_args()
+    ctx = load(dirs, opts, False)
+    cctx = load(dirs, opts, True)
+    if output(ctx) == output(cctx):
+        print('the results are the same')
+    else:
+        print('the results differ')
+
+main()
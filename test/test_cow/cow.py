@@ -0,0 +1,73 @@
+"""Validate the modules in the given directories, with and without
+Context.copy_on_write_uses, and print whether the results are the same,
+and the expanded nodes of module c."""
+
+import io
+import optparse
+import os
+import sys
+
+import pyang
+from pyang import error
+from pyang import plugin
+from pyang.plugins import tree
+
+def load(dirs, opts, cow):
+    path = os.pathsep.join(dirs)
+    ctx = pyang.Context(pyang.FileRepository(path, use_env=False))
+    ctx.opts = opts
+    ctx.copy_on_write_uses = cow
+    for d in dirs:
+        for fname in sorted(os.listdir(d)):
+            if fname.endswith('.yang'):
+                filename = os.path.join(d, fname)
+                with io.open(filename, 'r', encoding='utf-8') as fd:
+                    ctx.add_module(filename, fd.read())
+    ctx.validate()
+    return ctx
+
+def dump(fd, stmt, indent):
+    """Write the expanded data nodes and their documentation"""
+    for ch in getattr(stmt, 'i_children', []):
+        fd.write(u'%s%s %s\n' % (indent, ch.keyword, ch.arg))
+        for keyword in ('description', 'reference'):
+            s = ch.search_one(keyword)
+            if s is not None:
+                fd.write(u'%s  %s %s\n' % (indent, keyword, s.arg))
+        for must in ch.search('must'):
+            for keyword in ('error-message', 'error-app-tag'):
+                s = must.search_one(keyword)
+                if s is not None:
+                    fd.write(u'%s  %s %s\n' % (indent, keyword, s.arg))
+        dump(fd, ch, indent + '  ')
+
+def output(ctx):
+    """Return the errors, the tree output and the expanded nodes for all
+    modules"""
+    fd = io.StringIO()
+    for (pos, tag, args) in ctx.errors:
+        fd.write(u'%s: %s\n' % (pos, error.err_to_str(tag, args)))
+    modules = [ctx.modules[key] for key in sorted(ctx.modules)]
+    tree.emit_tree(ctx, modules, fd, None, None, None)
+    for m in modules:
+        dump(fd, m, '')
+    return fd.getvalue()
+
+def main():
+    sys.setrecursionlimit(10000)
+    optparser = optparse.OptionParser()
+    plugin.init([])
+    for p in plugin.plugins:
+        p.add_opts(optparser)
+    (opts, dirs) = optparser.parse_args()
+    ctx = load(dirs, opts, False)
+    cctx = load(dirs, opts, True)
+    if output(ctx) == output(cctx):
+        print('the results are the same')
+    else:
+        print('the results differ')
+    fd = io.StringIO()
+    dump(fd, cctx.get_module('c'), '')
+    sys.stdout.write(fd.getvalue())
+
+main()
@@ -0,0 +1,80 @@
+"""Check the name and value maps of enumeration and bits types."""
+
+import pyang
+from pyang import error
+
+def module_text(n):
+    enums = ''.join('      enum alarm-%d { value %d; }\n' % (i, 3 * i)
+                    for i in range(n))
+    return u'''module e {
+  yang-version 1.1;
+  namespace "urn:e";
+  prefix e;
+
+  typedef alarm {
+    type enumeration {
+%s    }
+  }
+  leaf a {
+    type alarm {
+      enum alarm-2 { value 6; }
+      enum alarm-1 { value 3; }
+    }
+    default alarm-2;
+  }
+  leaf b {
+    type alarm;
+    default alarm-%d;
+  }
+  leaf c {
+    type bits {
+      bit x;
+      bit y { position 7; }
+      bit z;
+    }
+    default "x z";
+  }
+}
+''' % (enums, n - 1)
+
+def load(n):
+    ctx = pyang.Context(pyang.FileRepository('.', use_env=False))
+    m = ctx.add_module('e.yang', module_text(n))
+    ctx.validate()
+    return (ctx, m)
+
+def spec(m, name):
+    return m.search_one('leaf', name).search_one('type').i_type_spec
+
+def check():
+    (ctx, m) = load(100)
+    ok = True
+    for (pos, tag, args) in ctx.errors:
+        print('%s: %s' % (pos, error.err_to_str(tag, args)))
+        ok = False
+    a = spec(m, 'a')
+    b = spec(m, 'b')
+    c = spec(m, 'c')
+    results = [
+        (a.get_value('alarm-1'), 3),
+        (a.get_value('alarm-3'), None),
+        (a.get_name(6), 'alarm-2'),
+        (a.get_name(9), None),
+        ([name for (name, _value) in a.enums], ['alarm-2', 'alarm-1']),
+        (b.get_value('alarm-99'), 297),
+        (b.get_name(297), 'alarm-99'),
+        (c.get_position('y'), 7),
+        (c.get_position('z'), 8),
+        (c.get_name(0), 'x'),
+        (c.get_name(1), None),
+        (a.validate([], None, 'alarm-3', None), False),
+        (c.validate([], None, ['x', 'w'], None), False),
+    ]
+    for (i, (res, expected)) in enumerate(results):
+        if res != expected:
+            print('check %d: %r != %r' % (i, res, expected))
+            ok = False
+    return ok
+
+if check():
+    print('the results are correct')
@@ -0,0 +1,59 @@
+"""Check that error.ErrorList finds the same duplicates as a plain list,
+and that error.sort_errors() gives the order that pyang prints the
+errors in."""
+
+import random
+
+from pyang import error
+
+def add_all(errors, adds):
+    for (pos, tag, args) in adds:
+        error.err_add(errors, pos, tag, args)
+    return errors
+
+def make_adds(n, nfiles):
+    rnd = random.Random(4711)
+    tops = [object() for _ in range(3)]
+    adds = []
+    for _ in range(n):
+        pos = error.Position('f%d.yang' % rnd.randrange(nfiles))
+        pos.line = rnd.randrange(n // 4 + 1)
+        pos.top = rnd.choice(tops)
+        tag = rnd.choice(['LINT_BAD_REVISION', 'UNUSED_TYPEDEF'])
+        args = rnd.choice([(), 'x', ('x', 'y'), ['x', 'y']])
+        adds.append((pos, tag, args))
+    return adds
+
+def key(e):
+    (pos, tag, args) = e
+    return (pos.ref, pos.line, id(pos.top), tag, repr(args))
+
+def check(adds):
+    plain = add_all([], adds)
+    errors = add_all(error.ErrorList(), adds)
+    assert [key(e) for e in plain] == [key(e) for e in errors]
+    # errors added with the list methods are found too
+    errors = error.ErrorList()
+    errors.extend(plain[:10])
+    errors.append(plain[10])
+    add_all(errors, adds)
+    assert [key(e) for e in plain] == [key(e) for e in errors]
+    # and removed errors are not
+    errors.remove(plain[0])
+    del errors[0]
+    errors.sort(key=key)
+    add_all(errors, adds[:1])
+    assert key(errors[-1]) == key(adds[0])
+    # the order pyang prints the errors in
+    first_ref = plain[-1][0].ref
+    expected = sorted(plain, key=lambda e: (e[0].ref, e[0].line))
+    expected.sort(key=lambda e: e[0].ref != first_ref)
+    assert error.sort_errors(plain, first_ref) == expected
+    errors = add_all(error.ErrorList(), adds)
+    assert ([key(e) for e in error.sort_errors(errors, first_ref)] ==
+            [key(e) for e in expected])
+
+adds = make_adds(2000, 5)
+check(adds)
+print('%d errors added, %d kept' % (len(adds), len(add_all([], adds))))
+print('the results are the same')
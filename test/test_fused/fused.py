@@ -0,0 +1,47 @@
+"""Add a local phase after 'unused', which is then run in the same walk
+over the statement tree.  Print the phases run in that walk, and the
+errors in the order they are reported.  They must be the same as when
+the phases are run one by one."""
+
+import io
+import sys
+
+import pyang
+from pyang import error
+from pyang import statements
+
+def v_leaf(ctx, stmt):
+    error.err_add(ctx.errors, stmt.pos, 'FUSED_LEAF', stmt.arg)
+
+def v_typedef(ctx, stmt):
+    # reported by the 'unused' phase as well
+    error.err_add(ctx.errors, stmt.pos, 'UNUSED_TYPEDEF', stmt.arg)
+
+def validate():
+    ctx = pyang.Context(pyang.FileRepository('.', use_env=False))
+    with io.open('f.yang', 'r', encoding='utf-8') as fd:
+        ctx.add_module('f.yang', fd.read())
+    ctx.validate()
+    return ['%s: %s' % (pos, error.err_to_str(tag, args))
+            for (pos, tag, args) in ctx.errors]
+
+def main():
+    error.add_error_code('FUSED_LEAF', 4, 'leaf %s')
+    statements.add_validation_phase('fused', after='unused')
+    statements.add_validation_fun('fused', ['leaf'], v_leaf)
+    statements.add_validation_fun('fused', ['typedef'], v_typedef)
+    statements.set_phase_local('fused')
+    for phases in statements._get_validation_schedule():
+        if 'fused' in phases:
+            print('walk: %s' % ' '.join(phases))
+    errors = validate()
+    for e in errors:
+        print(e)
+
+    del statements._local_phases['fused']
+    statements._clear_validation_plans()
+    if validate() != errors:
+        print('errors differ when the phases are run one by one')
+        sys.exit(1)
+
+main()
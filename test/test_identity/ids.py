@@ -0,0 +1,33 @@
+"""Print the errors, and the identities derived from each identity in
+the given modules, from Context.get_identity_index()"""
+
+import io
+import sys
+
+import pyang
+from pyang import error
+from pyang import types
+
+def main():
+    ctx = pyang.Context(pyang.FileRepository('.', use_env=False))
+    for filename in sys.argv[1:]:
+        with io.open(filename, 'r', encoding='utf-8') as fd:
+            ctx.add_module(filename, fd.read())
+    ctx.validate()
+    for (pos, tag, args) in ctx.errors:
+        print('%s: %s' % (pos, error.err_to_str(tag, args)))
+    index = ctx.get_identity_index()
+    for i in index.identities:
+        derived = ['%s:%s' % (d.i_module.arg, d.arg)
+                   for d in index.get_derived(i)]
+        print('%s:%s: %s' % (i.i_module.arg, i.arg, ' '.join(derived)))
+    a = ctx.get_module('a')
+    b = ctx.get_module('b')
+    z = a.i_identities['z']
+    x = a.i_identities['x']
+    w = b.i_identities['w']
+    print(types.is_derived_from(z, x), types.is_derived_from(x, x),
+          types.is_derived_from_or_self(x, x), types.is_derived_from(w, x),
+          types.is_derived_from(x, w))
+
+main()
@@ -0,0 +1,69 @@
+"""Validate a.yang, b.yang, c.yang and d.yang, replace a.yang with the
+text in a2.yang, and print what was validated again, and the errors.
+The errors must be the same as when all modules are validated from
+scratch."""
+
+import io
+import sys
+
+import pyang
+from pyang import error
+
+def read(filename):
+    with io.open(filename, 'r', encoding='utf-8') as fd:
+        return fd.read()
+
+def new_ctx(filenames, keep_module_sources=True):
+    ctx = pyang.Context(pyang.FileRepository('.', use_env=False))
+    ctx.keep_module_sources = keep_module_sources
+    for filename in filenames:
+        ctx.add_module(filename, read(filename))
+    ctx.validate()
+    return ctx
+
+def errors(ctx):
+    return sorted(['%s: %s' % (pos, error.err_to_str(tag, args))
+                   for (pos, tag, args) in ctx.errors])
+
+def main():
+    ctx = new_ctx(['a.yang', 'b.yang', 'c.yang', 'd.yang'])
+    for e in errors(ctx):
+        print(e)
+    old = dict(ctx.modules)
+    print('dependencies:')
+    for key in sorted(ctx.dependencies):
+        print('  %s:%s' % (key[0], ''.join(sorted(
+            [' ' + name for (name, _rev) in ctx.dependencies[key]]))))
+
+    ctx.update_module('a.yang', read('a2.yang'))
+    print('validated again: %s' % ' '.join(sorted(
+        [key[0] for key in ctx.modules if ctx.modules[key] is not old[key]])))
+    for e in errors(ctx):
+        print(e)
+    x = ctx.get_module('a').search_one('container', 'x')
+    print('children of /a:x: %s' % ' '.join([c.arg for c in x.i_children]))
+
+    ref = new_ctx(['a2.yang', 'b.yang', 'c.yang', 'd.yang'])
+    if errors(ref) != [e.replace('a.yang', 'a2.yang') for e in errors(ctx)]:
+        print('errors differ from a full validation')
+        sys.exit(1)
+
+    # without the kept texts, the dependent modules are read again
+    nctx = new_ctx(['a.yang', 'b.yang', 'c.yang', 'd.yang'],
+                   keep_module_sources=False)
+    nctx.update_module('a.yang', read('a2.yang'))
+    if sorted(nctx.modules) != sorted(ctx.modules):
+        print('modules differ without the kept texts')
+        sys.exit(1)
+    if errors(nctx) != errors(ctx):
+        print('errors differ without the kept texts')
+        sys.exit(1)
+
+    # a lower revision replaces a higher one
+    text = read('a2.yang')
+    for rev in ('2020-01-01', '2019-01-01'):
+        ctx.update_module('a.yang', text.replace(
+            '  prefix a;\n', '  prefix a;\n  revision %s;\n' % rev))
+    print('revision of a: %s' % ctx.get_module('a').i_latest_revision)
+
+main()
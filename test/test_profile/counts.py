@@ -0,0 +1,20 @@
+"""Print the statements visited per phase and the calls per function
+in a JSON report written by --profile-validation=FILE"""
+
+import json
+import sys
+
+def main():
+    with open(sys.argv[1]) as fd:
+        report = json.load(fd)
+    for (name, m) in sorted(report['modules'].items()):
+        print('module %s' % name)
+        for p in sorted(m['phases'], key=lambda p: p['phase']):
+            print('  phase %s: %d stmts' % (p['phase'], p['stmts']))
+        for f in sorted(m['functions'],
+                        key=lambda f: (f['phase'], f['keyword'],
+                                       f['function'])):
+            print('  %s %s %s: %d calls' %
+                  (f['phase'], f['keyword'], f['function'], f['calls']))
+
+main()
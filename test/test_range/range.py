@@ -0,0 +1,83 @@
+"""Check that range and length restrictions accept the same values
+with validate() and validate_many(), and the expected values."""
+
+import random
+
+from pyang import types
+from pyang import error
+
+def in_ranges(ranges, val, minimum, maximum):
+    """Straightforward check of a value against a range expression"""
+    for (lo, hi) in ranges:
+        lo = {'min': minimum, 'max': maximum}.get(lo, lo)
+        hi = {'min': minimum, 'max': maximum, None: lo}.get(hi, hi)
+        if lo <= val <= hi:
+            return True
+    return False
+
+def make_ranges(rnd, n, minimum, maximum):
+    bounds = sorted(rnd.sample(range(minimum + 1, maximum), 2 * n))
+    ranges = []
+    for i in range(n):
+        (lo, hi) = (bounds[2 * i], bounds[2 * i + 1])
+        if rnd.random() < 0.3:
+            hi = None
+        ranges.append((lo, hi))
+    if rnd.random() < 0.3:
+        ranges[0] = ('min', ranges[0][1])
+    if rnd.random() < 0.3:
+        ranges[-1] = (ranges[-1][0], 'max')
+    return ranges
+
+def check(rnd):
+    ok = True
+    base = types.IntTypeSpec('int16', -32768, 32767)
+    pos = error.Position('range.py')
+    for n in (1, 2, 5, 200):
+        ranges = make_ranges(rnd, n, base.min, base.max)
+        spec = types.RangeTypeSpec(base, (ranges, pos))
+        lspec = types.LengthTypeSpec(types.yang_type_specs['string'],
+                                     (make_ranges(rnd, n, 0, 1000), pos))
+        # distinct values, since equal errors are only reported once
+        vals = set(rnd.sample(range(base.min, base.max + 1), 1000))
+        vals.update(r[0] for r in ranges if r[0] != 'min')
+        vals = sorted(vals)
+        strs = [u'x' * i for i in rnd.sample(range(1001), 300)]
+        errors = []
+        res = spec.validate_many(errors, pos, vals, None)
+        lres = lspec.validate_many(errors, pos, strs, None)
+        expected = [in_ranges(ranges, v, base.min, base.max) for v in vals]
+        lexpected = [in_ranges(lspec.lengths, len(v), 0, types.max_length)
+                     for v in strs]
+        if (res != expected or
+            res != [spec.validate([], pos, v, None) for v in vals]):
+            print('range %s: wrong result' % ranges)
+            ok = False
+        if (lres != lexpected or
+            lres != [lspec.validate([], pos, v, None) for v in strs]):
+            print('length %s: wrong result' % lspec.lengths)
+            ok = False
+        if len(errors) != res.count(False) + lres.count(False):
+            print('wrong number of errors')
+            ok = False
+    return ok
+
+def check_min_max():
+    """A restriction of a type with range "max" or "min" """
+    ok = True
+    base = types.IntTypeSpec('int8', -128, 127)
+    pos = error.Position('range.py')
+    for (bound, val) in (('max', 127), ('min', -128)):
+        spec = types.RangeTypeSpec(base, ([(bound, None)], pos))
+        spec = types.RangeTypeSpec(spec, ([('min', 'max')], pos))
+        if (spec.min, spec.max) != (val, val):
+            print('range "%s": wrong min and max' % bound)
+            ok = False
+        if (spec.validate_many([], pos, [val, 0], None) != [True, False] or
+            not spec.validate([], pos, val, None)):
+            print('range "%s": wrong result' % bound)
+            ok = False
+    return ok
+
+if check(random.Random(7)) and check_min_max():
+    print('the results are correct')
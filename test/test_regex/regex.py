@@ -0,0 +1,80 @@
+"""Check the translation of XML Schema regular expressions."""
+
+from pyang import xsd_regex
+
+# (pattern, matching values, not matching values)
+matches = [
+    (u'abc', [u'abc'], [u'', u'ab', u'abcd', u'xabc']),
+    (u'^a$', [u'^a$'], [u'a']),
+    (u'a|b|', [u'a', u'b', u''], [u'ab']),
+    (u'(ab)+', [u'ab', u'abab'], [u'', u'aba']),
+    (u'a{2}', [u'aa'], [u'a', u'aaa']),
+    (u'a{2,}', [u'aa', u'aaaa'], [u'a']),
+    (u'a{1,2}b?', [u'a', u'aab'], [u'aaa', u'b']),
+    (u'a{0}', [u''], [u'a']),
+    (u'.', [u'x', u'é', u'\t'], [u'\n', u'\r', u'']),
+    (u'[a-c]*', [u'', u'abcba'], [u'd']),
+    (u'[^a-c]', [u'd', u'\n'], [u'a']),
+    (u'[a-]', [u'a', u'-'], [u'b']),
+    (u'[-a]', [u'a', u'-'], [u'b']),
+    (u'[\\-\\]\\[\\^]+', [u'-]^['], [u'a']),
+    (u'[a-z-[aeiou]]+', [u'xyz'], [u'bad']),
+    (u'[^a-z-[0-9]]', [u'A', u'-'], [u'a', u'0']),
+    (u'[\\d-[5]]', [u'4', u'٠'], [u'5', u'a']),
+    (u'\\d+', [u'0123', u'١'], [u'a', u'']),
+    (u'\\D', [u'a'], [u'1']),
+    (u'\\s\\S', [u' x', u'\tx'], [u'xx', u'  ']),
+    (u'\\w+', [u'a1é'], [u'a b', u'a.', u'a-']),
+    (u'\\W', [u'.', u' '], [u'a']),
+    (u'\\i\\c*', [u'_a-1', u'a.b', u':x'], [u'1a', u'-a']),
+    (u'[\\i-[:]][\\c-[:]]*', [u'a-1'], [u':a', u'a:']),
+    (u'\\p{L}+', [u'aé中'], [u'a1']),
+    (u'\\p{Lu}\\p{Ll}', [u'Ab'], [u'aB']),
+    (u'\\P{N}', [u'a'], [u'1', u'Ⅷ']),
+    (u'[\\p{N}\\p{L}]+', [u'eth0'], [u'eth-0']),
+    (u'\\p{IsBasicLatin}+', [u'abc~'], [u'é']),
+    (u'\\p{IsGreek}', [u'α'], [u'a']),
+    (u'\\P{IsBasicLatin}', [u'é'], [u'a']),
+    (u'\\n\\r\\t', [u'\n\r\t'], [u'nrt']),
+    (u'\\.\\*\\+\\?\\(\\)\\{\\}\\|\\\\', [u'.*+?(){}|\\'], [u'']),
+    # escaped punctuation characters are accepted, as by libxml2
+    (u'\\$\\/', [u'$/'], [u'\\$\\/']),
+    # a "-" that does not start a range is a literal, as in libxml2
+    (u'[\\w-_]+', [u'a-_b'], [u'a.b']),
+    (u'[a-zA-Z0-9-_.]+', [u'eth-0_1.2'], [u'a/b']),
+    (u'[a-c-e]', [u'a', u'-', u'e'], [u'd']),
+    (u'[\\d-z]', [u'1', u'-', u'z'], [u'a']),
+]
+
+invalid = [
+    u'a**', u'a{2}?', u'*', u'a{3,1}', u'a{,3}', u'a{x}', u'(a', u'a)',
+    u'[a', u'x]', u'x}', u'[]', u'[z-a]', u'[a-\\d]',
+    u'\\', u'\\q', u'\\p{Lx}', u'\\p{IsFoo}', u'\\pL', u'\\p{L',
+]
+
+def check():
+    ok = True
+    for (pattern, yes, no) in matches:
+        for (values, expected) in ((yes, True), (no, False)):
+            for v in values:
+                if xsd_regex.match(pattern, v) is not expected:
+                    print('%r: match(%r) is not %s' % (pattern, v, expected))
+                    ok = False
+    for pattern in invalid:
+        try:
+            xsd_regex.check(pattern)
+            print('%r: not reported as invalid' % pattern)
+            ok = False
+        except xsd_regex.XSDRegexError:
+            pass
+        try:
+            xsd_regex.compile(pattern)
+            print('%r: compiled' % pattern)
+            ok = False
+        except xsd_regex.XSDRegexError:
+            pass
+    return ok
+
+check()
+print('%d patterns matched, %d invalid patterns rejected' %
+      (len(matches), len(invalid)))
@@ -0,0 +1,57 @@
+"""Parse each module given on the command line with
+Context.add_module_stream(), reading it in small chunks, and print the
+statements and the errors.  The result must be the same as with
+Context.add_module()."""
+
+import io
+import sys
+
+import pyang
+from pyang import error
+
+def chunks(filename, size):
+    with open(filename, 'rb') as fd:
+        while True:
+            data = fd.read(size)
+            if not data:
+                break
+            yield data
+
+def dump(stmt, indent, out):
+    out.append(u'%d:%s%s %s' % (stmt.pos.line, ' ' * indent,
+                                stmt.raw_keyword, stmt.arg))
+    for s in stmt.substmts:
+        dump(s, indent + 2, out)
+
+def parse(filename, add):
+    ctx = pyang.Context(pyang.FileRepository('.', use_env=False))
+    module = add(ctx)
+    out = []
+    if module is not None:
+        dump(module, 0, out)
+    for (pos, tag, args) in ctx.errors:
+        out.append(u'%s: %s' % (pos, error.err_to_str(tag, args)))
+    return out
+
+def main():
+    stdout = io.open(sys.stdout.fileno(), 'w', encoding='utf-8',
+                     closefd=False)
+    for filename in sys.argv[1:]:
+        out = parse(filename, lambda ctx: ctx.add_module_stream(
+            filename, chunks(filename, 7)))
+        for line in out:
+            stdout.write(line + u'\n')
+        try:
+            with io.open(filename, 'r', encoding='utf-8') as fd:
+                text = fd.read()
+        except UnicodeDecodeError:
+            continue
+        with open(filename, 'rb') as fd:
+            out2 = parse(filename, lambda ctx: ctx.add_module_stream(
+                filename, fd))
+        if (out != out2 or
+            out != parse(filename, lambda ctx: ctx.add_module(filename,
+                                                              text))):
+            stdout.write(u'%s: differs from add_module()\n' % filename)
+
+main()
@@ -0,0 +1,40 @@
+"""Check which type statements share their type spec"""
+
+import io
+import sys
+
+import pyang
+from pyang import error
+
+ctx = pyang.Context(pyang.FileRepository('.', use_env=False))
+with io.open('t.yang', encoding='utf-8') as fd:
+    m = ctx.add_module('t.yang', fd.read())
+ctx.validate()
+for (pos, tag, args) in ctx.errors:
+    print('%s: %s' % (pos, error.err_to_str(tag, args)))
+
+def spec(*path):
+    node = m
+    for name in path:
+        node = [ch for ch in node.i_children if ch.arg == name][0]
+    return node.search_one('type').i_type_spec
+
+ok = True
+def check(what, value):
+    global ok
+    if not value:
+        print('failed: ' + what)
+        ok = False
+
+check('references to a typedef share the spec',
+      spec('a') is spec('b') is spec('d'))
+check('a restricted type wraps the shared spec',
+      spec('c') is not spec('a') and spec('c').base is spec('a'))
+check('leafrefs do not share the spec', spec('r') is not spec('x', 'r'))
+check('leafrefs are resolved for each leaf',
+      spec('r').i_target_node is not spec('x', 'r').i_target_node)
+check('require-instance does not change the shared spec',
+      spec('i').require_instance is False and
+      spec('j').require_instance is True)
+if not ok:
+    sys.exit(1)
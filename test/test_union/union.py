@@ -0,0 +1,99 @@
+"""Check that the lexical tests of union member types do not change
+which values are valid."""
+
+import pyang
+from pyang import error
+
+module_text = u'''module u {
+  yang-version 1.1;
+  namespace "urn:u";
+  prefix u;
+
+  import ietf-inet-types { prefix inet; }
+
+  leaf host {
+    type inet:host;
+  }
+  leaf address {
+    type inet:ip-address;
+  }
+  leaf mixed {
+    type union {
+      type int8 { range "-5..5"; }
+      type boolean;
+      type enumeration {
+        enum up;
+        enum "down 2";
+      }
+      type empty;
+      type decimal64 { fraction-digits 2; }
+      type string { pattern '[a-z]+(:[0-9]+)?'; }
+      type string {
+        pattern '[^x]+' { modifier invert-match; }
+      }
+      type string { length 1..2; }
+    }
+  }
+}
+'''
+
+values = [
+    '', ' ', 'x', 'xx', 'xxx', 'abc', 'abc:12', 'abc:', 'up', 'down 2',
+    'true', 'false', 'True', '0', '5', '-5', '6', '+3', ' 3 ', '0x3', '07',
+    '1.5', '-1.50', '1.555', '.5', '1e3', '-', '+', 'xyz:1', 'a-b',
+    '10.0.0.1', '10.0.0.256', '10.0.0.1%eth0', 'fe80::1', 'fe80::1%2',
+    '::', '::ffff:10.0.0.1', '1:2:3:4:5:6:7:8', '1:2:3:4:5:6:7:8:9',
+    'example.com', 'example.com.', 'exa_mple.com', '-bad.example.com',
+    'ex:ample.com', 'a..b', '.', 'xn--nxasmq6b.example', u'été',
+    u'10.0.0.1%éth0',
+]
+
+def load():
+    repo = pyang.FileRepository('../../modules/ietf', use_env=False)
+    ctx = pyang.Context(repo)
+    m = ctx.add_module('u.yang', module_text)
+    ctx.validate()
+    return (ctx, m)
+
+def spec(m, name):
+    return m.search_one('leaf', name).search_one('type').i_type_spec
+
+def validate_all(s, vals):
+    return [s.validate([], None, v, None) for v in vals]
+
+def without_tests(s):
+    """Remove the lexical tests of the member types of `s`, and of the
+    unions in them"""
+    members = s.members
+    s.members = [(t.i_type_spec, None) for t in s.types]
+    for (t, _test) in members:
+        if t is not None and t.name == 'union':
+            without_tests(t)
+
+def check():
+    (ctx, m) = load()
+    ok = True
+    for (pos, tag, args) in ctx.errors:
+        print('%s: %s' % (pos, error.err_to_str(tag, args)))
+        ok = False
+    for name in ('host', 'address', 'mixed'):
+        s = spec(m, name)
+        res = validate_all(s, values)
+        without_tests(s)
+        expected = validate_all(s, values)
+        for (v, r, e) in zip(values, res, expected):
+            if r != e:
+                print('%s %r: %r != %r' % (name, v, r, e))
+                ok = False
+    # an IPv6 address is not tried as an IPv4 address
+    (ctx, m) = load()
+    s = spec(m, 'address')
+    s.enable_stats()
+    validate_all(s, ['fe80::1', '10.0.0.1', 'fe80::1', 'example.com'])
+    if s.stats != [[2, 1, 1], [1, 0, 2]]:
+        print('bad stats %r' % s.stats)
+        ok = False
+    return ok
+
+if check():
+    print('%d values: the results are the same' % len(values))